@@ -6,14 +6,17 @@ import re
 import sys
 import time
 from typing import Any, Dict
+from urllib.parse import urlparse
 
 import pandas as pd
 
 from bioos import bioos
 from bioos.config import DEFAULT_ENDPOINT
 from bioos.errors import NotFoundError, ParameterError
+from bioos.internal.monitor import DEFAULT_MIN_INTERVAL, SubmissionMonitor
 from bioos.ops.auth import login_to_bioos
 from bioos.ops.workspace_files import _upload_local_files_with_workspace
+from bioos.resource.workflows import Run
 
 
 def uniquify_columns(cols: list[str]) -> list[str]:
@@ -94,6 +97,27 @@ def replace_local_paths_with_s3(value: Any, source_to_s3: dict[str, str]) -> Any
     return value
 
 
+def collect_output_files(outputs: Any) -> list[str]:
+    """Collects the s3 URLs found in a run's Outputs JSON."""
+    if isinstance(outputs, str):
+        if outputs.startswith("s3://"):
+            return [outputs]
+        try:
+            outputs = json.loads(outputs)
+        except ValueError:
+            return []
+    if isinstance(outputs, dict):
+        outputs = list(outputs.values())
+    if isinstance(outputs, list):
+        files = []
+        for value in outputs:
+            if isinstance(value, (dict, list)) or (isinstance(value, str)
+                                                   and value.startswith("s3://")):
+                files.extend(collect_output_files(value))
+        return files
+    return []
+
+
 def dataframe_map_compat(df: pd.DataFrame, func):
     # version in setup.py to 2.1+, where DataFrame.map is available.
     if hasattr(df, "map"):
@@ -146,7 +170,7 @@ class Bioos_workflow:
 
         # upload files
         update_dict = {}
-        df = self.ws.files.list('input_provision')
+        df = self.ws.files.list('input_provision', include_https_urls=False)
         uploaded_files = [] if df.empty else df.key.to_list()
 
         # 这里可以改为数组上传
@@ -345,14 +369,17 @@ class Bioos_workflow:
         self.logger.info("Build params dict successfully.")
         return self.params_submit
 
-    def postprocess(self, download=False, download_dir="."):
+    def postprocess(self, download=False, download_dir=".", exclude=None):
         # 假设全部执行完毕
         #  对运行完成的目录进行下载
         # 证实bioos包只能对文件的list进行下载，不支持文件夹
         # ws.files.list方法不能指定起始路径，需要改进
         # 需要有一个地方执行定时任务，对run的status进行查询，并记录状态，对每次新完成的run进行后处理
         files = []
-        for file in self.ws.files.list().key:
+        exclude = exclude or set()
+        for file in self.ws.files.list(include_https_urls=False).key:
+            if file in exclude:
+                continue
             for run in self.runs:
                 if run.submission in file:
                     print(file)
@@ -388,6 +415,59 @@ class Bioos_workflow:
         self.runs = runs
         return self.runs
 
+    def fetch_runs(self, submission_id: str) -> list[dict]:
+        """Lists the runs of a submission once, updating the Run objects."""
+        items = list(Run.iter_runs(self.workspace_id, submission_id))
+        for item in items:
+            Run.from_record(self.workspace_id, submission_id, item)
+        return items
+
+    def download_run_outputs(self, run: dict, download_dir=".") -> list[str]:
+        """Downloads the output files of a finished run, returning their keys.
+
+        Raises RuntimeError when some files failed, since the download does
+        not report which ones; none of the keys are then treated as done.
+        """
+        files = collect_output_files(run.get("Outputs") or "")
+        if not files:
+            return []
+        os.makedirs(download_dir, exist_ok=True)
+        try:
+            success = self.ws.files.download(files, download_dir, flatten=False)
+        except Exception as e:
+            self.logger.warning(
+                f"Some outputs of run {run.get('ID')} can not download. \n {e}")
+            return []
+        if not success:
+            raise RuntimeError(
+                f"Some outputs of run {run.get('ID')} failed to download")
+        return [urlparse(file).path.lstrip("/") for file in files]
+
+    def monitor_submissions(self,
+                            min_interval=DEFAULT_MIN_INTERVAL,
+                            max_interval=600,
+                            download_dir=None) -> set[str]:
+        """Waits until every submitted run finished, polling adaptively.
+
+        With ``download_dir``, the outputs of each run are downloaded as soon
+        as it finishes; the keys downloaded this way are returned.
+        """
+        downloaded = set()
+
+        def on_run_finished(submission_id, run):
+            self.logger.info(
+                f"Run {run.get('ID')} of submission {submission_id} {run.get('Status')}.")
+            if download_dir is not None and run.get("Status") == "Succeeded":
+                downloaded.update(self.download_run_outputs(run, download_dir))
+
+        monitor = SubmissionMonitor(self.fetch_runs,
+                                    on_run_finished=on_run_finished,
+                                    min_interval=min(min_interval, max_interval),
+                                    max_interval=max_interval,
+                                    logger=self.logger)
+        monitor.run(run.submission for run in self.runs)
+        return downloaded
+
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
@@ -447,7 +527,12 @@ def build_parser() -> argparse.ArgumentParser:
         "--monitor_interval",
         type=int,
         default=600,
-        help="Time interval for query the status for the submission runs.")
+        help="Longest time interval for query the status for the submission runs.")
+    parser.add_argument(
+        "--monitor_min_interval",
+        type=int,
+        default=DEFAULT_MIN_INTERVAL,
+        help="Shortest time interval, used while runs are queued or changing status.")
     parser.add_argument(
         "--download_results",
         action='store_true',
@@ -475,18 +560,12 @@ def handle(args) -> str:
                    mount_tos=args.mount_tos)
     bw.submit_workflow_bioosapi()
 
-    def all_runs_done() -> bool:
-        statuses = []
-        for run in bw.runs:
-            statuses.append(True if run.status in ("Succeeded", "Failed") else False)
-        return all(statuses)
-
     if args.monitor or args.download_results:
-        while not all_runs_done():
-            bw.logger.info("Monitoring submission run.")
-            print(bw.runs)
-            time.sleep(args.monitor_interval)
-            bw.monitor_workflow()
+        bw.logger.info("Monitoring submission run.")
+        downloaded = bw.monitor_submissions(
+            min_interval=args.monitor_min_interval,
+            max_interval=args.monitor_interval,
+            download_dir=args.download_dir if args.download_results else None)
 
         time.sleep(60)
         bw.logger.info("Submission finished. Print final status for runs.")
@@ -494,7 +573,8 @@ def handle(args) -> str:
 
         bw.logger.info("Start to postprocess.")
         bw.postprocess(download=args.download_results,
-                       download_dir=args.download_dir)
+                       download_dir=args.download_dir,
+                       exclude=downloaded)
         bw.logger.info("Postprocess finished.")
 
     first_run = bw.runs[0] if bw.runs else None
@@ -5,6 +5,7 @@ import sys
 
 from bioos.config import Config, DEFAULT_ENDPOINT
 from bioos.ops.auth import login_to_bioos, resolve_workspace
+from bioos.resource.workflows import Run
 
 
 def get_logger():
@@ -37,12 +38,16 @@ def build_parser() -> argparse.ArgumentParser:
 def handle(args) -> str:
     login_to_bioos(access_key=args.ak, secret_key=args.sk, endpoint=args.endpoint)
     workspace_id, _ = resolve_workspace(args.workspace_name)
-    params = {
-        "SubmissionID": args.submission_id,
-        "WorkspaceID": workspace_id,
-        "PageSize": args.page_size,
-    }
-    resp = Config.service().list_runs(params)
+    if args.page_size == 0:
+        # every run, fetched as concurrent fixed-size pages
+        resp = Run.list_runs(workspace_id, args.submission_id, all_pages=True)
+    else:
+        params = {
+            "SubmissionID": args.submission_id,
+            "WorkspaceID": workspace_id,
+            "PageSize": args.page_size,
+        }
+        resp = Config.service().list_runs(params)
 
     if not resp.get("Items"):
         raise RuntimeError(f"No runs found for submission {args.submission_id}")
@@ -0,0 +1,56 @@
+import sys
+
+from bioos.cli.common import add_argument, build_parser, run_cli
+from bioos.ops.auth import workspace_context_from_args
+
+
+def build_args():
+    parser = build_parser("Copy files or a prefix inside a Bio-OS workspace bucket.")
+    add_argument(parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(
+        parser,
+        "source",
+        required=True,
+        help="Source file path in the workspace, or a prefix ending with '/'.",
+    )
+    add_argument(
+        parser,
+        "target",
+        required=True,
+        help="Target file path, or a target prefix ending with '/'.",
+    )
+    add_argument(
+        parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel server-side copies shared by files and copy parts.",
+    )
+    return parser
+
+
+def handle(args):
+    _, ws = workspace_context_from_args(args)
+    report = ws.files.copy(
+        source=args.source,
+        target=args.target,
+        task_num=args.task_num,
+    )
+    return {
+        "success": not report["failed_copies"] and not report["failed_deletes"],
+        "workspace_name": args.workspace_name,
+        "source": args.source,
+        "target": args.target,
+        **report,
+    }
+
+
+def main():
+    parser = build_args()
+    args = parser.parse_args()
+    sys.exit(run_cli(handle, args))
+
+
+if __name__ == "__main__":
+    main()
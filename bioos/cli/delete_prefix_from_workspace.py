@@ -0,0 +1,65 @@
+import sys
+
+from bioos.cli.common import add_argument, add_bool_argument, build_parser, run_cli
+from bioos.ops.auth import workspace_context_from_args
+
+
+def build_args():
+    parser = build_parser("Delete every file below a prefix of a Bio-OS workspace bucket.")
+    add_argument(parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(parser, "prefix", required=True, help="Directory prefix to delete; a trailing slash is implied.")
+    add_argument(
+        parser,
+        "include",
+        required=False,
+        default="",
+        help="Only delete files whose name fully matches this regular expression.",
+    )
+    add_argument(
+        parser,
+        "ignore",
+        required=False,
+        default="",
+        help="Keep files whose name fully matches this regular expression.",
+    )
+    add_bool_argument(
+        parser,
+        "dry_run",
+        default=False,
+        help_text="Only report the files and bytes that would be deleted.",
+    )
+    add_argument(
+        parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Number of concurrent 1000-key delete batches.",
+    )
+    return parser
+
+
+def handle(args):
+    _, ws = workspace_context_from_args(args)
+    report = ws.files.delete_prefix(
+        prefix=args.prefix,
+        include=args.include,
+        ignore=args.ignore,
+        dry_run=args.dry_run,
+        task_num=args.task_num,
+    )
+    return {
+        "success": not report["failed_deletes"],
+        "workspace_name": args.workspace_name,
+        **report,
+    }
+
+
+def main():
+    parser = build_args()
+    args = parser.parse_args()
+    sys.exit(run_cli(handle, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,10 @@
+import os
 import sys
 
 from bioos.cli.common import add_argument, add_bool_argument, build_parser, run_cli
+from bioos.internal.progress import JsonLinesSink, TransferProgress
 from bioos.ops.auth import workspace_context_from_args
+from bioos.ops.workspace_files import DEFAULT_DOWNLOAD_CHECKPOINT_DIR
 
 
 def build_args():
@@ -16,20 +19,77 @@ def build_args():
     )
     add_argument(parser, "target", required=True, help="Local target path.")
     add_bool_argument(parser, "flatten", default=False, help_text="Flatten directories during download.")
+    add_argument(
+        parser,
+        "checkpoint_dir",
+        required=False,
+        default=None,
+        help="Directory for resumable download checkpoints.",
+    )
+    add_argument(
+        parser,
+        "max_retries",
+        required=False,
+        type=int,
+        default=3,
+        help="Number of retries per file after the initial attempt.",
+    )
+    add_argument(
+        parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel transfers shared by small files and multipart download parts.",
+    )
+    add_bool_argument(
+        parser,
+        "autotune",
+        default=False,
+        help_text=(
+            "Tune concurrency and part size from measured throughput instead of "
+            "--task-num, remembering the best settings per endpoint."
+        ),
+    )
+    add_bool_argument(
+        parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
+    )
     return parser
 
 
 def handle(args):
     _, ws = workspace_context_from_args(args)
     sources = args.source[0] if len(args.source) == 1 else args.source
-    success = ws.files.download(sources=sources, target=args.target, flatten=args.flatten)
-    return {
+    checkpoint_dir = os.path.abspath(
+        os.path.expanduser(args.checkpoint_dir or DEFAULT_DOWNLOAD_CHECKPOINT_DIR))
+    progress = TransferProgress(JsonLinesSink(sys.stderr)) if args.progress_json else None
+    success = ws.files.download(
+        sources=sources,
+        target=args.target,
+        flatten=args.flatten,
+        checkpoint_dir=checkpoint_dir,
+        max_retries=args.max_retries,
+        task_num=args.task_num,
+        autotune=args.autotune,
+        progress=progress,
+    )
+    result = {
         "success": success,
         "workspace_name": args.workspace_name,
         "sources": args.source,
         "target": args.target,
         "flatten": args.flatten,
+        "checkpoint_dir": checkpoint_dir,
+        "max_retries": args.max_retries,
+        "task_num": args.task_num,
+        "autotune": args.autotune,
     }
+    if progress is not None:
+        result["transfer_summary"] = progress.summary()
+    return result
 
 
 def main():
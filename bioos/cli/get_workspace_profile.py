@@ -47,6 +47,12 @@ def build_args():
         default=False,
         help_text="Include signed file URLs in artifact summaries.",
     )
+    add_bool_argument(
+        parser,
+        "parallel_listing",
+        default=False,
+        help_text="List artifact prefixes with concurrent prefix shards.",
+    )
     parser.set_defaults(endpoint=DEFAULT_ENDPOINT)
     return parser
 
@@ -61,6 +67,7 @@ def handle(args):
         include_failure_details=args.include_failure_details,
         include_ies=args.include_ies,
         include_signed_urls=args.include_signed_urls,
+        parallel_listing=args.parallel_listing,
         endpoint=args.endpoint,
         access_key=args.ak,
         secret_key=args.sk,
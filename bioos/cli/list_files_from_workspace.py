@@ -10,12 +10,20 @@ def build_args():
     add_argument(parser, "workspace_name", required=True, help="Workspace name.")
     add_argument(parser, "prefix", required=False, default="", help="Prefix path to list.")
     add_bool_argument(parser, "recursive", default=False, help_text="List files recursively.")
+    add_argument(
+        parser,
+        "limit",
+        required=False,
+        type=int,
+        default=0,
+        help="Maximum number of entries to return. 0 lists everything.",
+    )
     return parser
 
 
 def handle(args):
     _, ws = workspace_context_from_args(args)
-    files_df = ws.files.list(prefix=args.prefix, recursive=args.recursive)
+    files_df = ws.files.list(prefix=args.prefix, recursive=args.recursive, limit=args.limit)
     return dataframe_records(files_df)
 
 
@@ -8,10 +8,12 @@ from bioos.cli import (
     build_docker_image,
     check_build_status,
     check_ies_status,
+    copy_files_in_workspace,
     create_iesapp,
     create_workspace_bioos,
     delete_workspace,
     delete_workspace_members,
+    delete_prefix_from_workspace,
     delete_submission,
     download_files_from_workspace,
     export_bioos_workspace,
@@ -26,13 +28,16 @@ from bioos.cli import (
     list_workspace_members,
     list_submissions_from_workspace,
     list_workflows_from_workspace,
+    move_files_in_workspace,
     run as run_commands,
     search_dockstore,
+    sync_files_to_workspace,
     upload_dashboard_file,
     upload_files_to_workspace,
     usage_metrics,
     update_workflow,
     update_workspace_members,
+    watch_submissions,
 )
 from bioos.cli.common import add_argument, add_auth_arguments, add_bool_argument, add_output_arguments, run_cli
 from bioos.cli.config_store import EXAMPLE_CONFIG, get_config_path
@@ -184,6 +189,12 @@ def _add_workspace_group(subparsers: Any) -> None:
         default=False,
         help_text="Include signed file URLs in artifact summaries.",
     )
+    add_bool_argument(
+        profile_parser,
+        "parallel_listing",
+        default=False,
+        help_text="List artifact prefixes with concurrent prefix shards.",
+    )
     profile_parser.set_defaults(_parser=profile_parser)
     profile_parser.set_defaults(handler=get_workspace_profile.handle)
 
@@ -410,7 +421,15 @@ def _add_workflow_group(subparsers: Any) -> None:
         required=False,
         type=int,
         default=600,
-        help="Polling interval in seconds.",
+        help="Longest polling interval in seconds.",
+    )
+    add_argument(
+        submit_parser,
+        "monitor_min_interval",
+        required=False,
+        type=int,
+        default=10,
+        help="Shortest polling interval in seconds, used while runs change status.",
     )
     add_bool_argument(submit_parser, "download_results", default=False, help_text="Download results after completion.")
     add_argument(submit_parser, "download_dir", required=False, default=".", help="Local download directory.")
@@ -449,9 +468,41 @@ def _add_submission_group(subparsers: Any) -> None:
     add_argument(logs_parser, "workspace_name", required=True, help="Workspace name.")
     add_argument(logs_parser, "submission_id", required=True, help="Submission ID.")
     add_argument(logs_parser, "output_dir", required=False, default=".", help="Local directory to save the logs.")
+    add_bool_argument(
+        logs_parser,
+        "parallel_listing",
+        default=False,
+        help_text="List the workspace bucket with concurrent prefix shards.",
+    )
     logs_parser.set_defaults(_parser=logs_parser, output="text")
     logs_parser.set_defaults(handler=get_submission_logs.handle)
 
+    watch_parser = submission_subparsers.add_parser(
+        "watch", help="Stream submission and run status changes as JSON lines.")
+    add_auth_arguments(watch_parser)
+    add_output_arguments(watch_parser)
+    add_argument(watch_parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(
+        watch_parser,
+        "submission_id",
+        required=False,
+        action="append",
+        default=None,
+        help="Submission ID to watch; repeatable. Watches the whole workspace if omitted.",
+    )
+    add_argument(watch_parser, "since", required=False, type=int, default=None,
+                 help="Only watch submissions started at or after this unix time.")
+    add_argument(watch_parser, "min_interval", required=False, type=float, default=10,
+                 help="Seconds between snapshots while statuses change.")
+    add_argument(watch_parser, "max_interval", required=False, type=float, default=60,
+                 help="Longest seconds between snapshots.")
+    add_argument(watch_parser, "timeout", required=False, type=float, default=None,
+                 help="Stop watching after this many seconds.")
+    add_argument(watch_parser, "max_polls", required=False, type=int, default=None,
+                 help="Stop watching after this many snapshots.")
+    watch_parser.set_defaults(_parser=watch_parser)
+    watch_parser.set_defaults(handler=watch_submissions.handle)
+
 
 def _add_run_group(subparsers: Any) -> None:
     run_parser = subparsers.add_parser("run", help="Workflow run commands.")
@@ -464,7 +515,22 @@ def _add_run_group(subparsers: Any) -> None:
     add_argument(list_parser, "workspace_name", required=True, help="Workspace name.")
     add_argument(list_parser, "submission_id", required=True, help="Submission ID.")
     add_argument(list_parser, "page_number", required=False, type=int, default=1, help="Page number.")
-    add_argument(list_parser, "page_size", required=False, type=int, default=10, help="Page size. Use 0 for all.")
+    add_argument(
+        list_parser,
+        "page_size",
+        required=False,
+        type=int,
+        default=None,
+        help="Page size, 10 by default. Use 0 for all in one response.",
+    )
+    add_bool_argument(
+        list_parser,
+        "all",
+        default=False,
+        help_text="List every run, fetching pages of --page-size (default 100) concurrently.",
+    )
+    add_argument(list_parser, "workers", required=False, type=int, default=4,
+                 help="Pages fetched concurrently with --all.")
     add_argument(list_parser, "keyword", required=False, default=None, help="Optional run keyword filter.")
     add_argument(
         list_parser,
@@ -543,7 +609,10 @@ def _add_file_group(subparsers: Any) -> None:
         upload_parser,
         "skip_existing",
         default=False,
-        help_text="Skip files whose target object already exists.",
+        help_text=(
+            "Skip files whose target object already exists, unless the local upload "
+            "manifest records different content for the unchanged local file."
+        ),
     )
     add_argument(
         upload_parser,
@@ -566,7 +635,22 @@ def _add_file_group(subparsers: Any) -> None:
         required=False,
         type=int,
         default=10,
-        help="Parallel task count for multipart uploads.",
+        help="Total parallel transfers shared by small files and multipart upload parts.",
+    )
+    add_bool_argument(
+        upload_parser,
+        "autotune",
+        default=False,
+        help_text=(
+            "Tune concurrency and part size from measured throughput instead of "
+            "--task-num, remembering the best settings per endpoint."
+        ),
+    )
+    add_bool_argument(
+        upload_parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
     )
     upload_parser.set_defaults(_parser=upload_parser)
     upload_parser.set_defaults(handler=upload_files_to_workspace.handle)
@@ -577,6 +661,14 @@ def _add_file_group(subparsers: Any) -> None:
     add_argument(list_parser, "workspace_name", required=True, help="Workspace name.")
     add_argument(list_parser, "prefix", required=False, default="", help="Prefix path to list.")
     add_bool_argument(list_parser, "recursive", default=False, help_text="List files recursively.")
+    add_argument(
+        list_parser,
+        "limit",
+        required=False,
+        type=int,
+        default=0,
+        help="Maximum number of entries to return. 0 lists everything.",
+    )
     list_parser.set_defaults(_parser=list_parser)
     list_parser.set_defaults(handler=list_files_from_workspace.handle)
 
@@ -593,9 +685,199 @@ def _add_file_group(subparsers: Any) -> None:
     )
     add_argument(download_parser, "target", required=True, help="Local target path.")
     add_bool_argument(download_parser, "flatten", default=False, help_text="Flatten directories during download.")
+    add_argument(
+        download_parser,
+        "checkpoint_dir",
+        required=False,
+        default=None,
+        help="Directory for resumable download checkpoints.",
+    )
+    add_argument(
+        download_parser,
+        "max_retries",
+        required=False,
+        type=int,
+        default=3,
+        help="Number of retries per file after the initial attempt.",
+    )
+    add_argument(
+        download_parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel transfers shared by small files and multipart download parts.",
+    )
+    add_bool_argument(
+        download_parser,
+        "autotune",
+        default=False,
+        help_text=(
+            "Tune concurrency and part size from measured throughput instead of "
+            "--task-num, remembering the best settings per endpoint."
+        ),
+    )
+    add_bool_argument(
+        download_parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
+    )
     download_parser.set_defaults(_parser=download_parser)
     download_parser.set_defaults(handler=download_files_from_workspace.handle)
 
+    sync_parser = file_subparsers.add_parser(
+        "sync",
+        help="Upload only new or changed files from a local directory to a workspace prefix.",
+    )
+    add_auth_arguments(sync_parser)
+    add_output_arguments(sync_parser)
+    add_argument(sync_parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(sync_parser, "source", required=True, help="Local directory whose contents are synchronized.")
+    add_argument(sync_parser, "target", required=False, default="", help="Target prefix path in the workspace bucket.")
+    add_bool_argument(
+        sync_parser,
+        "delete",
+        default=False,
+        help_text="Delete objects under target that no longer exist locally.",
+    )
+    add_bool_argument(
+        sync_parser,
+        "dry_run",
+        default=False,
+        help_text="Only report the files and bytes that would be uploaded or deleted.",
+    )
+    add_argument(
+        sync_parser,
+        "checkpoint_dir",
+        required=False,
+        default=None,
+        help="Directory for resumable upload checkpoints.",
+    )
+    add_argument(
+        sync_parser,
+        "max_retries",
+        required=False,
+        type=int,
+        default=3,
+        help="Number of retries per file after the initial attempt.",
+    )
+    add_argument(
+        sync_parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel transfers shared by small files and multipart upload parts.",
+    )
+    add_bool_argument(
+        sync_parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
+    )
+    sync_parser.set_defaults(_parser=sync_parser)
+    sync_parser.set_defaults(handler=sync_files_to_workspace.handle)
+
+    copy_parser = file_subparsers.add_parser(
+        "copy",
+        help="Copy files or a prefix inside a workspace bucket without downloading them.",
+    )
+    add_auth_arguments(copy_parser)
+    add_output_arguments(copy_parser)
+    add_argument(copy_parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(
+        copy_parser,
+        "source",
+        required=True,
+        help="Source file path in the workspace, or a prefix ending with '/'.",
+    )
+    add_argument(
+        copy_parser,
+        "target",
+        required=True,
+        help="Target file path, or a target prefix ending with '/'.",
+    )
+    add_argument(
+        copy_parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel server-side copies shared by files and copy parts.",
+    )
+    copy_parser.set_defaults(_parser=copy_parser)
+    copy_parser.set_defaults(handler=copy_files_in_workspace.handle)
+
+    move_parser = file_subparsers.add_parser(
+        "move",
+        help="Move files or a prefix inside a workspace bucket without downloading them.",
+    )
+    add_auth_arguments(move_parser)
+    add_output_arguments(move_parser)
+    add_argument(move_parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(
+        move_parser,
+        "source",
+        required=True,
+        help="Source file path in the workspace, or a prefix ending with '/'.",
+    )
+    add_argument(
+        move_parser,
+        "target",
+        required=True,
+        help="Target file path, or a target prefix ending with '/'.",
+    )
+    add_argument(
+        move_parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel server-side copies shared by files and copy parts.",
+    )
+    move_parser.set_defaults(_parser=move_parser)
+    move_parser.set_defaults(handler=move_files_in_workspace.handle)
+
+    delete_prefix_parser = file_subparsers.add_parser(
+        "delete-prefix",
+        help="Delete every file below a prefix of a workspace bucket.",
+    )
+    add_auth_arguments(delete_prefix_parser)
+    add_output_arguments(delete_prefix_parser)
+    add_argument(delete_prefix_parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(delete_prefix_parser, "prefix", required=True, help="Directory prefix to delete; a trailing slash is implied.")
+    add_argument(
+        delete_prefix_parser,
+        "include",
+        required=False,
+        default="",
+        help="Only delete files whose name fully matches this regular expression.",
+    )
+    add_argument(
+        delete_prefix_parser,
+        "ignore",
+        required=False,
+        default="",
+        help="Keep files whose name fully matches this regular expression.",
+    )
+    add_bool_argument(
+        delete_prefix_parser,
+        "dry_run",
+        default=False,
+        help_text="Only report the files and bytes that would be deleted.",
+    )
+    add_argument(
+        delete_prefix_parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Number of concurrent 1000-key delete batches.",
+    )
+    delete_prefix_parser.set_defaults(_parser=delete_prefix_parser)
+    delete_prefix_parser.set_defaults(handler=delete_prefix_from_workspace.handle)
+
 
 def _add_ies_group(subparsers: Any) -> None:
     ies_parser = subparsers.add_parser("ies", help="IES application commands.")
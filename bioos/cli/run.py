@@ -4,11 +4,20 @@ from bioos.resource.workflows import Run
 
 def handle_list(args):
     workspace_id = _login_and_resolve_workspace(args)
+    if getattr(args, "all", False):
+        return Run.list_runs(
+            workspace_id=workspace_id,
+            submission_id=args.submission_id,
+            page_size=args.page_size or None,
+            filter_=_build_list_filter(args),
+            all_pages=True,
+            workers=args.workers,
+        )
     return Run.list_runs(
         workspace_id=workspace_id,
         submission_id=args.submission_id,
         page_number=args.page_number,
-        page_size=args.page_size,
+        page_size=args.page_size if args.page_size is not None else 10,
         filter_=_build_list_filter(args),
     )
 
@@ -0,0 +1,89 @@
+import sys
+
+from bioos.cli.common import add_argument, add_bool_argument, build_parser, run_cli
+from bioos.internal.progress import JsonLinesSink, TransferProgress
+from bioos.ops.auth import workspace_context_from_args
+
+
+def build_args():
+    parser = build_parser("Synchronize a local directory to a Bio-OS workspace prefix.")
+    add_argument(parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(parser, "source", required=True, help="Local directory whose contents are synchronized.")
+    add_argument(parser, "target", required=False, default="", help="Target prefix path in the workspace bucket.")
+    add_bool_argument(
+        parser,
+        "delete",
+        default=False,
+        help_text="Delete objects under target that no longer exist locally.",
+    )
+    add_bool_argument(
+        parser,
+        "dry_run",
+        default=False,
+        help_text="Only report the files and bytes that would be uploaded or deleted.",
+    )
+    add_argument(
+        parser,
+        "checkpoint_dir",
+        required=False,
+        default=None,
+        help="Directory for resumable upload checkpoints.",
+    )
+    add_argument(
+        parser,
+        "max_retries",
+        required=False,
+        type=int,
+        default=3,
+        help="Number of retries per file after the initial attempt.",
+    )
+    add_argument(
+        parser,
+        "task_num",
+        required=False,
+        type=int,
+        default=10,
+        help="Total parallel transfers shared by small files and multipart upload parts.",
+    )
+    add_bool_argument(
+        parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
+    )
+    return parser
+
+
+def handle(args):
+    _, ws = workspace_context_from_args(args)
+    progress = TransferProgress(JsonLinesSink(sys.stderr)) if args.progress_json else None
+    report = ws.files.sync(
+        local_dir=args.source,
+        prefix=args.target,
+        delete=args.delete,
+        dry_run=args.dry_run,
+        checkpoint_dir=args.checkpoint_dir or "",
+        max_retries=args.max_retries,
+        task_num=args.task_num,
+        progress=progress,
+    )
+    result = {
+        "success": not report["failed_uploads"] and not report["failed_deletes"],
+        "workspace_name": args.workspace_name,
+        "source": args.source,
+        "target": args.target,
+        **report,
+    }
+    if progress is not None:
+        result["transfer_summary"] = progress.summary()
+    return result
+
+
+def main():
+    parser = build_args()
+    args = parser.parse_args()
+    sys.exit(run_cli(handle, args))
+
+
+if __name__ == "__main__":
+    main()
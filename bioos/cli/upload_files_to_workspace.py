@@ -1,6 +1,7 @@
 import sys
 
 from bioos.cli.common import add_argument, add_bool_argument, build_parser, run_cli
+from bioos.internal.progress import JsonLinesSink, TransferProgress
 from bioos.ops.workspace_files import upload_local_files_to_workspace
 
 
@@ -31,7 +32,9 @@ def build_args():
             "Preserve directory tree under target when uploading directories."
         ),
     )
-    add_bool_argument(parser, "skip_existing", default=False, help_text="Skip files whose target object already exists.")
+    add_bool_argument(parser, "skip_existing", default=False, help_text=(
+        "Skip files whose target object already exists, unless the local upload "
+        "manifest records different content for the unchanged local file."))
     add_argument(
         parser,
         "checkpoint_dir",
@@ -53,13 +56,29 @@ def build_args():
         required=False,
         type=int,
         default=10,
-        help="Parallel task count for multipart uploads.",
+        help="Total parallel transfers shared by small files and multipart upload parts.",
+    )
+    add_bool_argument(
+        parser,
+        "autotune",
+        default=False,
+        help_text=(
+            "Tune concurrency and part size from measured throughput instead of "
+            "--task-num, remembering the best settings per endpoint."
+        ),
+    )
+    add_bool_argument(
+        parser,
+        "progress_json",
+        default=False,
+        help_text="Write structured transfer progress events to stderr as JSON lines.",
     )
     return parser
 
 
 def handle(args):
-    return upload_local_files_to_workspace(
+    progress = TransferProgress(JsonLinesSink(sys.stderr)) if args.progress_json else None
+    result = upload_local_files_to_workspace(
         workspace_name=args.workspace_name,
         sources=args.source,
         target=args.target,
@@ -68,10 +87,15 @@ def handle(args):
         checkpoint_dir=args.checkpoint_dir,
         max_retries=args.max_retries,
         task_num=args.task_num,
+        autotune=args.autotune,
+        progress=progress,
         access_key=args.ak,
         secret_key=args.sk,
         endpoint=args.endpoint,
     )
+    if progress is not None:
+        result["transfer_summary"] = progress.summary()
+    return result
 
 
 def main():
@@ -0,0 +1,68 @@
+import sys
+
+from bioos.cli.common import add_argument, build_parser, run_cli
+from bioos.internal.progress import JsonLinesSink
+from bioos.ops.auth import workspace_context_from_args
+
+
+def build_args():
+    parser = build_parser("Stream submission and run status changes as JSON lines.")
+    add_argument(parser, "workspace_name", required=True, help="Workspace name.")
+    add_argument(
+        parser,
+        "submission_id",
+        required=False,
+        action="append",
+        default=None,
+        help="Submission ID to watch; repeatable. Watches the whole workspace if omitted.",
+    )
+    add_argument(parser, "since", required=False, type=int, default=None,
+                 help="Only watch submissions started at or after this unix time.")
+    add_argument(parser, "min_interval", required=False, type=float, default=10,
+                 help="Seconds between snapshots while statuses change.")
+    add_argument(parser, "max_interval", required=False, type=float, default=60,
+                 help="Longest seconds between snapshots.")
+    add_argument(parser, "timeout", required=False, type=float, default=None,
+                 help="Stop watching after this many seconds.")
+    add_argument(parser, "max_polls", required=False, type=int, default=None,
+                 help="Stop watching after this many snapshots.")
+    return parser
+
+
+def handle(args):
+    _, ws = workspace_context_from_args(args)
+    sink = JsonLinesSink(sys.stdout)
+    event_count = 0
+    final_status = {}
+    interrupted = False
+    try:
+        for event in ws.watch(submission_ids=args.submission_id,
+                              since=args.since,
+                              min_interval=args.min_interval,
+                              max_interval=args.max_interval,
+                              timeout=args.timeout,
+                              max_polls=args.max_polls):
+            sink(event.to_dict())
+            event_count += 1
+            if event.kind == "submission":
+                final_status[event.submission_id] = event.status
+    except KeyboardInterrupt:
+        # Ctrl-C is how a workspace-wide watch usually ends
+        interrupted = True
+    return {
+        "kind": "watch_finished",
+        "workspace_name": args.workspace_name,
+        "event_count": event_count,
+        "submissions": final_status,
+        "interrupted": interrupted,
+    }
+
+
+def main():
+    parser = build_args()
+    args = parser.parse_args()
+    sys.exit(run_cli(handle, args))
+
+
+if __name__ == "__main__":
+    main()
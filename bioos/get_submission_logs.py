@@ -32,6 +32,8 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument('--submission_id', required=True, help='ID of the submission to download logs')
     parser.add_argument('--output_dir', default='.', help='Local directory to save the logs (default: current directory)')
     parser.add_argument('--endpoint', help='Bio-OS instance platform endpoint', default=DEFAULT_ENDPOINT)
+    parser.add_argument('--parallel_listing', action='store_true',
+                        help='List the workspace bucket with concurrent prefix shards')
     return parser
 
 
@@ -42,7 +44,7 @@ def handle(args) -> str:
     ws = bioos.workspace(workspace_id)
 
     logger.info(f"Listing files for submission {args.submission_id}")
-    files_df = ws.files.list(recursive=True)
+    files_df = ws.files.list(recursive=True, parallel=args.parallel_listing)
 
     log_files = []
     for file in files_df.key:
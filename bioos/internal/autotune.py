@@ -0,0 +1,148 @@
+import json
+import math
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+DEFAULT_AUTOTUNE_STATE_PATH = os.path.join(
+    os.path.expanduser("~"), ".bioos", "transfer-tuning.json")
+
+
+class TransferAutotuner:
+    """Tunes transfer concurrency and part size from observed throughput.
+
+    Concurrency is hill-climbed once per measurement window: it keeps moving
+    in the same direction while aggregate throughput improves and turns
+    around when it drops. Part size follows per-part latency, growing when
+    parts finish so quickly that request overhead dominates and shrinking
+    when a single part takes long enough to make retries expensive. The best
+    settings seen are remembered per endpoint for later runs.
+    """
+
+    _instances: Dict[str, "TransferAutotuner"] = {}
+    _instances_lock = threading.Lock()
+
+    WINDOW_SECONDS = 5.0
+    # relative throughput change treated as noise
+    THROUGHPUT_TOLERANCE = 0.05
+    FAST_PART_SECONDS = 2.0
+    SLOW_PART_SECONDS = 20.0
+
+    def __init__(self,
+                 endpoint: str,
+                 state_path: str = DEFAULT_AUTOTUNE_STATE_PATH,
+                 min_task_num: int = 2,
+                 max_task_num: int = 64,
+                 min_part_size: int = 5 * 1024 * 1024,
+                 max_part_size: int = 512 * 1024 * 1024,
+                 initial_task_num: int = 10,
+                 clock: Callable[[], float] = time.monotonic):
+        self.endpoint = endpoint
+        self.state_path = os.path.abspath(os.path.expanduser(state_path))
+        self.min_task_num = max(int(min_task_num), 1)
+        self.max_task_num = max(int(max_task_num), self.min_task_num)
+        self.min_part_size = int(min_part_size)
+        self.max_part_size = max(int(max_part_size), self.min_part_size)
+        self._clock = clock
+        self._lock = threading.Lock()
+
+        remembered = self._load_state().get(endpoint, {})
+        self.task_num = self._clamp_task_num(
+            remembered.get("task_num", initial_task_num))
+        self.part_size = self._clamp_part_size(
+            remembered.get("part_size", self.min_part_size))
+        self._best = {
+            "task_num": self.task_num,
+            "part_size": self.part_size,
+            "throughput": remembered.get("throughput", 0.0),
+        }
+
+        self._direction = 1
+        self._last_throughput = None
+        self._window_start = self._clock()
+        self._window_bytes = 0
+
+    @classmethod
+    def for_endpoint(cls, endpoint: str) -> "TransferAutotuner":
+        """Returns the process-wide tuner of an endpoint, so tuning carries
+        over from one batch to the next.
+        """
+        with cls._instances_lock:
+            tuner = cls._instances.get(endpoint)
+            if tuner is None:
+                tuner = cls(endpoint)
+                cls._instances[endpoint] = tuner
+            return tuner
+
+    def _clamp_task_num(self, value) -> int:
+        return min(max(int(value), self.min_task_num), self.max_task_num)
+
+    def _clamp_part_size(self, value) -> int:
+        return min(max(int(value), self.min_part_size), self.max_part_size)
+
+    def _load_state(self) -> Dict[str, Dict[str, float]]:
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if isinstance(state, dict) else {}
+
+    def record(self, nbytes: int, seconds: float, parts: int = 1,
+               threads: int = 1) -> None:
+        """Feeds one finished transfer into the tuner.
+
+        :param nbytes: bytes moved by the transfer
+        :param seconds: wall time of the transfer
+        :param parts: number of parts it was split into
+        :param threads: part threads it ran with
+        """
+        with self._lock:
+            self._window_bytes += max(int(nbytes), 0)
+            if parts > 1 and seconds > 0:
+                rounds = math.ceil(parts / max(int(threads), 1))
+                self._tune_part_size(seconds / rounds)
+            now = self._clock()
+            elapsed = now - self._window_start
+            if elapsed >= self.WINDOW_SECONDS:
+                self._tune_task_num(self._window_bytes / elapsed)
+                self._window_start = now
+                self._window_bytes = 0
+
+    def _tune_part_size(self, part_seconds: float) -> None:
+        if part_seconds < self.FAST_PART_SECONDS:
+            self.part_size = self._clamp_part_size(self.part_size * 2)
+        elif part_seconds > self.SLOW_PART_SECONDS:
+            self.part_size = self._clamp_part_size(self.part_size // 2)
+
+    def _tune_task_num(self, throughput: float) -> None:
+        if throughput > self._best["throughput"]:
+            self._best = {
+                "task_num": self.task_num,
+                "part_size": self.part_size,
+                "throughput": throughput,
+            }
+        last = self._last_throughput
+        self._last_throughput = throughput
+        if last is not None:
+            if throughput < last * (1 - self.THROUGHPUT_TOLERANCE):
+                self._direction = -self._direction
+            elif throughput <= last * (1 + self.THROUGHPUT_TOLERANCE):
+                return
+        step = max(self.task_num // 4, 1)
+        self.task_num = self._clamp_task_num(self.task_num +
+                                             self._direction * step)
+
+    def save(self) -> None:
+        """Remembers the best settings seen for this endpoint."""
+        with self._lock:
+            best = dict(self._best)
+        state = self._load_state()
+        state[self.endpoint] = best
+        directory = os.path.dirname(self.state_path)
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
@@ -0,0 +1,182 @@
+import datetime
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from typing import Callable, Dict, Optional, Tuple
+
+from tos.credential import Credentials, CredentialsProvider
+
+from bioos.config import Config
+from bioos.internal.tos import REFRESH_TOKEN_TIME_BEFORE_EXPIRE
+
+# seconds before a failed background refresh is tried again
+CREDENTIAL_RETRY_INTERVAL = 30
+# the token is treated as expired this long before ExpiredTime
+CREDENTIAL_EXPIRY_SAFETY = 5 * 60
+# background refreshes stop after this many failures in a row
+CREDENTIAL_MAX_REFRESH_FAILURES = 5
+
+
+class TosCredentialManager(CredentialsProvider):
+    """Caches the TOS STS credentials of a workspace and renews them in the
+    background.
+
+    A daemon timer refreshes the token ``refresh_margin`` seconds before it
+    expires, so signing a request only reads the cached credentials and
+    transfers never wait for ``GetTOSAccess``. Only when the token is
+    already unusable does a caller refresh synchronously; concurrent callers
+    then share a single request instead of issuing one each.
+
+    The workspace registry and the timer only hold weak references, so a
+    manager no longer used by any client is collected and its pending timer
+    cancelled. Background refreshes also stop after ``close`` and
+    after ``max_failures`` failures in a row; the next caller holding an
+    expired token then refreshes, which re-arms the timer on success.
+    """
+
+    _instances: "weakref.WeakValueDictionary[Tuple[str, str, str], TosCredentialManager]" = \
+        weakref.WeakValueDictionary()
+    _instances_lock = threading.Lock()
+
+    def __init__(self,
+                 fetch: Callable[[], Dict[str, str]],
+                 initial: Optional[Dict[str, str]] = None,
+                 refresh_margin: float = REFRESH_TOKEN_TIME_BEFORE_EXPIRE,
+                 retry_interval: float = CREDENTIAL_RETRY_INTERVAL,
+                 max_failures: int = CREDENTIAL_MAX_REFRESH_FAILURES,
+                 clock: Callable[[], float] = time.time):
+        self._fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.retry_interval = retry_interval
+        self.max_failures = max_failures
+        self._failures = 0
+        self._closed = False
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._credentials: Optional[Credentials] = None
+        self._expires_at = 0.0
+        self._pending: Optional[Future] = None
+        self._timer: Optional[threading.Timer] = None
+        self._timer_finalizer: Optional[weakref.finalize] = None
+        if initial is not None and "SessionToken" in initial:
+            self._apply(initial)
+
+    @classmethod
+    def for_workspace(cls,
+                      workspace_id: str,
+                      initial: Optional[Dict[str, str]] = None
+                      ) -> "TosCredentialManager":
+        """Returns the process-wide manager of a workspace for the current
+        login, seeding it with an already fetched ``GetTOSAccess`` response.
+        """
+        login_info = Config.login_info()
+        key = (login_info.endpoint, login_info.access_key, workspace_id)
+        with cls._instances_lock:
+            manager = cls._instances.get(key)
+            if manager is None or manager._closed:
+                manager = cls(lambda: Config.service().get_tos_access(
+                    {"WorkspaceID": workspace_id}),
+                              initial=initial)
+                cls._instances[key] = manager
+            return manager
+
+    @classmethod
+    def close_all(cls) -> None:
+        """Stops the background refresh of every workspace manager."""
+        with cls._instances_lock:
+            managers = list(cls._instances.values())
+            cls._instances.clear()
+        for manager in managers:
+            manager.close()
+
+    @staticmethod
+    def _parse_expiry(value: str) -> float:
+        return datetime.datetime.fromisoformat(value).timestamp()
+
+    def _apply(self, payload: Dict[str, str]) -> None:
+        credentials = Credentials(payload["AccessKey"], payload["SecretKey"],
+                                  payload["SessionToken"])
+        expires_at = self._parse_expiry(
+            payload["ExpiredTime"]) - CREDENTIAL_EXPIRY_SAFETY
+        with self._lock:
+            self._credentials = credentials
+            self._expires_at = expires_at
+            self._failures = 0
+        self._schedule(max(expires_at - self.refresh_margin - self._clock(), 0))
+
+    def _schedule(self, delay: float) -> None:
+        timer = threading.Timer(delay, _refresh_in_background,
+                                args=(weakref.ref(self), ))
+        timer.daemon = True
+        with self._lock:
+            if self._closed:
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer_finalizer.detach()
+            self._timer = timer
+            self._timer_finalizer = weakref.finalize(self, timer.cancel)
+        timer.start()
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as err:
+            with self._lock:
+                self._failures += 1
+                failures = self._failures
+            if failures >= self.max_failures:
+                Config.Logger.error(
+                    f"refresh TOS credentials failed {failures} times, "
+                    f"stop refreshing in background: {err}")
+                return
+            Config.Logger.warn(f"refresh TOS credentials failed: {err}")
+            self._schedule(self.retry_interval)
+
+    def refresh(self) -> None:
+        """Fetches new credentials, joining a refresh already in progress."""
+        with self._lock:
+            pending = self._pending
+            owner = pending is None
+            if owner:
+                pending = self._pending = Future()
+        if not owner:
+            pending.result()
+            return
+        try:
+            self._apply(self._fetch())
+            pending.set_result(None)
+        except Exception as err:
+            pending.set_exception(err)
+            raise
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def get_credentials(self) -> Credentials:
+        with self._lock:
+            credentials = self._credentials
+            usable = credentials is not None and self._clock() < self._expires_at
+        if not usable:
+            self.refresh()
+            with self._lock:
+                credentials = self._credentials
+        return credentials
+
+    def close(self) -> None:
+        """Stops the background refresh; credentials are still served and
+        refreshed on demand."""
+        with self._lock:
+            self._closed = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer_finalizer.detach()
+                self._timer = None
+                self._timer_finalizer = None
+
+
+def _refresh_in_background(manager_ref: "weakref.ref[TosCredentialManager]"):
+    manager = manager_ref()
+    if manager is not None:
+        manager._refresh_in_background()
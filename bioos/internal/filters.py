@@ -0,0 +1,161 @@
+import datetime
+import re
+from typing import Iterable, Iterator, List, Optional, Pattern, Union
+
+Patterns = Union[str, Iterable[str], None]
+Timestamp = Union[datetime.datetime, float, int, None]
+
+
+def glob_to_regex(pattern: str) -> str:
+    """Translates a path glob into a regex.
+
+    ``*`` and ``?`` never cross ``/``, ``**`` matches across directories and
+    a leading or inner ``**/`` also matches no directory at all.
+    """
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace("\\", "\\\\")
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body}]")
+                i = end + 1
+                continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def _as_list(patterns: Patterns):
+    if patterns is None or patterns == "":
+        return []
+    if isinstance(patterns, str):
+        return [patterns]
+    return [pattern for pattern in patterns if pattern]
+
+
+def _as_timestamp(value: Timestamp) -> Optional[float]:
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.timestamp()
+    return float(value)
+
+
+def _compile(patterns) -> List[Pattern]:
+    # one regex per pattern, so inline flags such as (?i) keep their meaning
+    return [re.compile(pattern) for pattern in patterns]
+
+
+class FileFilter:
+    """Include/ignore rules and size/mtime predicates compiled once and
+    applied to many paths.
+
+    Regexes and globs match the file name, or with ``match_path`` the whole
+    path relative to the root of the operation (the uploaded or synced
+    directory, the listed or deleted prefix, or the full key for explicit
+    key lists); in that mode ``**/*.bam`` matches BAMs at any depth. Each
+    pattern is compiled on its own. A path passes when it matches some
+    include pattern (or none are given), no ignore pattern, and every size
+    and mtime bound; bounds fail when the size or mtime is unknown.
+    """
+
+    def __init__(self,
+                 include: Patterns = None,
+                 ignore: Patterns = None,
+                 include_globs: Patterns = None,
+                 ignore_globs: Patterns = None,
+                 min_size: Optional[int] = None,
+                 max_size: Optional[int] = None,
+                 modified_after: Timestamp = None,
+                 modified_before: Timestamp = None,
+                 match_path: bool = False):
+        self.match_path = match_path
+        self._includes = _compile(
+            _as_list(include) +
+            [glob_to_regex(glob) for glob in _as_list(include_globs)])
+        self._ignores = _compile(
+            _as_list(ignore) +
+            [glob_to_regex(glob) for glob in _as_list(ignore_globs)])
+        self.min_size = min_size
+        self.max_size = max_size
+        self.modified_after = _as_timestamp(modified_after)
+        self.modified_before = _as_timestamp(modified_before)
+
+    @classmethod
+    def build(cls,
+              file_filter: Optional["FileFilter"] = None,
+              include: str = "",
+              ignore: str = "") -> "FileFilter":
+        """Returns ``file_filter``, or one made from the legacy single-regex
+        ``include``/``ignore`` arguments, which always match the file name.
+        """
+        if file_filter is not None:
+            if include or ignore:
+                raise ValueError(
+                    "pass include/ignore either as regexes or in file_filter")
+            return file_filter
+        return cls(include=include, ignore=ignore)
+
+    @property
+    def needs_size(self) -> bool:
+        return self.min_size is not None or self.max_size is not None
+
+    @property
+    def needs_mtime(self) -> bool:
+        return self.modified_after is not None or self.modified_before is not None
+
+    def matches(self,
+                path: str,
+                size: Optional[int] = None,
+                mtime: Timestamp = None) -> bool:
+        target = path if self.match_path else path.rstrip("/").rpartition("/")[2]
+        if self._includes and not any(
+                pattern.fullmatch(target) for pattern in self._includes):
+            return False
+        if any(pattern.fullmatch(target) for pattern in self._ignores):
+            return False
+        if self.needs_size:
+            if size is None:
+                return False
+            if self.min_size is not None and size < self.min_size:
+                return False
+            if self.max_size is not None and size > self.max_size:
+                return False
+        if self.needs_mtime:
+            mtime = _as_timestamp(mtime)
+            if mtime is None:
+                return False
+            if self.modified_after is not None and mtime < self.modified_after:
+                return False
+            if self.modified_before is not None and mtime >= self.modified_before:
+                return False
+        return True
+
+    def matches_object(self, obj, root: str = "") -> bool:
+        """Matches a listed object by its key relative to ``root``."""
+        key = obj.key[len(root):] if root and obj.key.startswith(root) else obj.key
+        return self.matches(key, obj.size,
+                            getattr(obj, "last_modified", None))
+
+    def filter_objects(self, objects: Iterable, root: str = "") -> Iterator:
+        return (obj for obj in objects if self.matches_object(obj, root))
@@ -0,0 +1,146 @@
+import os
+import sqlite3
+import threading
+from typing import Callable, Dict, Optional
+
+DEFAULT_UPLOAD_MANIFEST_PATH = os.path.join(
+    os.path.expanduser("~"), ".bioos", "upload-manifest.sqlite3")
+UPLOAD_MANIFEST_PATH_ENV = "BIOOS_UPLOAD_MANIFEST_PATH"
+DEFAULT_MANIFEST_COMMIT_EVERY = 256
+
+
+def get_manifest_path(explicit_path: Optional[str] = None) -> str:
+    if explicit_path:
+        return explicit_path
+    return os.getenv(UPLOAD_MANIFEST_PATH_ENV) or DEFAULT_UPLOAD_MANIFEST_PATH
+
+
+class UploadManifest:
+    """Remembers the checksum of local files and where they were last uploaded.
+
+    An entry is keyed by the absolute path and is only trusted while the
+    file's inode, size and mtime_ns are unchanged, so an untouched file never
+    has to be read again to learn its CRC64. Writes are committed every
+    ``commit_every`` entries and on ``flush``/``close``.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_UPLOAD_MANIFEST_PATH,
+                 commit_every: int = DEFAULT_MANIFEST_COMMIT_EVERY):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.commit_every = max(int(commit_every), 1)
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pending = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS files ("
+                         "path TEXT PRIMARY KEY, inode INTEGER, size INTEGER, "
+                         "mtime_ns INTEGER, crc64 TEXT, bucket TEXT, key TEXT)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    @staticmethod
+    def _stat(file_path: str):
+        abs_path = os.path.abspath(file_path)
+        st = os.stat(abs_path)
+        return abs_path, st.st_ino, st.st_size, st.st_mtime_ns
+
+    def lookup(self, file_path: str) -> Optional[Dict[str, object]]:
+        """Returns the entry of an unchanged file, or None.
+
+        :return: ``crc64``, ``bucket`` and ``key`` recorded for the file
+        :rtype: Optional[Dict[str, object]]
+        """
+        abs_path, inode, size, mtime_ns = self._stat(file_path)
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT inode, size, mtime_ns, crc64, bucket, key FROM files "
+                "WHERE path = ?", (abs_path, )).fetchone()
+        if row is None or tuple(row[:3]) != (inode, size, mtime_ns):
+            return None
+        return {
+            "crc64": int(row[3]) if row[3] is not None else None,
+            "bucket": row[4],
+            "key": row[5],
+        }
+
+    def _upsert(self, file_path: str, **values) -> None:
+        abs_path, inode, size, mtime_ns = self._stat(file_path)
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT inode, size, mtime_ns, crc64, bucket, key FROM files "
+                "WHERE path = ?", (abs_path, )).fetchone()
+            current = {"crc64": None, "bucket": None, "key": None}
+            if row is not None and tuple(row[:3]) == (inode, size, mtime_ns):
+                current = {"crc64": row[3], "bucket": row[4], "key": row[5]}
+            current.update({k: v for k, v in values.items() if v is not None})
+            if current["crc64"] is not None:
+                current["crc64"] = str(int(current["crc64"]))
+            conn.execute(
+                "INSERT OR REPLACE INTO files "
+                "(path, inode, size, mtime_ns, crc64, bucket, key) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (abs_path, inode, size, mtime_ns, current["crc64"],
+                 current["bucket"], current["key"]))
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                conn.commit()
+                self._pending = 0
+
+    def crc64(self,
+              file_path: str,
+              compute: Callable[[str], int],
+              on_error: Optional[Callable[[str], None]] = None) -> int:
+        """Returns the CRC64 of a file, computing and recording it only when
+        the file is new or has changed since it was last seen.
+
+        :param on_error: Called with a message when the database can not be
+                         read or written; the CRC64 is then computed without
+                         the manifest instead of raising
+        """
+        try:
+            entry = self.lookup(file_path)
+        except sqlite3.Error as err:
+            if on_error is None:
+                raise
+            on_error(f"failed to read {file_path} from upload manifest: {err}")
+            entry = None
+        if entry is not None and entry["crc64"] is not None:
+            return entry["crc64"]
+        value = compute(file_path)
+        try:
+            self._upsert(file_path, crc64=value)
+        except sqlite3.Error as err:
+            if on_error is None:
+                raise
+            on_error(f"failed to record {file_path} in upload manifest: {err}")
+        return value
+
+    def record_upload(self,
+                      file_path: str,
+                      bucket: str,
+                      key: str,
+                      crc64: Optional[int] = None) -> None:
+        self._upsert(file_path, crc64=crc64, bucket=bucket, key=key)
+
+    def flush(self) -> None:
+        """Commits the entries written since the last commit."""
+        with self._lock:
+            if self._conn is not None and self._pending:
+                self._conn.commit()
+                self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                if self._pending:
+                    self._conn.commit()
+                    self._pending = 0
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import random
+from typing import Callable, Dict, Iterable, List, Optional
+
+FINISHED_RUN_STATUSES = ("Succeeded", "Failed")
+# statuses that usually change within minutes
+FAST_RUN_STATUSES = ("Pending", "Queued")
+
+DEFAULT_MIN_INTERVAL = 10
+DEFAULT_MAX_INTERVAL = 600
+
+
+class AdaptivePollInterval:
+    """Picks the delay before the next status check of one submission.
+
+    The delay drops to ``min_interval`` whenever a run changed status or is
+    still queued, since those phases end quickly, and grows by ``backoff``
+    on every quiet check up to ``max_interval`` while runs sit in a long
+    Running phase. Each delay is jittered by ``jitter`` so many monitored
+    submissions do not hit the API in lockstep.
+    """
+
+    def __init__(self,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 backoff: float = 1.5,
+                 jitter: float = 0.1,
+                 rng: Callable[[], float] = random.random):
+        if min_interval <= 0 or max_interval < min_interval:
+            raise ValueError("need 0 < min_interval <= max_interval")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.jitter = jitter
+        self._rng = rng
+        self.current = min_interval
+
+    def next(self, changed: bool, statuses: Iterable[str]) -> float:
+        if changed or any(status in FAST_RUN_STATUSES for status in statuses):
+            self.current = self.min_interval
+        else:
+            self.current = min(self.current * self.backoff, self.max_interval)
+        return self.current * (1 + self.jitter * (2 * self._rng() - 1))
+
+
+class SubmissionMonitor:
+    """Watches many submissions concurrently in one event loop.
+
+    ``fetch_runs(submission_id)`` returns the ``ListRuns`` items of a
+    submission and runs in a worker thread, as does
+    ``on_run_finished(submission_id, run)``, which is called once per run the
+    moment it reaches a finished status, e.g. to download its outputs.
+    A failed status check is logged and retried on a later tick with a
+    growing delay, so an API error never ends the watch of a submission,
+    and a failing callback is logged without stopping it either.
+    """
+
+    def __init__(self,
+                 fetch_runs: Callable[[str], List[dict]],
+                 on_run_finished: Optional[Callable[[str, dict], None]] = None,
+                 min_interval: float = DEFAULT_MIN_INTERVAL,
+                 max_interval: float = DEFAULT_MAX_INTERVAL,
+                 logger=None,
+                 sleep=asyncio.sleep):
+        self._fetch_runs = fetch_runs
+        self._on_run_finished = on_run_finished
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self._logger = logger or logging.getLogger(__name__)
+        self._sleep = sleep
+
+    async def watch(self, submission_id: str) -> List[dict]:
+        """Polls a submission until all its runs finished.
+
+        :return: The final run items
+        :rtype: List[dict]
+        """
+        interval = AdaptivePollInterval(self.min_interval, self.max_interval)
+        loop = asyncio.get_running_loop()
+        statuses: Dict[str, str] = {}
+        while True:
+            try:
+                runs = await loop.run_in_executor(
+                    None, self._fetch_runs, submission_id)
+            except Exception as err:
+                self._logger.warning(
+                    f"Check submission {submission_id} failed, retrying: {err}")
+                # a failure never counts as activity, so the delay backs off
+                await self._sleep(interval.next(False, ()))
+                continue
+            changed = False
+            for run in runs:
+                status = run.get("Status")
+                previous = statuses.get(run.get("ID"))
+                if status == previous:
+                    continue
+                changed = True
+                statuses[run.get("ID")] = status
+                self._logger.info(
+                    f"Submission {submission_id} run {run.get('ID')}: "
+                    f"{previous or 'new'} -> {status}")
+                if status in FINISHED_RUN_STATUSES and \
+                        self._on_run_finished is not None:
+                    try:
+                        await loop.run_in_executor(
+                            None, self._on_run_finished, submission_id, run)
+                    except Exception as err:
+                        self._logger.error(
+                            f"Handle finished run {run.get('ID')} of submission "
+                            f"{submission_id} failed: {err}")
+            if runs and all(status in FINISHED_RUN_STATUSES
+                            for status in statuses.values()):
+                return runs
+            await self._sleep(interval.next(changed, statuses.values()))
+
+    async def watch_all(self,
+                        submission_ids: Iterable[str]) -> Dict[str, List[dict]]:
+        submission_ids = list(dict.fromkeys(submission_ids))
+        results = await asyncio.gather(
+            *(self.watch(submission_id) for submission_id in submission_ids))
+        return dict(zip(submission_ids, results))
+
+    def run(self, submission_ids: Iterable[str]) -> Dict[str, List[dict]]:
+        """Blocks until every submission finished.
+
+        :return: The final run items keyed by submission id
+        :rtype: Dict[str, List[dict]]
+        """
+        return asyncio.run(self.watch_all(submission_ids))
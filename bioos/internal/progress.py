@@ -0,0 +1,224 @@
+import json
+import threading
+import time
+from typing import Callable, Dict, Optional, TextIO
+
+from tos import DataTransferType
+
+
+class JsonLinesSink:
+    """Writes each progress event as one JSON line."""
+
+    def __init__(self, stream: TextIO):
+        self._stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, event: Dict[str, object]):
+        line = json.dumps(event, default=str)
+        with self._lock:
+            self._stream.write(line + "\n")
+            self._stream.flush()
+
+
+class TransferProgress:
+    """Tracks the files of a transfer batch and reports structured events.
+
+    Events are dicts with an ``event`` field (``batch_started``,
+    ``file_started``, ``progress``, ``part_completed``, ``file_retry``,
+    ``file_finished``, ``batch_finished``) delivered to ``sink``.
+    ``progress`` events carry per-file and aggregate bytes, bytes/sec and
+    ETA, and are emitted at most once per ``interval`` seconds per file.
+    """
+
+    def __init__(self,
+                 sink: Optional[Callable[[Dict[str, object]], None]] = None,
+                 interval: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self._sink = sink
+        self._interval = interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._files = {}
+        self._direction = None
+        self._started = None
+        self._total_bytes = 0
+
+    def _emit(self, event: Dict[str, object]):
+        if self._sink is not None:
+            self._sink(event)
+
+    @staticmethod
+    def _eta(remaining: int, rate: float) -> Optional[float]:
+        if rate <= 0:
+            return None
+        return round(max(remaining, 0) / rate, 3)
+
+    def batch_started(self, direction: str, files: int, total_bytes: int):
+        with self._lock:
+            self._direction = direction
+            self._started = self._clock()
+            self._total_bytes = int(total_bytes)
+        self._emit({
+            "event": "batch_started",
+            "direction": direction,
+            "files": files,
+            "total_bytes": int(total_bytes),
+        })
+
+    def file_started(self, key: str, size: int):
+        with self._lock:
+            if self._started is None:
+                self._started = self._clock()
+            self._files[key] = {
+                "size": int(size or 0),
+                "bytes": 0,
+                "started": self._clock(),
+                "last_emit": None,
+                "retries": 0,
+                "parts": [],
+                "status": "running",
+            }
+        self._emit({"event": "file_started", "key": key, "size": int(size or 0)})
+
+    def _aggregate(self, now: float) -> Dict[str, object]:
+        done = sum(state["bytes"] for state in self._files.values())
+        elapsed = now - self._started if self._started is not None else 0
+        rate = done / elapsed if elapsed > 0 else 0.0
+        return {
+            "bytes": done,
+            "total_bytes": self._total_bytes,
+            "bytes_per_sec": round(rate, 3),
+            "eta_seconds": self._eta(self._total_bytes - done, rate),
+        }
+
+    def data_listener(self, key: str):
+        """Returns a TOS ``data_transfer_listener`` reporting into this tracker."""
+
+        def listener(consumed_bytes, total_bytes, rw_once_bytes,
+                     type_: DataTransferType):
+            now = self._clock()
+            with self._lock:
+                state = self._files.get(key)
+                if state is None:
+                    return
+                state["bytes"] = int(consumed_bytes)
+                if total_bytes:
+                    state["size"] = int(total_bytes)
+                finished = type_ in (DataTransferType.Data_Transfer_Succeed,
+                                     DataTransferType.Data_Transfer_Failed)
+                if not finished and state["last_emit"] is not None and \
+                        now - state["last_emit"] < self._interval:
+                    return
+                state["last_emit"] = now
+                elapsed = now - state["started"]
+                rate = state["bytes"] / elapsed if elapsed > 0 else 0.0
+                event = {
+                    "event": "progress",
+                    "key": key,
+                    "bytes": state["bytes"],
+                    "size": state["size"],
+                    "bytes_per_sec": round(rate, 3),
+                    "eta_seconds": self._eta(state["size"] - state["bytes"], rate),
+                    "batch": self._aggregate(now),
+                }
+            self._emit(event)
+
+        return listener
+
+    def part_listener(self, key: str):
+        """Returns a TOS upload/download event listener recording part timings."""
+
+        def listener(event_type, err, *args):
+            part_info = args[-1] if args else None
+            if part_info is None or not getattr(event_type, "name", "").endswith("Part_Succeed"):
+                return
+            now = self._clock()
+            with self._lock:
+                state = self._files.get(key)
+                if state is None:
+                    return
+                elapsed = now - state["started"]
+                previous = state["parts"][-1] if state["parts"] else 0.0
+                state["parts"].append(elapsed)
+            self._emit({
+                "event": "part_completed",
+                "key": key,
+                "part_number": getattr(part_info, "part_number", None),
+                "part_size": getattr(part_info, "part_size", None) or getattr(part_info, "size", None),
+                "elapsed_seconds": round(elapsed, 3),
+                "since_previous_part_seconds": round(elapsed - previous, 3),
+            })
+
+        return listener
+
+    def file_retry(self, key: str, attempt: int, error: Exception):
+        with self._lock:
+            state = self._files.get(key)
+            if state is not None:
+                state["retries"] += 1
+        self._emit({
+            "event": "file_retry",
+            "key": key,
+            "attempt": attempt,
+            "error": str(error),
+        })
+
+    def file_finished(self, key: str, status: str, error: Optional[str] = None):
+        now = self._clock()
+        with self._lock:
+            state = self._files.get(key)
+            if state is None:
+                return
+            state["status"] = status
+            if status == "succeeded":
+                state["bytes"] = state["size"]
+            elapsed = now - state["started"]
+            event = {
+                "event": "file_finished",
+                "key": key,
+                "status": status,
+                "error": error,
+                "bytes": state["bytes"],
+                "seconds": round(elapsed, 3),
+                "bytes_per_sec": round(state["bytes"] / elapsed, 3) if elapsed > 0 else None,
+                "retries": state["retries"],
+                "parts": len(state["parts"]),
+            }
+        self._emit(event)
+
+    def summary(self) -> Dict[str, object]:
+        """Returns the effective throughput of the batch so far."""
+        now = self._clock()
+        with self._lock:
+            elapsed = now - self._started if self._started is not None else 0.0
+            moved = sum(state["bytes"] for state in self._files.values()
+                        if state["status"] == "succeeded")
+            statuses = {}
+            for state in self._files.values():
+                statuses[state["status"]] = statuses.get(state["status"], 0) + 1
+            slowest = sorted(
+                ((key, state["bytes"] / (now - state["started"]))
+                 for key, state in self._files.items()
+                 if state["status"] == "succeeded" and now > state["started"]),
+                key=lambda item: item[1])[:5]
+            summary = {
+                "event": "batch_finished",
+                "direction": self._direction,
+                "files": len(self._files),
+                "statuses": statuses,
+                "bytes": moved,
+                "seconds": round(elapsed, 3),
+                "bytes_per_sec": round(moved / elapsed, 3) if elapsed > 0 else None,
+                "retries": sum(state["retries"] for state in self._files.values()),
+                "slowest_files": [{
+                    "key": key,
+                    "bytes_per_sec": round(rate, 3)
+                } for key, rate in slowest],
+            }
+        return summary
+
+    def finish(self) -> Dict[str, object]:
+        """Emits the end-of-batch summary as ``batch_finished`` and returns it."""
+        summary = self.summary()
+        self._emit(summary)
+        return summary
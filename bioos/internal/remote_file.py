@@ -0,0 +1,153 @@
+import io
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Optional
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024 * 4
+DEFAULT_READ_AHEAD = 2
+DEFAULT_CACHE_BLOCKS = 16
+
+
+class RemoteFile(io.RawIOBase):
+    """A read-only, seekable view of an object backed by ranged GETs.
+
+    The object is read in ``block_size`` blocks kept in an LRU cache of
+    ``cache_blocks`` entries. While a caller reads sequentially, the next
+    ``read_ahead`` blocks are fetched in the background, so parsing overlaps
+    with the network. Random access (index lookups, header peeks) only
+    fetches the blocks it touches.
+    """
+
+    def __init__(self,
+                 client,
+                 bucket: str,
+                 key: str,
+                 size: Optional[int] = None,
+                 block_size: int = DEFAULT_BLOCK_SIZE,
+                 read_ahead: int = DEFAULT_READ_AHEAD,
+                 cache_blocks: int = DEFAULT_CACHE_BLOCKS):
+        super().__init__()
+        if block_size <= 0:
+            raise ValueError("block_size must be positive")
+        self._client = client
+        self._bucket = bucket
+        self.key = key
+        self.size = int(size) if size is not None else int(
+            client.head_object(bucket=bucket, key=key).content_length)
+        self.block_size = int(block_size)
+        self.read_ahead = max(int(read_ahead), 0)
+        # the blocks being read and prefetched must fit in the cache
+        self.cache_blocks = max(int(cache_blocks), self.read_ahead + 1)
+        self._pos = 0
+        # reading block 0 first counts as a sequential read
+        self._last_block = -1
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, bytes]" = OrderedDict()
+        self._inflight: Dict[int, Future] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.read_ahead) if self.read_ahead else None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        self._checkClosed()
+        if whence == io.SEEK_SET:
+            pos = offset
+        elif whence == io.SEEK_CUR:
+            pos = self._pos + offset
+        elif whence == io.SEEK_END:
+            pos = self.size + offset
+        else:
+            raise ValueError(f"invalid whence ({whence})")
+        if pos < 0:
+            raise ValueError(f"negative seek position {pos}")
+        self._pos = pos
+        return pos
+
+    def _fetch_block(self, index: int) -> bytes:
+        start = index * self.block_size
+        end = min(start + self.block_size, self.size) - 1
+        resp = self._client.get_object(bucket=self._bucket,
+                                       key=self.key,
+                                       range_start=start,
+                                       range_end=end)
+        return resp.read()
+
+    def _remember(self, index: int, data: bytes) -> None:
+        with self._lock:
+            self._cache[index] = data
+            self._cache.move_to_end(index)
+            while len(self._cache) > self.cache_blocks:
+                self._cache.popitem(last=False)
+
+    def _prefetch(self, index: int) -> None:
+        last_index = (self.size - 1) // self.block_size
+        for ahead in range(index + 1, min(index + self.read_ahead, last_index) + 1):
+            with self._lock:
+                if ahead in self._cache or ahead in self._inflight:
+                    continue
+                future = self._executor.submit(self._fetch_block, ahead)
+                self._inflight[ahead] = future
+            future.add_done_callback(
+                lambda done, ahead=ahead: self._prefetched(ahead, done))
+
+    def _prefetched(self, index: int, future: Future) -> None:
+        with self._lock:
+            self._inflight.pop(index, None)
+        if not future.cancelled() and future.exception() is None:
+            self._remember(index, future.result())
+
+    def _block(self, index: int) -> bytes:
+        with self._lock:
+            data = self._cache.get(index)
+            if data is not None:
+                self._cache.move_to_end(index)
+            future = self._inflight.get(index)
+        if data is None:
+            # a failed prefetch is simply fetched again here
+            if future is not None and future.exception() is None:
+                data = future.result()
+            else:
+                data = self._fetch_block(index)
+            self._remember(index, data)
+        # read ahead only while the caller moves forward block by block
+        if self._executor is not None and self._last_block in (index - 1, index):
+            self._prefetch(index)
+        self._last_block = index
+        return data
+
+    def readinto(self, b) -> int:
+        self._checkClosed()
+        view = memoryview(b).cast("B")
+        written = 0
+        while written < len(view) and self._pos < self.size:
+            index, offset = divmod(self._pos, self.block_size)
+            block = self._block(index)
+            count = min(len(block) - offset, len(view) - written)
+            if count <= 0:
+                break
+            view[written:written + count] = block[offset:offset + count]
+            written += count
+            self._pos += count
+        return written
+
+    def readall(self) -> bytes:
+        chunks = []
+        while True:
+            chunk = self.read(self.block_size)
+            if not chunk:
+                return b"".join(chunks)
+            chunks.append(chunk)
+
+    def close(self) -> None:
+        if not self.closed and self._executor is not None:
+            self._executor.shutdown(wait=False)
+        super().close()
@@ -1,16 +1,32 @@
+import datetime
 import hashlib
+import hmac
+import io
+import itertools
 import math
 import os
-import re
-from typing import Dict, List
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple, Union
+from urllib.parse import quote
 
 import tos
 from tos import DataTransferType, HttpMethodType
 from tos.exceptions import TosClientError
-from tos.models2 import DeleteError, ListedObject, ObjectTobeDeleted
+from tos.models2 import DeleteError, ListedObject, ObjectTobeDeleted, UploadedPart
+from tos.utils import SizeAdapter
 
 from bioos.config import Config
 from bioos.errors import ParameterError
+from bioos.internal.autotune import TransferAutotuner
+from bioos.internal.filters import FileFilter
+from bioos.internal.manifest import UploadManifest
+from bioos.internal.progress import TransferProgress
+from bioos.internal.remote_file import (DEFAULT_BLOCK_SIZE, DEFAULT_CACHE_BLOCKS,
+                                        DEFAULT_READ_AHEAD, RemoteFile)
 from bioos.log import Logger
 
 DEFAULT_THREAD = 10
@@ -21,6 +37,15 @@ MAX_ALLOWED_PARTS = 10000
 MIN_PART_SIZE = 1024 * 1024 * 5
 ONE_BATCH_REQUEST = 50
 ONE_BATCH_MAX_DELETE = 1000
+# objects above this size must be copied part by part
+COPY_OBJECT_LIMITATION = 1024 * 1024 * 1024 * 5
+COPY_PART_SIZE = 1024 * 1024 * 512
+# part size of streamed uploads whose total size is unknown
+STREAM_PART_SIZE = 1024 * 1024 * 16
+# groups with fewer keys than this are checked by HEAD instead of listing
+EXISTS_LIST_MIN_KEYS = 8
+# listing pages each shard of a parallel listing may buffer ahead of the reader
+PARALLEL_LIST_BUFFER_PAGES = 4
 REFRESH_TOKEN_TIME_BEFORE_EXPIRE = 20 * 60
 
 CRC_CHECK_ERROR_PREFIX = "Check CRC failed"
@@ -43,22 +68,152 @@ def tos_percentage(
             format(rate, consumed_bytes, total_bytes, rw_once_bytes))
 
 
+class _TransferBudget:
+    """A shared pool of transfer slots.
+
+    Small files hold a single slot while they upload; multipart transfers
+    take as many slots as are free (up to what they can use) and spend them
+    as part threads, so files and parts never exceed one global budget.
+    """
+
+    def __init__(self, total: int):
+        self._total = max(int(total), 1)
+        self._available = self._total
+        self._cond = threading.Condition()
+
+    def acquire(self, wanted: int) -> int:
+        with self._cond:
+            wanted = min(max(int(wanted), 1), self._total)
+            while self._available <= 0:
+                self._cond.wait()
+            granted = min(wanted, self._available)
+            self._available -= granted
+            return granted
+
+    def resize(self, total: int):
+        # slots in use when shrinking are absorbed as they are released
+        with self._cond:
+            total = max(int(total), 1)
+            self._available += total - self._total
+            self._total = total
+            self._cond.notify_all()
+
+    def release(self, count: int):
+        with self._cond:
+            self._available = min(self._available + count, self._total)
+            self._cond.notify_all()
+
+
+class _PartSampler:
+    """An upload/download event listener feeding each finished part of a
+    multipart transfer into the autotuner, so its throughput window fills
+    while a single large file is still moving.
+    """
+
+    def __init__(self, autotuner: TransferAutotuner, budget: _TransferBudget,
+                 listener: Optional[Callable] = None):
+        self._autotuner = autotuner
+        self._budget = budget
+        self._listener = listener
+        self._lock = threading.Lock()
+        self._last = time.monotonic()
+        self.recorded = 0
+
+    def __call__(self, event_type, err, *args):
+        if self._listener is not None:
+            self._listener(event_type, err, *args)
+        part_info = args[-1] if args else None
+        if part_info is None or not getattr(event_type, "name", "").endswith("Part_Succeed"):
+            return
+        # upload parts carry part_size, download parts a size property
+        nbytes = int(getattr(part_info, "part_size", None) or getattr(part_info, "size", 0))
+        now = time.monotonic()
+        with self._lock:
+            seconds = now - self._last
+            self._last = now
+            self.recorded += nbytes
+        self._autotuner.record(nbytes, seconds)
+        self._budget.resize(self._autotuner.task_num)
+
+
+def file_crc64(file_path: str) -> int:
+    crc64 = tos.utils.Crc64()
+    with open(file_path, "rb") as f:
+        while True:
+            chunk = f.read(ONE_BATCH_WRITE_SIZE)
+            if not chunk:
+                break
+            crc64.update(chunk)
+    return crc64.crc
+
+
+def multipart_part_size(fsize: int,
+                        autotuner: Optional[TransferAutotuner] = None) -> int:
+    part_size = max(int(fsize / MAX_ALLOWED_PARTS) + 1, MIN_PART_SIZE)
+    if autotuner is not None:
+        part_size = max(part_size, autotuner.part_size)
+    return part_size
+
+
+class _MemoryviewReader:
+    """A seekable reader handing out slices of a buffer without copying."""
+
+    def __init__(self, view: memoryview):
+        self._view = view
+        self._pos = 0
+
+    def read(self, amt: Optional[int] = None) -> memoryview:
+        end = len(self._view) if amt is None or amt < 0 else \
+            min(self._pos + amt, len(self._view))
+        chunk = self._view[self._pos:end]
+        self._pos = end
+        return chunk
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        base = {io.SEEK_SET: 0, io.SEEK_CUR: self._pos, io.SEEK_END: len(self._view)}
+        self._pos = min(max(base[whence] + offset, 0), len(self._view))
+        return self._pos
+
+    def tell(self) -> int:
+        return self._pos
+
+
+def _buffer_content(view: memoryview) -> SizeAdapter:
+    # SizeAdapter lets the SDK rewind the body when it retries the request
+    return SizeAdapter(_MemoryviewReader(view), len(view), init_offset=0,
+                       can_reset=True)
+
+
 class TOSHandler:
 
     def __init__(
             self,
             client: tos.clientv2.TosClientV2,  # fixed
             bucket: str,
-            logger: Logger = Config.Logger):
+            logger: Logger = Config.Logger,
+            manifest: Optional[UploadManifest] = None,
+            manifest_path: Optional[str] = None):
         # client should be with federation_credential
         self._client = client
         self._bucket = bucket
+        # with only a path, the manifest database is opened on first use
+        self._manifest = manifest
+        self._manifest_path = manifest_path
+        self._manifest_lock = threading.Lock()
 
         self._debug_logging = logger.debug
         self._info_logging = logger.info
         self._warn_logging = logger.warn
         self._error_logging = logger.error
 
+    @property
+    def manifest(self) -> Optional[UploadManifest]:
+        if self._manifest is None and self._manifest_path:
+            with self._manifest_lock:
+                if self._manifest is None:
+                    self._manifest = UploadManifest(self._manifest_path)
+        return self._manifest
+
     def _is_crc_check_error(self, error: TosClientError) -> bool:
         if not isinstance(error, TosClientError):
             return False
@@ -71,14 +226,210 @@ class TOSHandler:
                                            self._bucket, file_path,
                                            duration).signed_url
 
+    def presign_download_urls(self, file_paths: List[str],
+                              duration: int) -> List[str]:
+        """Pre-signs download URLs for many keys at once.
+
+        Produces the same TOS V4 query signature as ``presign_download_url``,
+        but the credentials are fetched and the signing key is derived once
+        for the whole batch, leaving a single HMAC per key.
+        """
+        if not file_paths:
+            return []
+        auth = self._client.auth
+        credential = auth.credentials_provider.get_credentials()
+        date = datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{date[:8]}/{auth.region}/tos/request"
+        signing_key = credential.get_access_key_secret().encode("utf-8")
+        for part in (date[:8], auth.region, "tos", "request"):
+            signing_key = hmac.new(signing_key, part.encode("utf-8"),
+                                   hashlib.sha256).digest()
+
+        endpoint = self._client.endpoint
+        scheme = "http://" if endpoint.startswith("http://") else "https://"
+        if endpoint.startswith(scheme):
+            endpoint = endpoint[len(scheme):]
+        host = f"{self._bucket}.{endpoint}"
+        params = {
+            "X-Tos-Algorithm": "TOS4-HMAC-SHA256",
+            "X-Tos-Credential": f"{credential.get_access_key_id()}/{scope}",
+            "X-Tos-Date": date,
+            "X-Tos-Expires": duration,
+            "X-Tos-SignedHeaders": "host",
+        }
+        if credential.get_security_token():
+            params["X-Tos-Security-Token"] = credential.get_security_token()
+        canonical_query = "&".join(
+            f"{quote(k, safe='-_.~')}={quote(str(params[k]), safe='-_.~')}"
+            for k in sorted(params))
+        query = "&".join(f"{quote(k, safe='')}={quote(str(v), safe='')}"
+                         for k, v in params.items())
+
+        urls = []
+        for file_path in file_paths:
+            path = "/" + quote(file_path, safe="/~")
+            canonical_request = "\n".join([
+                "GET", path, canonical_query,
+                f"host:{host}\n", "host", "UNSIGNED-PAYLOAD"
+            ])
+            string_to_sign = "\n".join([
+                "TOS4-HMAC-SHA256", date, scope,
+                hashlib.sha256(canonical_request.encode("utf-8")).hexdigest()
+            ])
+            signature = hmac.new(signing_key, string_to_sign.encode("utf-8"),
+                                 hashlib.sha256).hexdigest()
+            urls.append(f"{scheme}{host}{path}?{query}&X-Tos-Signature={signature}")
+        return urls
+
+    def open_object(self,
+                    key: str,
+                    size: Optional[int] = None,
+                    block_size: int = DEFAULT_BLOCK_SIZE,
+                    read_ahead: int = DEFAULT_READ_AHEAD,
+                    cache_blocks: int = DEFAULT_CACHE_BLOCKS) -> RemoteFile:
+        return RemoteFile(self._client, self._bucket, key, size=size,
+                          block_size=block_size, read_ahead=read_ahead,
+                          cache_blocks=cache_blocks)
+
+    def read_object_range(self, key: str, start: int, length: int) -> bytes:
+        """Reads ``length`` bytes from ``start`` with one ranged GET; reads
+        past the end of the object return what is there.
+        """
+        if length <= 0:
+            return b""
+        try:
+            return self._client.get_object(bucket=self._bucket,
+                                           key=key,
+                                           range_start=start,
+                                           range_end=start + length - 1).read()
+        except tos.exceptions.TosServerError as e:
+            # 416: the object is empty or shorter than start
+            if e.status_code == 416:
+                return b""
+            raise
+
     def object_exists(self, file_path: str) -> bool:
+        return self._head_object_info(file_path) is not None
+
+    def _head_object_info(self, key: str) -> Optional[Dict[str, object]]:
         try:
-            self._client.head_object(bucket=self._bucket, key=file_path)
-            return True
+            resp = self._client.head_object(bucket=self._bucket, key=key)
         except tos.exceptions.TosServerError as err:
             if err.status_code == 404:
-                return False
+                return None
             raise
+        return {
+            "size": resp.content_length,
+            "last_modified": resp.last_modified,
+            "hash_crc64_ecma": resp.hash_crc64_ecma,
+        }
+
+    def _list_object_infos(
+            self, prefix: str, keys: List[str]
+    ) -> Tuple[Dict[str, Dict[str, object]], List[str]]:
+        """Answers keys of one directory from a delimited listing.
+
+        The listing only covers the range between the smallest and largest
+        wanted key. How many other entries that range holds is unknown
+        before listing, so the spread is measured on the way: once the pages
+        fetched outnumber the wanted keys they resolved, the range is
+        sparser than HEADs would cost and the listing stops.
+
+        :return: the infos of the listed keys that exist, and the wanted keys
+                 the listing did not reach, to be checked by HEAD
+        """
+        wanted = set(keys)
+        first_key, last_key = min(keys), max(keys)
+        found = {}
+        # every key after this marker sorts at or after first_key
+        marker = first_key[:-1] if len(first_key) > len(prefix) + 1 else None
+        pages = 0
+        listed_up_to = ""
+        while True:
+            resp = self._client.list_objects(bucket=self._bucket,
+                                             prefix=prefix,
+                                             delimiter="/",
+                                             marker=marker,
+                                             max_keys=LIST_OBJECT_MAX_KEYS)
+            pages += 1
+            for obj in resp.contents:
+                if obj.key in wanted:
+                    found[obj.key] = {
+                        "size": obj.size,
+                        "last_modified": obj.last_modified,
+                        "hash_crc64_ecma": obj.hash_crc64_ecma,
+                    }
+            # a truncated page may hold only common prefixes, so track the
+            # position from both
+            listed = [obj.key for obj in resp.contents] + [
+                p.prefix for p in (getattr(resp, "common_prefixes", None) or [])
+            ]
+            if listed:
+                listed_up_to = max(listed_up_to, max(listed))
+            # keys come back in lexicographic order, so stop once past the last one
+            if not resp.is_truncated or not resp.next_marker or \
+                    listed_up_to >= last_key:
+                return found, []
+            resolved = sum(1 for key in wanted if key <= listed_up_to)
+            if pages > resolved:
+                return found, sorted(key for key in wanted
+                                     if key > listed_up_to)
+            marker = resp.next_marker
+
+    def objects_exist(
+        self,
+        keys: List[str],
+        task_num: int = DEFAULT_THREAD
+    ) -> Dict[str, Optional[Dict[str, object]]]:
+        """Checks a batch of keys for existence.
+
+        Keys are grouped by parent directory: groups of at least
+        ``EXISTS_LIST_MIN_KEYS`` keys are answered from a delimited listing of
+        their key range, other keys by parallel HEADs. A listing that turns
+        out to be sparser than HEADs hands its remaining keys to HEADs.
+
+        :return: key -> ``{"size", "last_modified", "hash_crc64_ecma"}``, or
+                 None when the object does not exist
+        :rtype: Dict[str, Optional[Dict[str, object]]]
+        """
+        unique_keys = list(dict.fromkeys(keys))
+        result = {key: None for key in unique_keys}
+        if not unique_keys:
+            return result
+
+        groups = {}
+        for key in unique_keys:
+            parent = key.rpartition("/")[0]
+            groups.setdefault(f"{parent}/" if parent else "", []).append(key)
+
+        listed_groups = []
+        head_keys = []
+        for prefix, group_keys in groups.items():
+            if len(group_keys) >= EXISTS_LIST_MIN_KEYS:
+                listed_groups.append((prefix, group_keys))
+            else:
+                head_keys.extend(group_keys)
+
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        with ThreadPoolExecutor(max_workers=task_num) as executor:
+            list_futures = [
+                executor.submit(self._list_object_infos, prefix, group_keys)
+                for prefix, group_keys in listed_groups
+            ]
+            head_futures = {
+                executor.submit(self._head_object_info, key): key
+                for key in head_keys
+            }
+            for future in list_futures:
+                found, unreached = future.result()
+                result.update(found)
+                head_futures.update({
+                    executor.submit(self._head_object_info, key): key
+                    for key in unreached
+                })
+            for future, key in head_futures.items():
+                result[key] = future.result()
+        return result
 
     def _resolve_upload_key(self,
                             file_path: str,
@@ -94,15 +445,15 @@ class TOSHandler:
 
         return os.path.normpath(os.path.join(target_path, to_upload_path))
 
-    def _passes_file_filter(self,
-                            file_path: str,
-                            include: str = "",
-                            ignore: str = "") -> bool:
-        basename = os.path.basename(os.path.normpath(file_path))
-        if include != "":
-            return re.fullmatch(include, basename) is not None and not (
-                ignore != "" and re.fullmatch(ignore, basename))
-        return not (ignore != "" and re.fullmatch(ignore, basename))
+    @staticmethod
+    def _local_file_matches(file_filter: FileFilter, match_path: str,
+                            file_path: str) -> bool:
+        size = mtime = None
+        # only stat when a predicate needs it
+        if file_filter.needs_size or file_filter.needs_mtime:
+            st = os.stat(file_path)
+            size, mtime = st.st_size, st.st_mtime
+        return file_filter.matches(match_path.replace(os.sep, "/"), size, mtime)
 
     def _iter_directory_upload_files(self, directory_path: str) -> List[str]:
         files_to_upload = []
@@ -136,7 +487,9 @@ class TOSHandler:
         flatten: bool,
         ignore: str = "",
         include: str = "",
+        file_filter: Optional[FileFilter] = None,
     ) -> List[Dict[str, object]]:
+        file_filter = FileFilter.build(file_filter, include, ignore)
         upload_plan = []
         normalized_sources = [
             os.path.normpath(os.path.expanduser(str(file_path)))
@@ -146,7 +499,9 @@ class TOSHandler:
         for source in normalized_sources:
             if os.path.isdir(source):
                 for file_path in self._iter_directory_upload_files(source):
-                    if not self._passes_file_filter(file_path, include, ignore):
+                    if not self._local_file_matches(
+                            file_filter, os.path.relpath(file_path, source),
+                            file_path):
                         continue
                     key_source = self._directory_upload_key_source(
                         source, file_path, flatten)
@@ -157,7 +512,7 @@ class TOSHandler:
                     })
                 continue
 
-            if not self._passes_file_filter(source, include, ignore):
+            if not self._local_file_matches(file_filter, source, source):
                 continue
             upload_plan.append({
                 "source": source,
@@ -167,6 +522,148 @@ class TOSHandler:
 
         return upload_plan
 
+    def build_sync_plan(self,
+                        local_dir: str,
+                        target_path: str,
+                        ignore: str = "",
+                        include: str = "",
+                        file_filter: Optional[FileFilter] = None) -> List[Dict[str, object]]:
+        file_filter = FileFilter.build(file_filter, include, ignore)
+        local_dir = os.path.normpath(os.path.expanduser(str(local_dir)))
+        if not os.path.isdir(local_dir):
+            raise ParameterError("local_dir", local_dir)
+
+        sync_plan = []
+        for file_path in self._iter_directory_upload_files(local_dir):
+            if not self._local_file_matches(
+                    file_filter, os.path.relpath(file_path, local_dir), file_path):
+                continue
+            sync_plan.append({
+                "source": file_path,
+                "key": self._resolve_upload_key(
+                    os.path.relpath(file_path, local_dir), target_path, False),
+                "size": os.path.getsize(file_path),
+            })
+        return sync_plan
+
+    def local_crc64(self, file_path: str) -> int:
+        if self.manifest is None:
+            return file_crc64(file_path)
+        return self.manifest.crc64(file_path, file_crc64,
+                                   on_error=self._warn_logging)
+
+    def local_file_changed(self, file_path: str,
+                           remote: Optional[Dict[str, object]]) -> bool:
+        """Tells from the manifest alone, without reading the file, whether
+        a local file is known to differ from an existing remote object.
+        """
+        if self.manifest is None or not remote or not remote.get("hash_crc64_ecma"):
+            return False
+        try:
+            entry = self.manifest.lookup(file_path)
+        except sqlite3.Error as err:  # the manifest is only an optimization
+            self._warn_logging(f"failed to read {file_path} from upload manifest: {err}")
+            return False
+        if entry is None or entry["crc64"] is None:
+            return False
+        return entry["crc64"] != int(remote["hash_crc64_ecma"])
+
+    def _sync_item_changed(self, item: Dict[str, object],
+                           remote: ListedObject) -> bool:
+        if remote is None or int(item["size"]) != int(remote.size):
+            return True
+        if not remote.hash_crc64_ecma:
+            return True
+        return self.local_crc64(str(item["source"])) != int(remote.hash_crc64_ecma)
+
+    def sync_directory(self,
+                       local_dir: str,
+                       target_path: str,
+                       delete: bool = False,
+                       dry_run: bool = False,
+                       ignore: str = "",
+                       include: str = "",
+                       checkpoint_dir: str = "",
+                       max_retries: int = 3,
+                       task_num: int = DEFAULT_THREAD,
+                       progress: Optional[TransferProgress] = None,
+                       file_filter: Optional[FileFilter] = None) -> Dict[str, object]:
+        """Makes ``target_path`` mirror the contents of ``local_dir``.
+
+        Local files are compared with the bucket listing by size and, when
+        the sizes match, by CRC64; only new or changed files are uploaded.
+
+        :return: the sync report, with the planned uploads and deletions,
+                 their byte totals and the failed items
+        :rtype: Dict[str, object]
+        """
+        file_filter = FileFilter.build(file_filter, include, ignore)
+        sync_plan = self.build_sync_plan(local_dir, target_path,
+                                         file_filter=file_filter)
+        remote_prefix = os.path.normpath(target_path) if target_path else ""
+        if remote_prefix in ("", "."):
+            remote_prefix = ""
+        else:
+            remote_prefix += "/"
+        remote_objects = {
+            obj.key: obj
+            for obj in self.iter_objects(remote_prefix)
+            if not obj.key.endswith("/")
+        }
+
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        with ThreadPoolExecutor(max_workers=task_num) as executor:
+            changed = list(
+                executor.map(
+                    lambda item: self._sync_item_changed(
+                        item, remote_objects.get(item["key"])), sync_plan))
+        self._flush_manifest()
+        to_upload = [
+            item for item, is_changed in zip(sync_plan, changed) if is_changed
+        ]
+
+        local_keys = {item["key"] for item in sync_plan}
+        to_delete = []
+        if delete:
+            to_delete = [
+                key for key in sorted(remote_objects) if key not in local_keys
+                and file_filter.matches_object(remote_objects[key], remote_prefix)
+            ]
+
+        report = {
+            "dry_run": dry_run,
+            "upload_count": len(to_upload),
+            "upload_bytes": sum(int(item["size"]) for item in to_upload),
+            "delete_count": len(to_delete),
+            "delete_bytes": sum(int(remote_objects[key].size) for key in to_delete),
+            "unchanged_count": len(sync_plan) - len(to_upload),
+            "uploads": [{
+                "source": item["source"],
+                "key": item["key"],
+                "size": item["size"],
+                "reason": "new" if item["key"] not in remote_objects else "changed",
+            } for item in to_upload],
+            "deletes": to_delete,
+            "failed_uploads": [],
+            "failed_deletes": [],
+        }
+        if dry_run:
+            return report
+
+        if to_upload:
+            report["failed_uploads"] = self.upload_planned_objects(
+                upload_plan=to_upload,
+                checkpoint_dir=checkpoint_dir,
+                max_retries=max_retries,
+                task_num=task_num,
+                progress=progress,
+            )
+        if to_delete:
+            report["failed_deletes"] = [
+                err.key for err in self.delete_objects(to_delete) or []
+            ]
+        return report
+
     def upload_key_conflicts(self,
                              upload_plan: List[Dict[str, object]]) -> Dict[str, List[str]]:
         key_sources = {}
@@ -178,10 +675,8 @@ class TOSHandler:
             if len(sources) > 1
         }
 
-    def _build_upload_checkpoint_file(self,
-                                      file_path: str,
-                                      tos_target_path: str,
-                                      checkpoint_dir: str) -> str:
+    def _build_checkpoint_file(self, file_path: str, tos_target_path: str,
+                               checkpoint_dir: str, kind: str) -> str:
         if not checkpoint_dir:
             return None
 
@@ -192,27 +687,47 @@ class TOSHandler:
             f"{self._bucket}\0{tos_target_path}\0{os.path.abspath(file_path)}".
             encode("utf-8")).hexdigest()
         return os.path.join(resolved_checkpoint_dir,
-                            f"{checkpoint_key}.upload.ckpt")
+                            f"{checkpoint_key}.{kind}.ckpt")
 
-    def _upload_small_file(self, file_path: str, tos_target_path: str):
-        self._client.put_object_from_file(
+    def _build_upload_checkpoint_file(self,
+                                      file_path: str,
+                                      tos_target_path: str,
+                                      checkpoint_dir: str) -> str:
+        return self._build_checkpoint_file(file_path, tos_target_path,
+                                           checkpoint_dir, "upload")
+
+    def _build_download_checkpoint_file(self,
+                                        file_path: str,
+                                        tos_target_path: str,
+                                        checkpoint_dir: str) -> str:
+        return self._build_checkpoint_file(file_path, tos_target_path,
+                                           checkpoint_dir, "download")
+
+    def _upload_small_file(self, file_path: str, tos_target_path: str,
+                           progress: Optional[TransferProgress] = None):
+        return self._client.put_object_from_file(
             bucket=self._bucket,
             key=tos_target_path,
             file_path=file_path,
-            # don't show progress while uploading small file
-            # data_transfer_listener=tos_percentage
-        )
+            # small files only report progress to a structured listener
+            data_transfer_listener=progress.data_listener(tos_target_path)
+            if progress else None)
 
     def _upload_big_file(self,
                          file_path: str,
                          tos_target_path: str,
                          fsize: int,
                          checkpoint_dir: str,
-                         task_num: int):
-        part_size = max(int(fsize / MAX_ALLOWED_PARTS) + 1, MIN_PART_SIZE)
+                         task_num: int,
+                         part_size: Optional[int] = None,
+                         progress: Optional[TransferProgress] = None,
+                         part_listener: Optional[Callable] = None):
+        part_size = part_size or multipart_part_size(fsize)
+        if part_listener is None and progress is not None:
+            part_listener = progress.part_listener(tos_target_path)
         checkpoint_file = self._build_upload_checkpoint_file(
             file_path, tos_target_path, checkpoint_dir)
-        self._client.upload_file(
+        return self._client.upload_file(
             bucket=self._bucket,
             key=tos_target_path,
             file_path=file_path,
@@ -220,7 +735,9 @@ class TOSHandler:
             task_num=task_num,
             enable_checkpoint=checkpoint_file is not None,
             checkpoint_file=checkpoint_file,
-            data_transfer_listener=tos_percentage)
+            data_transfer_listener=progress.data_listener(tos_target_path)
+            if progress else tos_percentage,
+            upload_event_listener=part_listener)
 
     def _upload_with_retry(self,
                            file_path: str,
@@ -228,66 +745,315 @@ class TOSHandler:
                            fsize: int,
                            checkpoint_dir: str,
                            max_retries: int,
-                           task_num: int):
+                           task_num: int,
+                           part_size: Optional[int] = None,
+                           progress: Optional[TransferProgress] = None,
+                           part_listener: Optional[Callable] = None):
         total_attempts = max_retries + 1
         for attempt_index in range(total_attempts):
             try:
                 if fsize <= SIMPLE_UPLOAD_LIMITATION:
-                    self._upload_small_file(file_path, tos_target_path)
-                else:
-                    self._upload_big_file(file_path, tos_target_path, fsize,
-                                          checkpoint_dir, task_num)
-                return
+                    return self._upload_small_file(file_path, tos_target_path,
+                                                   progress)
+                return self._upload_big_file(file_path, tos_target_path, fsize,
+                                             checkpoint_dir, task_num, part_size,
+                                             progress, part_listener)
             except Exception as err:
                 if attempt_index == total_attempts - 1:
                     raise
+                if progress is not None:
+                    progress.file_retry(tos_target_path, attempt_index + 1, err)
                 self._warn_logging(
                     f"upload {tos_target_path} failed on attempt "
                     f"{attempt_index + 1}/{total_attempts}: {err}. Retrying...")
 
-    def list_objects(self, target_path: str, num: int) -> List[ListedObject]:
-        object_list = []
-        if num != 0:
-            if num <= LIST_OBJECT_MAX_KEYS:
-                resp = self._client.list_objects(bucket=self._bucket,
-                                                 prefix=target_path,
-                                                 max_keys=num)
-                object_list = resp.contents
-            else:
-                remain = num
-                cur_marker = None
-                while True:
-                    if remain <= LIST_OBJECT_MAX_KEYS:
-                        object_list += self._client.list_objects(
-                            bucket=self._bucket,
-                            prefix=target_path,
-                            marker=cur_marker,
-                            max_keys=remain).contents
-                        break
-                    else:
-                        resp = self._client.list_objects(
-                            bucket=self._bucket,
-                            prefix=target_path,
-                            marker=cur_marker,
-                            max_keys=LIST_OBJECT_MAX_KEYS)
-                        object_list += resp.contents
-                        if not resp.is_truncated:
+    def _upload_slots_wanted(self, fsize: int, task_num: int,
+                             part_size: Optional[int] = None) -> int:
+        if fsize <= SIMPLE_UPLOAD_LIMITATION:
+            return 1
+        part_size = part_size or multipart_part_size(fsize)
+        return min(math.ceil(fsize / part_size), task_num)
+
+    def _part_sampler(self, autotuner: Optional[TransferAutotuner],
+                      budget: _TransferBudget, key: str,
+                      progress: Optional[TransferProgress] = None
+                      ) -> Optional[_PartSampler]:
+        if autotuner is None:
+            return None
+        return _PartSampler(autotuner, budget,
+                            progress.part_listener(key) if progress else None)
+
+    def _record_throughput(self, autotuner: Optional[TransferAutotuner],
+                           budget: _TransferBudget, fsize: int,
+                           started: float, part_size: int, slots: int,
+                           sampler: Optional[_PartSampler] = None):
+        if autotuner is None:
+            return
+        # bytes of parts the sampler already fed in are not counted twice
+        sampled = sampler.recorded if sampler is not None else 0
+        autotuner.record(max(fsize - sampled, 0), time.monotonic() - started,
+                         max(math.ceil(fsize / part_size), 1), slots)
+        budget.resize(autotuner.task_num)
+
+    def _upload_planned_item(self,
+                             budget: _TransferBudget,
+                             file_path: str,
+                             tos_target_path: str,
+                             fsize: int,
+                             checkpoint_dir: str,
+                             max_retries: int,
+                             task_num: int,
+                             autotuner: Optional[TransferAutotuner] = None,
+                             progress: Optional[TransferProgress] = None) -> bool:
+        part_size = multipart_part_size(fsize, autotuner)
+        slots = budget.acquire(
+            self._upload_slots_wanted(fsize, task_num, part_size))
+        try:
+            self._info_logging(
+                f"[{file_path}] begins to upload to [{tos_target_path}]")
+            if progress is not None:
+                progress.file_started(tos_target_path, fsize)
+            sampler = self._part_sampler(autotuner, budget, tos_target_path,
+                                         progress)
+            started = time.monotonic()
+            resp = self._upload_with_retry(file_path, tos_target_path, fsize,
+                                           checkpoint_dir, max_retries, slots,
+                                           part_size, progress, sampler)
+            self._record_throughput(autotuner, budget, fsize, started,
+                                    part_size, slots, sampler)
+        except Exception as err_:
+            if self._is_crc_check_error(err_):
+                self._warn_logging(f"CRC check {tos_target_path} failed, "
+                                   f"pls delete the uploaded file by hand")
+            self._error_logging(f"upload {tos_target_path} failed: {err_}")
+            if progress is not None:
+                progress.file_finished(tos_target_path, "failed", str(err_))
+            return False
+        finally:
+            budget.release(slots)
+
+        self._info_logging(f"{file_path} uploads succeed")
+        if progress is not None:
+            progress.file_finished(tos_target_path, "succeeded")
+        self._record_upload(file_path, tos_target_path, resp)
+        return True
+
+    def _save_autotuner(self, autotuner: Optional[TransferAutotuner]) -> None:
+        if autotuner is None:
+            return
+        try:
+            autotuner.save()
+        except Exception as err:  # tuning state is only an optimization
+            self._warn_logging(f"failed to save transfer tuning: {err}")
+
+    def _flush_manifest(self) -> None:
+        if self._manifest is None:
+            return
+        try:
+            self._manifest.flush()
+        except sqlite3.Error as err:  # the manifest is only an optimization
+            self._warn_logging(f"failed to commit upload manifest: {err}")
+
+    def _record_upload(self, file_path: str, tos_target_path: str, resp) -> None:
+        if self.manifest is None:
+            return
+        server_crc = getattr(resp, "hash_crc64_ecma", None)
+        try:
+            self.manifest.record_upload(file_path, self._bucket, tos_target_path,
+                                        int(server_crc) if server_crc else None)
+        except Exception as err:  # the manifest is only an optimization
+            self._warn_logging(f"failed to record {file_path} in upload manifest: {err}")
+
+    def _iter_pages(self, target_path: str,
+                    page_size: int) -> Iterator[List[ListedObject]]:
+        page_size = min(max(int(page_size), 1), LIST_OBJECT_MAX_KEYS)
+        cur_marker = None
+        while True:
+            resp = self._client.list_objects(bucket=self._bucket,
+                                             prefix=target_path,
+                                             marker=cur_marker,
+                                             max_keys=page_size)
+            yield resp.contents
+            if not resp.is_truncated:
+                return
+            cur_marker = resp.next_marker
+
+    def iter_objects(
+            self,
+            target_path: str,
+            page_size: int = LIST_OBJECT_MAX_KEYS) -> Iterator[ListedObject]:
+        """Yields the objects under a prefix page by page, so callers that
+        stop early or only aggregate never hold the whole listing.
+        """
+        for page in self._iter_pages(target_path, page_size):
+            yield from page
+
+    def iter_children(
+            self,
+            target_path: str,
+            page_size: int = LIST_OBJECT_MAX_KEYS
+    ) -> Iterator[Union[str, ListedObject]]:
+        """Yields the direct children of a prefix using delimiter listing:
+        sub-directory prefixes as strings ending with ``/`` and files as
+        ListedObjects, so the cost does not depend on the subtree size.
+        """
+        page_size = min(max(int(page_size), 1), LIST_OBJECT_MAX_KEYS)
+        cur_marker = None
+        while True:
+            resp = self._client.list_objects(bucket=self._bucket,
+                                             prefix=target_path,
+                                             delimiter="/",
+                                             marker=cur_marker,
+                                             max_keys=page_size)
+            children = [(obj.key, obj) for obj in resp.contents]
+            children += [(p.prefix, p.prefix) for p in resp.common_prefixes]
+            for _, child in sorted(children, key=lambda child: child[0]):
+                yield child
+            if not resp.is_truncated:
+                return
+            cur_marker = resp.next_marker
+
+    def walk(self, target_path: str = ""):
+        """Walks a prefix level by level, like ``os.walk``.
+
+        Yields ``(prefix, dir_prefixes, files)`` top-down; removing entries
+        from ``dir_prefixes`` stops the walk from descending into them.
+        """
+        pending = [target_path]
+        while pending:
+            prefix = pending.pop()
+            dir_prefixes = []
+            files = []
+            for child in self.iter_children(prefix):
+                if isinstance(child, str):
+                    dir_prefixes.append(child)
+                elif child.key != prefix:
+                    files.append(child)
+            yield prefix, dir_prefixes, files
+            pending.extend(reversed(dir_prefixes))
+
+    def _shard_prefixes(self, target_path: str, workers: int,
+                        executor: ThreadPoolExecutor) -> List[Union[str, ListedObject]]:
+        """Splits a prefix into key-ordered entries: sub-directory prefixes
+        to be listed as shards, and the files found between them.
+
+        Prefixes are expanded one level at a time, each level listed
+        concurrently, until there are at least ``workers`` shards or the next
+        level would not add any, so a tree with few top-level directories
+        still spreads over every worker.
+        """
+        entries = [
+            child for child in self.iter_children(target_path)
+            if isinstance(child, str) or child.key != target_path
+        ]
+        shards = [entry for entry in entries if isinstance(entry, str)]
+        while shards and len(shards) < workers:
+            children = dict(
+                zip(shards,
+                    executor.map(lambda p: list(self.iter_children(p)), shards)))
+            expanded = []
+            for entry in entries:
+                expanded.extend(children[entry] if isinstance(entry, str)
+                                else [entry])
+            expanded_shards = [entry for entry in expanded if isinstance(entry, str)]
+            if len(expanded_shards) <= len(shards):
+                break
+            entries, shards = expanded, expanded_shards
+        return entries
+
+    def _list_shard(self, shard: str, out: queue.Queue,
+                    stop: threading.Event):
+        """Feeds the pages of one shard into a bounded queue, then None;
+        a listing error is passed on in place of the end marker."""
+
+        def put(item) -> bool:
+            # the reader may have gone away, so never block for good
+            while not stop.is_set():
+                try:
+                    out.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        try:
+            for page in self._iter_pages(shard, LIST_OBJECT_MAX_KEYS):
+                if not put((shard, page)):
+                    return
+            put((shard, None))
+        except Exception as err:
+            put((shard, err))
+
+    def iter_objects_parallel(self,
+                              target_path: str,
+                              workers: int = DEFAULT_THREAD,
+                              ordered: bool = True) -> Iterator[ListedObject]:
+        """Lists a prefix by sharding it on its sub-directories and following
+        each shard's marker chain concurrently.
+
+        Pages are handed over through queues holding at most
+        ``PARALLEL_LIST_BUFFER_PAGES`` pages per shard, so memory stays
+        bounded however large a shard is. With ``ordered`` the objects come
+        out in key order; otherwise pages are streamed as they arrive.
+        """
+        workers = max(int(workers) if workers is not None else DEFAULT_THREAD, 1)
+        executor = ThreadPoolExecutor(max_workers=workers)
+        stop = threading.Event()
+        try:
+            entries = self._shard_prefixes(target_path, workers, executor)
+            shards = [entry for entry in entries if isinstance(entry, str)]
+            if not shards:
+                yield from entries
+                return
+
+            if ordered:
+                # shards start in key order, so the one being read is always
+                # running while later ones fill their own buffers
+                queues = {
+                    shard: queue.Queue(maxsize=PARALLEL_LIST_BUFFER_PAGES)
+                    for shard in shards
+                }
+                for shard in shards:
+                    executor.submit(self._list_shard, shard, queues[shard], stop)
+                for entry in entries:
+                    if not isinstance(entry, str):
+                        yield entry
+                        continue
+                    while True:
+                        _, page = queues[entry].get()
+                        if page is None:
                             break
-                        cur_marker = resp.next_marker
-                        remain = remain - LIST_OBJECT_MAX_KEYS
+                        if isinstance(page, Exception):
+                            raise page
+                        yield from page
+                return
 
-        else:
-            cur_marker = None
-            while True:
-                resp = self._client.list_objects(bucket=self._bucket,
-                                                 prefix=target_path,
-                                                 marker=cur_marker,
-                                                 max_keys=LIST_OBJECT_MAX_KEYS)
-                object_list += resp.contents
-                if not resp.is_truncated:
-                    break
-                cur_marker = resp.next_marker
-        return object_list
+            shared = queue.Queue(maxsize=PARALLEL_LIST_BUFFER_PAGES *
+                                 min(workers, len(shards)))
+            for shard in shards:
+                executor.submit(self._list_shard, shard, shared, stop)
+            yield from (entry for entry in entries if not isinstance(entry, str))
+            remaining = len(shards)
+            while remaining:
+                _, page = shared.get()
+                if page is None:
+                    remaining -= 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                yield from page
+        finally:
+            # a caller that stops early should not wait for the remaining shards
+            stop.set()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def list_objects(self, target_path: str, num: int) -> List[ListedObject]:
+        if num == 0:
+            return list(self.iter_objects(target_path))
+        return list(
+            itertools.islice(
+                self.iter_objects(target_path, min(num, LIST_OBJECT_MAX_KEYS)),
+                num))
 
     def upload_planned_objects(
         self,
@@ -295,49 +1061,77 @@ class TOSHandler:
         checkpoint_dir: str = "",
         max_retries: int = 3,
         task_num: int = DEFAULT_THREAD,
+        autotuner: Optional[TransferAutotuner] = None,
+        progress: Optional[TransferProgress] = None,
     ) -> List[str]:
+        """Uploads every planned file through one shared concurrency budget.
 
-        def _upload_fail(error_list_: List[str], file_path_: str):
-            error_list_.append(file_path_)
+        ``task_num`` bounds the total number of in-flight requests: small
+        files each take one slot, while multipart uploads spend the slots
+        they are granted as part threads. Files are started largest first so
+        the longest transfers are not left until the end of the batch. With
+        an ``autotuner``, the budget and part size follow its settings
+        instead of ``task_num``. A ``progress`` tracker receives per-file,
+        per-part and end-of-batch events.
 
+        :return: local paths that failed to upload, in plan order
+        :rtype: List[str]
+        """
         max_retries = max(int(max_retries) if max_retries is not None else 3, 0)
         task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
         if len(upload_plan) == 0:
             self._info_logging("no files to upload")
             return []
 
-        error_list = []
-        for item in upload_plan:
+        failed_indexes = set()
+        scheduled = []
+        for index, item in enumerate(upload_plan):
             file_path = str(item["source"])
             tos_target_path = str(item["key"])
             if not os.path.isfile(file_path):
-                error_list.append(file_path)
+                failed_indexes.add(index)
                 self._error_logging(f"'{file_path}' is not a file")
                 continue
             fsize = os.path.getsize(file_path)
-
-            self._info_logging(
-                f"[{file_path}] begins to upload to [{tos_target_path}]")
-
-            try:
-                if fsize == 0:
-                    self._error_logging(
-                        f"can not upload empty file {tos_target_path}")
-                    _upload_fail(error_list, file_path)
-                    continue
-                self._upload_with_retry(file_path, tos_target_path, fsize,
-                                        checkpoint_dir, max_retries,
-                                        task_num)
-            except Exception as err_:
-                if self._is_crc_check_error(err_):
-                    self._warn_logging(f"CRC check {tos_target_path} failed, "
-                                       f"pls delete the uploaded file by hand")
-                self._error_logging(f"upload {tos_target_path} failed: {err_}")
-                _upload_fail(error_list, file_path)
+            if fsize == 0:
+                self._error_logging(
+                    f"can not upload empty file {tos_target_path}")
+                failed_indexes.add(index)
                 continue
+            scheduled.append((index, file_path, tos_target_path, fsize))
 
-            self._info_logging(f"{file_path} uploads succeed")
+        # largest first, ties kept in plan order
+        scheduled.sort(key=lambda entry: entry[3], reverse=True)
+        max_task_num = task_num
+        if autotuner is not None:
+            task_num = autotuner.task_num
+            max_task_num = autotuner.max_task_num
+        budget = _TransferBudget(task_num)
+        if progress is not None:
+            progress.batch_started("upload", len(scheduled),
+                                   sum(entry[3] for entry in scheduled))
+        if scheduled:
+            with ThreadPoolExecutor(
+                    max_workers=min(max_task_num, len(scheduled))) as executor:
+                futures = {
+                    executor.submit(self._upload_planned_item, budget,
+                                    file_path, tos_target_path, fsize,
+                                    checkpoint_dir, max_retries,
+                                    max_task_num, autotuner, progress): index
+                    for index, file_path, tos_target_path, fsize in scheduled
+                }
+                for future in as_completed(futures):
+                    if not future.result():
+                        failed_indexes.add(futures[future])
+            self._save_autotuner(autotuner)
+            self._flush_manifest()
+        if progress is not None:
+            progress.finish()
 
+        error_list = [
+            str(upload_plan[index]["source"])
+            for index in sorted(failed_indexes)
+        ]
         if error_list:
             self._error_logging(
                 f"{len(error_list)} uploaded failed, please upload them again: "
@@ -370,110 +1164,662 @@ class TOSHandler:
             task_num=task_num,
         )
 
-    def download_objects(self,
-                         files_to_download: List[str],
-                         local_path: str,
-                         flatten: bool,
-                         ignore: str = "",
-                         include: str = "",
-                         force: bool = True) -> List[str]:
-        files_to_download = self.files_filter(files_to_download, include,
-                                              ignore)
+    def put_bytes(self, key: str, data: Union[bytes, memoryview]):
+        """Uploads an in-memory payload; large payloads are sent in parts
+        that are slices of the payload itself, so it is never copied."""
+        if isinstance(data, bytes) and len(data) <= SIMPLE_UPLOAD_LIMITATION:
+            return self._client.put_object(bucket=self._bucket,
+                                           key=key,
+                                           content=data)
+        view = memoryview(data).cast("B")
+        if len(view) <= SIMPLE_UPLOAD_LIMITATION:
+            return self._client.put_object(bucket=self._bucket,
+                                           key=key,
+                                           content=_buffer_content(view))
+        part_size = multipart_part_size(len(view))
+        parts = (_buffer_content(view[offset:offset + part_size])
+                 for offset in range(0, len(view), part_size))
+        return self._upload_parts(key, parts, part_size, DEFAULT_THREAD)
 
-        files_failed = []
-        if len(files_to_download) == 0:
-            self._info_logging("no files to download")
-            return
+    @staticmethod
+    def _read_part(fileobj: BinaryIO, size: int) -> bytes:
+        # streams such as sockets and pipes may return short reads
+        chunks = []
+        remaining = size
+        while remaining > 0:
+            chunk = fileobj.read(remaining)
+            if not chunk:
+                break
+            if isinstance(chunk, str):
+                chunk = chunk.encode("utf-8")
+            chunks.append(chunk)
+            remaining -= len(chunk)
+        return chunks[0] if len(chunks) == 1 else b"".join(chunks)
 
-        for f in files_to_download:
-            # handle the situation that the file on internal with the name formates "xxx/"
-            if len(f) > 0 and f[-1] == "/":
+    def upload_fileobj(self,
+                       key: str,
+                       fileobj: BinaryIO,
+                       size: Optional[int] = None,
+                       task_num: int = DEFAULT_THREAD):
+        """Uploads everything readable from a file-like object.
+
+        With a known ``size`` up to 100 MB, the object is streamed in a single
+        request. Otherwise it is read part by part and uploaded as a multipart
+        upload with at most ``task_num`` parts in flight, so memory stays
+        bounded by ``task_num`` parts even when the length is unknown.
+        """
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        if size is not None and size <= SIMPLE_UPLOAD_LIMITATION:
+            return self._client.put_object(bucket=self._bucket,
+                                           key=key,
+                                           content_length=size,
+                                           content=fileobj)
+
+        part_size = multipart_part_size(size) if size is not None else STREAM_PART_SIZE
+        first = self._read_part(fileobj, part_size)
+        if len(first) < part_size:
+            return self._client.put_object(bucket=self._bucket,
+                                           key=key,
+                                           content=first)
+
+        def read_parts():
+            data = first
+            while data:
+                yield data
+                data = self._read_part(fileobj, part_size)
+
+        return self._upload_parts(key, read_parts(), part_size, task_num)
+
+    def _upload_parts(self, key: str, parts: Iterator, part_size: int,
+                      task_num: int):
+        """Uploads the payloads of ``parts`` as one multipart upload, pulling
+        the next part only while fewer than ``task_num`` are in flight."""
+        upload_id = self._client.create_multipart_upload(
+            bucket=self._bucket, key=key).upload_id
+
+        def upload_part(part_number: int, data) -> UploadedPart:
+            resp = self._client.upload_part(bucket=self._bucket,
+                                            key=key,
+                                            upload_id=upload_id,
+                                            part_number=part_number,
+                                            content=data)
+            return UploadedPart(part_number, resp.etag)
+
+        uploaded = []
+        pending = set()
+        try:
+            with ThreadPoolExecutor(max_workers=task_num) as executor:
+                for part_number, data in enumerate(parts, start=1):
+                    if part_number > MAX_ALLOWED_PARTS:
+                        raise ValueError(
+                            f"stream for {key} exceeds {MAX_ALLOWED_PARTS} parts "
+                            f"of {part_size} bytes")
+                    if len(pending) >= task_num:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        uploaded += [future.result() for future in done]
+                    pending.add(executor.submit(upload_part, part_number, data))
+                uploaded += [future.result() for future in as_completed(pending)]
+            uploaded.sort(key=lambda part: part.part_number)
+            return self._client.complete_multipart_upload(
+                bucket=self._bucket, key=key, upload_id=upload_id, parts=uploaded)
+        except Exception:
+            try:
+                self._client.abort_multipart_upload(bucket=self._bucket,
+                                                    key=key,
+                                                    upload_id=upload_id)
+            except Exception as abort_err:
                 self._warn_logging(
-                    "can't download the file with the name formats 'xxx/'")
-                continue
+                    f"failed to abort multipart upload of {key}: {abort_err}")
+            raise
 
-            local_target_path = os.path.basename(
-                f) if flatten else os.path.normpath(f)
+    def build_download_plan(
+        self,
+        files_to_download: List[Union[str, ListedObject]],
+        local_path: str,
+        flatten: bool,
+        ignore: str = "",
+        include: str = "",
+        sizes: Optional[Dict[str, int]] = None,
+        file_filter: Optional[FileFilter] = None,
+    ) -> List[Dict[str, object]]:
+        """Resolves keys to local targets, keeping any object size already
+        known from a listing so the download needs no extra HEAD request.
+        """
+        known_sizes = dict(sizes or {})
+        known_mtimes = {}
+        keys = []
+        for f in files_to_download:
+            if isinstance(f, ListedObject):
+                known_sizes.setdefault(f.key, f.size)
+                known_mtimes[f.key] = f.last_modified
+                keys.append(f.key)
+            else:
+                keys.append(f)
 
-            if not force:
-                if os.path.isfile(local_target_path):
-                    self._debug_logging(
-                        f"skip downloading {local_target_path}")
-                    continue
+        download_plan = []
+        for key in self.files_filter(keys, include, ignore, file_filter,
+                                     sizes=known_sizes, mtimes=known_mtimes):
+            local_target_path = os.path.basename(
+                key) if flatten else os.path.normpath(key)
+            size = known_sizes.get(key)
+            download_plan.append({
+                "key": key,
+                "target": os.path.join(local_path, local_target_path),
+                "size": int(size) if size is not None else None,
+            })
+        return download_plan
 
+    def _download_with_retry(self,
+                             key: str,
+                             file_path: str,
+                             part_size: int,
+                             checkpoint_dir: str,
+                             max_retries: int,
+                             task_num: int,
+                             progress: Optional[TransferProgress] = None,
+                             part_listener: Optional[Callable] = None):
+        checkpoint_file = self._build_download_checkpoint_file(
+            file_path, key, checkpoint_dir)
+        if part_listener is None and progress is not None:
+            part_listener = progress.part_listener(key)
+        total_attempts = max_retries + 1
+        for attempt_index in range(total_attempts):
             try:
-                resp = self._client.head_object(bucket=self._bucket, key=f)
-                fsize_ = resp.content_length
-                part_size = max(
-                    int(fsize_ / MAX_ALLOWED_PARTS) + 1, MIN_PART_SIZE)
-
-                # target文件名确定
-                actual_file_path = os.path.join(local_path, local_target_path)
-                self._info_logging(
-                    f"[{f}] begins to download to [{actual_file_path}]")
-                self._client.download_file(
+                # with a checkpoint file, a retry only fetches the parts
+                # that are still missing
+                return self._client.download_file(
                     bucket=self._bucket,
-                    key=f,
-                    file_path=actual_file_path,
+                    key=key,
+                    file_path=file_path,
                     part_size=part_size,
-                    task_num=DEFAULT_THREAD,
-                    data_transfer_listener=tos_percentage)
-                self._info_logging(f"[{f}] download successfully.")
-            except tos.exceptions.TosServerError as e:
-                if e.status_code == 404:
-                    self._warn_logging(f"'{f}' not found")
-                    files_failed.append(f)
-            except Exception as err_:
-                raise err_
-                if self._is_crc_check_error(err_):
-                    self._warn_logging(
-                        f"CRC check {actual_file_path} failed, file will be removed"
-                    )
-                    os.remove(actual_file_path)
-                self._error_logging(f"download {f} failed: {err_}")
-                files_failed.append(f)
+                    task_num=task_num,
+                    enable_checkpoint=checkpoint_file is not None,
+                    checkpoint_file=checkpoint_file,
+                    data_transfer_listener=progress.data_listener(key)
+                    if progress else tos_percentage,
+                    download_event_listener=part_listener)
+            except Exception as err:
+                if attempt_index == total_attempts - 1 or \
+                        self._is_crc_check_error(err) or (
+                            isinstance(err, tos.exceptions.TosServerError)
+                            and err.status_code == 404):
+                    raise
+                if progress is not None:
+                    progress.file_retry(key, attempt_index + 1, err)
+                self._warn_logging(
+                    f"download {key} failed on attempt "
+                    f"{attempt_index + 1}/{total_attempts}: {err}. Retrying...")
+
+    def _download_planned_item(self, budget: _TransferBudget,
+                               item: Dict[str, object], force: bool,
+                               task_num: int, checkpoint_dir: str = "",
+                               max_retries: int = 0,
+                               autotuner: Optional[TransferAutotuner] = None,
+                               progress: Optional[TransferProgress] = None
+                               ) -> Dict[str, object]:
+        key = str(item["key"])
+        actual_file_path = str(item["target"])
+        result = {
+            "key": key,
+            "target": actual_file_path,
+            "size": item.get("size"),
+            "status": "succeeded",
+            "error": None,
+        }
+        if not force and os.path.isfile(actual_file_path):
+            self._debug_logging(f"skip downloading {actual_file_path}")
+            result["status"] = "skipped"
+            return result
+
+        slots = 0
+        try:
+            fsize_ = result["size"]
+            if fsize_ is None:
+                fsize_ = self._client.head_object(bucket=self._bucket,
+                                                  key=key).content_length
+                result["size"] = fsize_
+            part_size = multipart_part_size(fsize_, autotuner)
+            slots = budget.acquire(
+                min(max(math.ceil(fsize_ / part_size), 1), task_num))
+
+            self._info_logging(
+                f"[{key}] begins to download to [{actual_file_path}]")
+            if progress is not None:
+                progress.file_started(key, fsize_)
+            sampler = self._part_sampler(autotuner, budget, key, progress)
+            started = time.monotonic()
+            self._download_with_retry(key, actual_file_path, part_size,
+                                      checkpoint_dir, max_retries, slots,
+                                      progress, sampler)
+            self._record_throughput(autotuner, budget, fsize_, started,
+                                    part_size, slots, sampler)
+            self._info_logging(f"[{key}] download successfully.")
+        except tos.exceptions.TosServerError as e:
+            if e.status_code == 404:
+                self._warn_logging(f"'{key}' not found")
+                result["status"] = "not_found"
+            else:
+                self._error_logging(f"download {key} failed: {e}")
+                result["status"] = "failed"
+            result["error"] = str(e)
+        except Exception as err_:
+            if self._is_crc_check_error(err_) and os.path.isfile(
+                    actual_file_path):
+                self._warn_logging(
+                    f"CRC check {actual_file_path} failed, file will be removed"
+                )
+                os.remove(actual_file_path)
+            self._error_logging(f"download {key} failed: {err_}")
+            result["status"] = "failed"
+            result["error"] = str(err_)
+        finally:
+            if slots:
+                budget.release(slots)
+        if progress is not None:
+            progress.file_finished(key, result["status"], result["error"])
+        return result
 
+    def download_planned_objects(
+        self,
+        download_plan: List[Dict[str, object]],
+        force: bool = True,
+        task_num: int = DEFAULT_THREAD,
+        checkpoint_dir: str = "",
+        max_retries: int = 3,
+        autotuner: Optional[TransferAutotuner] = None,
+        progress: Optional[TransferProgress] = None,
+    ) -> List[Dict[str, object]]:
+        """Downloads planned objects with a bounded pool of workers.
+
+        Like uploads, ``task_num`` is one budget shared by whole-file
+        downloads and the part threads of large objects. A failed object no
+        longer aborts the batch; every item gets a result instead. With a
+        ``checkpoint_dir``, interrupted downloads resume from their
+        remaining parts, both across retries and across runs. With an
+        ``autotuner``, the budget and part size follow its settings. A
+        ``progress`` tracker receives per-file, per-part and end-of-batch
+        events.
+
+        :return: one result per plan item, in plan order, with ``key``,
+                 ``target``, ``size``, ``status`` (succeeded / skipped /
+                 not_found / failed) and ``error``
+        :rtype: List[Dict[str, object]]
+        """
+        max_retries = max(int(max_retries) if max_retries is not None else 3, 0)
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        if len(download_plan) == 0:
+            self._info_logging("no files to download")
+            return []
+
+        max_task_num = task_num
+        if autotuner is not None:
+            task_num = autotuner.task_num
+            max_task_num = autotuner.max_task_num
+        budget = _TransferBudget(task_num)
+        results = [None] * len(download_plan)
+        if progress is not None:
+            progress.batch_started(
+                "download", len(download_plan),
+                sum(item.get("size") or 0 for item in download_plan))
+        with ThreadPoolExecutor(
+                max_workers=min(max_task_num, len(download_plan))) as executor:
+            futures = {
+                executor.submit(self._download_planned_item, budget, item,
+                                force, max_task_num, checkpoint_dir,
+                                max_retries, autotuner, progress): index
+                for index, item in enumerate(download_plan)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+        self._save_autotuner(autotuner)
+        if progress is not None:
+            progress.finish()
+        return results
+
+    def download_objects(self,
+                         files_to_download: List[Union[str, ListedObject]],
+                         local_path: str,
+                         flatten: bool,
+                         ignore: str = "",
+                         include: str = "",
+                         force: bool = True,
+                         sizes: Optional[Dict[str, int]] = None,
+                         task_num: int = DEFAULT_THREAD,
+                         checkpoint_dir: str = "",
+                         max_retries: int = 3,
+                         autotuner: Optional[TransferAutotuner] = None,
+                         progress: Optional[TransferProgress] = None,
+                         file_filter: Optional[FileFilter] = None) -> List[str]:
+        download_plan = self.build_download_plan(
+            files_to_download=files_to_download,
+            local_path=local_path,
+            flatten=flatten,
+            ignore=ignore,
+            include=include,
+            sizes=sizes,
+            file_filter=file_filter,
+        )
+        results = self.download_planned_objects(download_plan,
+                                                force=force,
+                                                task_num=task_num,
+                                                checkpoint_dir=checkpoint_dir,
+                                                max_retries=max_retries,
+                                                autotuner=autotuner,
+                                                progress=progress)
+        files_failed = [
+            result["key"] for result in results
+            if result["status"] in ("not_found", "failed")
+        ]
         if len(files_failed) > 0:
             self._warn_logging(f"failed to download {files_failed}")
         return files_failed
 
-    def delete_objects(self, files_to_delete: List[str], ignore: str = "", include: str = "") \
-            -> List[DeleteError]:
-        files_to_delete = self.files_filter(files_to_delete, include, ignore)
+    def build_copy_plan(self, source: str, target: str) -> List[Dict[str, object]]:
+        """Resolves a server-side copy into ``{source, key, size}`` items.
+
+        A ``source`` ending with ``/`` is a prefix: every object below it is
+        copied to the same relative key under ``target``. Otherwise a single
+        object is copied to ``target``, or below it when ``target`` ends
+        with ``/``.
+        """
+        if not source or not target:
+            raise ParameterError("source and target")
+        if source.endswith("/"):
+            target_prefix = target if target.endswith("/") else target + "/"
+            if target_prefix.startswith(source) or source.startswith(target_prefix):
+                raise ParameterError("target",
+                                     "target prefix overlaps source prefix")
+            return [{
+                "source": obj.key,
+                "key": target_prefix + obj.key[len(source):],
+                "size": int(obj.size),
+            } for obj in self.iter_objects(source) if not obj.key.endswith("/")]
+
+        info = self._head_object_info(source)
+        if info is None:
+            raise ParameterError("source", f"'{source}' not found")
+        key = target + os.path.basename(source) if target.endswith("/") else target
+        if key == source:
+            raise ParameterError("target", "target is the same as source")
+        return [{"source": source, "key": key, "size": int(info["size"])}]
+
+    def _copy_slots_wanted(self, fsize: int, task_num: int) -> int:
+        if fsize <= COPY_OBJECT_LIMITATION:
+            return 1
+        return min(math.ceil(fsize / self._copy_part_size(fsize)), task_num)
+
+    @staticmethod
+    def _copy_part_size(fsize: int) -> int:
+        return max(COPY_PART_SIZE, multipart_part_size(fsize))
+
+    def _copy_big_object(self, source: str, key: str, fsize: int,
+                         task_num: int):
+        part_size = self._copy_part_size(fsize)
+        upload_id = self._client.create_multipart_upload(
+            bucket=self._bucket, key=key).upload_id
+
+        def copy_part(part_number: int) -> UploadedPart:
+            start = (part_number - 1) * part_size
+            end = min(start + part_size, fsize) - 1
+            resp = self._client.upload_part_copy(
+                bucket=self._bucket,
+                key=key,
+                upload_id=upload_id,
+                part_number=part_number,
+                src_bucket=self._bucket,
+                src_key=source,
+                copy_source_range_start=start,
+                copy_source_range_end=end)
+            return UploadedPart(part_number, resp.etag)
+
+        try:
+            with ThreadPoolExecutor(max_workers=max(task_num, 1)) as executor:
+                parts = list(
+                    executor.map(copy_part,
+                                 range(1, math.ceil(fsize / part_size) + 1)))
+            return self._client.complete_multipart_upload(
+                bucket=self._bucket, key=key, upload_id=upload_id,
+                parts=parts)
+        except Exception:
+            try:
+                self._client.abort_multipart_upload(bucket=self._bucket,
+                                                    key=key,
+                                                    upload_id=upload_id)
+            except Exception as abort_err:
+                self._warn_logging(
+                    f"failed to abort multipart copy of {key}: {abort_err}")
+            raise
+
+    def _copy_planned_item(self, budget: _TransferBudget,
+                           item: Dict[str, object], task_num: int) -> bool:
+        source = str(item["source"])
+        key = str(item["key"])
+        fsize = int(item["size"])
+        slots = budget.acquire(self._copy_slots_wanted(fsize, task_num))
+        try:
+            self._debug_logging(f"[{source}] begins to copy to [{key}]")
+            if fsize <= COPY_OBJECT_LIMITATION:
+                self._client.copy_object(bucket=self._bucket,
+                                         key=key,
+                                         src_bucket=self._bucket,
+                                         src_key=source)
+            else:
+                self._copy_big_object(source, key, fsize, slots)
+        except Exception as err:
+            self._error_logging(f"copy {source} to {key} failed: {err}")
+            return False
+        finally:
+            budget.release(slots)
+        return True
+
+    def copy_planned_objects(self,
+                             copy_plan: List[Dict[str, object]],
+                             task_num: int = DEFAULT_THREAD) -> List[str]:
+        """Copies planned objects inside the bucket without moving any bytes
+        through the client.
+
+        Objects up to 5 GB are copied with a single ``copy_object``; larger
+        ones are copied part by part. As with uploads, ``task_num`` is one
+        budget shared by whole-object copies and copy parts.
+
+        :return: source keys that failed to copy, in plan order
+        :rtype: List[str]
+        """
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        if len(copy_plan) == 0:
+            self._info_logging("no files to copy")
+            return []
+
+        budget = _TransferBudget(task_num)
+        failed_indexes = set()
+        with ThreadPoolExecutor(
+                max_workers=min(task_num, len(copy_plan))) as executor:
+            futures = {
+                executor.submit(self._copy_planned_item, budget, item,
+                                task_num): index
+                for index, item in enumerate(copy_plan)
+            }
+            for future in as_completed(futures):
+                if not future.result():
+                    failed_indexes.add(futures[future])
+        return [str(copy_plan[index]["source"]) for index in sorted(failed_indexes)]
+
+    def copy_objects(self,
+                     source: str,
+                     target: str,
+                     delete_source: bool = False,
+                     task_num: int = DEFAULT_THREAD) -> Dict[str, object]:
+        """Copies an object or a whole prefix, deleting the sources that
+        were copied successfully when ``delete_source`` is set.
+
+        Zero-byte directory markers (keys ending with ``/``) are not copied.
+        When every object of a source prefix was moved, its markers are
+        deleted as well, so no empty directories are left behind.
+
+        :return: report with the copied and deleted counts, copied bytes and
+                 failed items
+        :rtype: Dict[str, object]
+        """
+        copy_plan = self.build_copy_plan(source, target)
+        failed_copies = self.copy_planned_objects(copy_plan, task_num=task_num)
+        failed_copy_set = set(failed_copies)
+        copied = [item for item in copy_plan if item["source"] not in failed_copy_set]
+        report = {
+            "copied_count": len(copied),
+            "copied_bytes": sum(int(item["size"]) for item in copied),
+            "failed_copies": failed_copies,
+            "deleted_count": 0,
+            "failed_deletes": [],
+        }
+        if not delete_source:
+            return report
+        to_delete = [item["source"] for item in copied]
+        errors = (self.delete_objects(to_delete) or []) if to_delete else []
+        if source.endswith("/") and not failed_copies and not errors:
+            # objects written below the source meanwhile keep their markers
+            remaining = [obj.key for obj in self.iter_objects(source)]
+            if all(key.endswith("/") for key in remaining) and remaining:
+                # delete_objects only takes file keys, so batch the markers here
+                for i in range(0, len(remaining), ONE_BATCH_MAX_DELETE):
+                    errors += self._delete_batch(remaining[i:i + ONE_BATCH_MAX_DELETE])
+                to_delete += remaining
+        report["failed_deletes"] = [err.key for err in errors]
+        report["deleted_count"] = len(to_delete) - len(errors)
+        return report
+
+    def _delete_batch(self, keys: List[str]) -> List[DeleteError]:
+        # default quiet mode will only return error_list
+        resp = self._client.delete_multi_objects(
+            bucket=self._bucket,
+            objects=[ObjectTobeDeleted(key) for key in keys])
+        return list(resp.error or [])
+
+    def delete_objects(self, files_to_delete: List[str], ignore: str = "", include: str = "",
+                       task_num: int = DEFAULT_THREAD,
+                       file_filter: Optional[FileFilter] = None) -> List[DeleteError]:
+        files_to_delete = self.files_filter(files_to_delete, include, ignore,
+                                            file_filter)
 
         if len(files_to_delete) == 0:
             self._info_logging("no files to delete")
-            return
+            return []
 
-        cur = 0
-        cur_end = min((cur + ONE_BATCH_MAX_DELETE), len(files_to_delete))
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        batches = [
+            files_to_delete[cur:cur + ONE_BATCH_MAX_DELETE]
+            for cur in range(0, len(files_to_delete), ONE_BATCH_MAX_DELETE)
+        ]
         error_list = []
-        while cur < len(files_to_delete):
-            # default quiet mode will only return error_list
-            resp = self._client.delete_multi_objects(
-                bucket=self._bucket,
-                objects=[
-                    ObjectTobeDeleted(f) for f in files_to_delete[cur:cur_end]
-                ])
-            cur = cur_end
-            cur_end = min((cur + ONE_BATCH_MAX_DELETE), len(files_to_delete))
-            if len(resp.error) != 0:
-                error_list += resp.error_list
+        with ThreadPoolExecutor(max_workers=min(task_num, len(batches))) as executor:
+            for errors in executor.map(self._delete_batch, batches):
+                error_list += errors
         if len(error_list) > 0:
             self._info_logging(
                 f"{len(error_list)} files left undeleted: {[err.key for err in error_list]}."
             )
         return error_list
 
+    def delete_prefix(self,
+                      prefix: str,
+                      include: str = "",
+                      ignore: str = "",
+                      dry_run: bool = False,
+                      task_num: int = DEFAULT_THREAD,
+                      file_filter: Optional[FileFilter] = None) -> Dict[str, object]:
+        """Deletes every object below a prefix while it is being listed.
+
+        Listing pages are cut into 1000-key batches that are deleted by up to
+        ``task_num`` concurrent ``delete_multi_objects`` calls, so neither
+        the full key list nor the deletes are ever serialized. Directory
+        markers are deleted like any other object. ``include`` and ``ignore``
+        match object basenames as in :meth:`delete_objects`; a
+        ``file_filter`` matches keys relative to ``prefix``.
+
+        ``prefix`` is a directory: a missing trailing ``/`` is added, so
+        ``analysis/abc`` never deletes ``analysis/abcd/...`` or
+        ``analysis/abc.txt``.
+
+        :return: report with the matched, deleted and failed counts and bytes
+        :rtype: Dict[str, object]
+        """
+        prefix = (prefix or "").lstrip("/")
+        if not prefix:
+            raise ParameterError("prefix", "refusing to delete the whole bucket")
+        if not prefix.endswith("/"):
+            prefix += "/"
+        file_filter = FileFilter.build(file_filter, include, ignore)
+        task_num = max(int(task_num) if task_num is not None else DEFAULT_THREAD, 1)
+        report = {
+            "prefix": prefix,
+            "dry_run": dry_run,
+            "matched_count": 0,
+            "matched_bytes": 0,
+            "deleted_count": 0,
+            "deleted_bytes": 0,
+            "failed_deletes": [],
+        }
+
+        def collect(future):
+            batch, errors = future.result()
+            failed = {err.key for err in errors}
+            report["deleted_count"] += len(batch) - len(failed)
+            report["deleted_bytes"] += sum(size for key, size in batch
+                                           if key not in failed)
+            report["failed_deletes"] += sorted(failed)
+            self._info_logging(
+                f"deleted {report['deleted_count']} objects "
+                f"({report['deleted_bytes']} bytes) under {prefix}")
+
+        def delete_batch(batch):
+            return batch, self._delete_batch([key for key, _ in batch])
+
+        batch = []
+        pending = set()
+        with ThreadPoolExecutor(max_workers=task_num) as executor:
+            for obj in self.iter_objects(prefix):
+                if not file_filter.matches_object(obj, prefix):
+                    continue
+                report["matched_count"] += 1
+                report["matched_bytes"] += int(obj.size)
+                if dry_run:
+                    continue
+                batch.append((obj.key, int(obj.size)))
+                if len(batch) < ONE_BATCH_MAX_DELETE:
+                    continue
+                # keep at most task_num batches in flight while listing
+                if len(pending) >= task_num:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future)
+                pending.add(executor.submit(delete_batch, batch))
+                batch = []
+            if batch:
+                pending.add(executor.submit(delete_batch, batch))
+            for future in as_completed(pending):
+                collect(future)
+        if report["failed_deletes"]:
+            self._warn_logging(
+                f"{len(report['failed_deletes'])} files left undeleted under {prefix}")
+        return report
+
     def files_filter(self,
                      files: List[str],
                      include: str = "",
-                     ignore: str = "") -> List[str]:
+                     ignore: str = "",
+                     file_filter: Optional[FileFilter] = None,
+                     sizes: Optional[Dict[str, int]] = None,
+                     mtimes: Optional[Dict[str, object]] = None) -> List[str]:
+        """Keeps the keys passing the filter; explicit keys are matched as
+        full paths, with sizes and mtimes looked up where known.
+        """
+        file_filter = FileFilter.build(file_filter, include, ignore)
+        sizes = sizes or {}
+        mtimes = mtimes or {}
         file_lst = []
         for f in files:
             if f.endswith("/"):
                 raise ParameterError("tos files path")
-            if not self._passes_file_filter(f, include, ignore):
+            if not file_filter.matches(f, sizes.get(f), mtimes.get(f)):
                 continue
 
             file_lst.append(f)
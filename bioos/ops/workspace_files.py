@@ -1,10 +1,13 @@
 import os
 from typing import Iterable, List, Optional, Union
 
+from bioos.internal.progress import TransferProgress
 from bioos.ops.auth import login_to_bioos, resolve_workspace
 
 DEFAULT_UPLOAD_CHECKPOINT_DIR = os.path.join(
     os.path.expanduser("~"), ".bioos", "upload-checkpoints")
+DEFAULT_DOWNLOAD_CHECKPOINT_DIR = os.path.join(
+    os.path.expanduser("~"), ".bioos", "download-checkpoints")
 
 
 def _normalize_local_sources(sources: Union[str, Iterable[str]]) -> List[str]:
@@ -36,6 +39,8 @@ def _upload_local_files_with_workspace(
     checkpoint_dir: Optional[str] = None,
     max_retries: int = 3,
     task_num: int = 10,
+    autotune: bool = False,
+    progress: Optional[TransferProgress] = None,
 ):
     normalized_sources = _normalize_local_sources(sources)
     max_retries = max(int(max_retries) if max_retries is not None else 3, 0)
@@ -69,10 +74,19 @@ def _upload_local_files_with_workspace(
             "s3_url": ws.files.s3_urls([key])[0],
         })
 
+    existing = {}
+    if skip_existing and upload_plan:
+        existing = ws.files.tos_handler.objects_exist(
+            [item["key"] for item in upload_plan], task_num=task_num)
+
     pending_uploads = []
     skipped_uploads = []
     for item in upload_plan:
-        if skip_existing and ws.files.tos_handler.object_exists(item["key"]):
+        remote = existing.get(item["key"])
+        # an existing object is kept unless the manifest already knows the
+        # local file has different content; the file itself is never read here
+        if remote is not None and not ws.files.tos_handler.local_file_changed(
+                item["source"], remote):
             skipped_uploads.append(item)
             continue
         pending_uploads.append(item)
@@ -84,6 +98,8 @@ def _upload_local_files_with_workspace(
             checkpoint_dir=resolved_checkpoint_dir,
             max_retries=max_retries,
             task_num=task_num,
+            autotuner=ws.files.transfer_autotuner() if autotune else None,
+            progress=progress,
         )
 
     failed_source_set = set(failed_sources)
@@ -104,6 +120,7 @@ def _upload_local_files_with_workspace(
         "checkpoint_dir": resolved_checkpoint_dir,
         "max_retries": max_retries,
         "task_num": task_num,
+        "autotune": autotune,
         "uploaded_count": len(uploaded_files),
         "skipped_count": len(skipped_uploads),
         "uploaded_files": uploaded_files,
@@ -120,10 +137,20 @@ def upload_local_files_to_workspace(
     checkpoint_dir: Optional[str] = None,
     max_retries: int = 3,
     task_num: int = 10,
+    autotune: bool = False,
+    progress: Optional[TransferProgress] = None,
     access_key: Optional[str] = None,
     secret_key: Optional[str] = None,
     endpoint: Optional[str] = None,
 ):
+    """Uploads local files or directories to a workspace bucket.
+
+    With ``skip_existing``, target keys are first looked up in one batched
+    remote listing. A file whose key exists is skipped unless the local
+    upload manifest has an entry for the unchanged file whose CRC64 differs
+    from the remote object's; the local file is never read to decide, so
+    without a manifest entry an existing key is always kept.
+    """
     from bioos import bioos
 
     login_to_bioos(access_key=access_key, secret_key=secret_key, endpoint=endpoint)
@@ -140,6 +167,8 @@ def upload_local_files_to_workspace(
         checkpoint_dir=checkpoint_dir,
         max_retries=max_retries,
         task_num=task_num,
+        autotune=autotune,
+        progress=progress,
     )
 
 
@@ -28,6 +28,7 @@ class WorkspaceProfileOptions:
     include_failure_details: bool = True
     include_ies: bool = True
     include_signed_urls: bool = False
+    parallel_listing: bool = False
     endpoint: str = DEFAULT_ENDPOINT
     access_key: Optional[str] = None
     secret_key: Optional[str] = None
@@ -451,7 +452,13 @@ def summarize_artifacts(
     prefix = strip_execution_prefix(submission.get("final_execution_dir"), bucket)
     if not prefix:
         return None
-    records = dataframe_records(ws.files.list(prefix=prefix, recursive=True))
+    records = dataframe_records(
+        ws.files.list(
+            prefix=prefix,
+            recursive=True,
+            include_https_urls=options.include_signed_urls,
+            parallel=options.parallel_listing,
+        ))
     if not records:
         return None
     total_size = 0
@@ -1,4 +1,6 @@
-from typing import Dict, Iterable, Union
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Union
 
 import pandas as pd
 from cachetools import TTLCache, cached
@@ -9,6 +11,70 @@ from bioos.errors import ConflictError, NotFoundError
 from bioos.utils.common_tools import SingletonType
 
 
+class DataModelCatalog(metaclass=SingletonType):
+    """Caches the data models of a workspace with ID->name and name->ID
+    indexes.
+
+    The model list is downloaded lazily when first needed and again once it
+    is older than ``ttl`` seconds, or after :meth:`invalidate`, which
+    ``DataModelResource.write`` and ``delete`` call.
+
+    *Example*:
+    ::
+
+        catalog = DataModelCatalog(ws_id)
+        catalog.ttl = 300
+        catalog.id_of("sample")
+    """
+    DEFAULT_TTL = 60
+
+    def __init__(self, workspace_id: str):
+        self.workspace_id = workspace_id
+        self.ttl = self.DEFAULT_TTL
+        self._lock = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._items: List[dict] = []
+        self._names: Dict[str, str] = {}
+        self._ids: Dict[str, str] = {}
+
+    def invalidate(self):
+        """Drops the cached model list so the next lookup downloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def _refresh_if_stale(self):
+        with self._lock:
+            if self._loaded_at is not None and \
+                    time.monotonic() - self._loaded_at < self.ttl:
+                return
+            items = Config.service().list_data_models({
+                'WorkspaceID': self.workspace_id,
+            }).get("Items") or []
+            self._items = items
+            self._names = {item["ID"]: item.get("Name") for item in items}
+            # name lookups only resolve 'normal' models, like DataModelResource
+            self._ids = {
+                item.get("Name"): item["ID"]
+                for item in items if item.get("Type") == "normal"
+            }
+            self._loaded_at = time.monotonic()
+
+    def items(self) -> List[dict]:
+        """Returns the ``ListDataModels`` items of every model type."""
+        self._refresh_if_stale()
+        return list(self._items)
+
+    def name_of(self, id_: str) -> Optional[str]:
+        """Returns the name of a data model of any type, or None."""
+        self._refresh_if_stale()
+        return self._names.get(id_)
+
+    def id_of(self, name: str) -> Optional[str]:
+        """Returns the ID of a 'normal' data model, or None."""
+        self._refresh_if_stale()
+        return self._ids.get(name)
+
+
 class DataModelResource(metaclass=SingletonType):
 
     def __init__(self, workspace_id: str):
@@ -62,13 +128,16 @@ class DataModelResource(metaclass=SingletonType):
                     "sources", f"{duplicate_models_set} already exists, "
                     f"pls use force=True to overwrite")
 
-        for name, data in sources.items():
-            Config.service().create_data_model({
-                'WorkspaceID': self.workspace_id,
-                'Name': name,
-                'Headers': list(data.head()),
-                'Rows': data.values.tolist(),
-            })
+        try:
+            for name, data in sources.items():
+                Config.service().create_data_model({
+                    'WorkspaceID': self.workspace_id,
+                    'Name': name,
+                    'Headers': list(data.head()),
+                    'Rows': data.values.tolist(),
+                })
+        finally:
+            DataModelCatalog(self.workspace_id).invalidate()
 
     def read(
         self,
@@ -155,3 +224,4 @@ class DataModelResource(metaclass=SingletonType):
             'RowIDs':
             ids["RowIDs"]
         })
+        DataModelCatalog(self.workspace_id).invalidate()
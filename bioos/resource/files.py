@@ -1,17 +1,23 @@
-import datetime
+import io
+import itertools
 from urllib.parse import urlparse
-from typing import Iterable, List, Union
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import pandas as pd
 import tos
 from cachetools import TTLCache, cached
 from pandas import DataFrame
-from tos.credential import FederationCredentials, FederationToken
-from tos.models2 import ListedObject
 
 from bioos.config import Config
 from bioos.errors import ParameterError
-from bioos.internal.tos import TOSHandler
+from bioos.internal.autotune import TransferAutotuner
+from bioos.internal.credentials import TosCredentialManager
+from bioos.internal.filters import FileFilter
+from bioos.internal.manifest import get_manifest_path
+from bioos.internal.progress import TransferProgress
+from bioos.internal.remote_file import (DEFAULT_BLOCK_SIZE, DEFAULT_CACHE_BLOCKS,
+                                        DEFAULT_READ_AHEAD)
+from bioos.internal.tos import DEFAULT_THREAD, TOSHandler
 from bioos.models.models import DisplayListedObject
 from bioos.utils.common_tools import SingletonType, dict_str, s3_endpoint_mapping
 
@@ -19,6 +25,16 @@ from bioos.utils.common_tools import SingletonType, dict_str, s3_endpoint_mappin
 class FileResource(metaclass=SingletonType):
     TOS_RETRY_TIMES = 5
     DEFAULT_PRE_SIGNED_TIME = 15 * 60
+    # cached URLs are dropped this long before they expire
+    PRE_SIGNED_URL_CACHE_MARGIN = 60
+    PRE_SIGNED_URL_CACHE_SIZE = 100000
+    TABLE_COMPRESSIONS = {
+        ".gz": "gzip",
+        ".bz2": "bz2",
+        ".xz": "xz",
+        ".zst": "zstd",
+        ".zip": "zip",
+    }
 
     def __init__(self, workspace_id=str, bucket=str):
         self.workspace_id = workspace_id
@@ -40,11 +56,14 @@ class FileResource(metaclass=SingletonType):
                 sk=None,
                 region=None,
                 endpoint=self.endpoint,
-                auth=tos.FederationAuth(  # 这里是使用构建的FeterationTokon为进行auth
-                    FederationCredentials(
-                        self._refresh_federation_credentials), self.region),
+                # the STS token of this response is reused and renewed in
+                # the background, shared by every client of the workspace
+                auth=tos.FederationAuth(
+                    TosCredentialManager.for_workspace(self.workspace_id, res),
+                    self.region),
                 max_retry_count=self.TOS_RETRY_TIMES),
-            self.bucket)
+            self.bucket,
+            manifest_path=get_manifest_path())
 
     def __repr__(self) -> str:
         info_dict = dict_str({
@@ -56,53 +75,48 @@ class FileResource(metaclass=SingletonType):
         })
         return f"BucketInfo:\n{info_dict}"
 
-    def _refresh_federation_credentials(self) -> FederationToken:
-        res = Config.service().get_tos_access({
-            'WorkspaceID': self.workspace_id,
-        })
-
-        tos_ak = res["AccessKey"]
-        tos_sk = res["SecretKey"]
-        sts_token = res["SessionToken"]
-
-        return FederationToken(
-            tos_ak, tos_sk, sts_token,
-            (datetime.datetime.fromisoformat(res["ExpiredTime"]) -
-             datetime.timedelta(minutes=5)).timestamp())
-
     @property
-    @cached(cache=TTLCache(maxsize=10, ttl=1))
     def size(self) -> int:
         """Returns the size of all files.
 
         :return: size of all files calculated with bytes
         :rtype: int
         """
-        size = 0
-        for o in self._list_with_cache():
-            size += o.size
-        return size
+        return self._stats_with_cache()[1]
 
     @property
-    @cached(cache=TTLCache(maxsize=10, ttl=1))
     def counts(self) -> int:
         """Returns the number of all files .
 
         :return: number of all files
         :rtype: int
         """
-        return len(self._list_with_cache())
+        return self._stats_with_cache()[0]
 
     @cached(cache=TTLCache(maxsize=10, ttl=1))
-    def _list_with_cache(self) -> List[ListedObject]:  # 需要一个list指定路径的方法
-        return self.tos_handler.list_objects("", 0)
+    def _stats_with_cache(self) -> Tuple[int, int]:
+        counts = 0
+        size = 0
+        for o in self.tos_handler.iter_objects(""):
+            counts += 1
+            size += o.size
+        return counts, size
+
+    def transfer_autotuner(self) -> TransferAutotuner:
+        return TransferAutotuner.for_endpoint(self.endpoint)
 
     def _build_s3_url(self, file_path) -> str:  #内部使用的相对路径，构建完整的s3
         return f"s3://{self.bucket}/{file_path}"
 
-    def _build_https_url(self, file_path) -> str:  #生成有权限的http
-        return self.tos_handler.presign_download_url(
-            file_path, self.DEFAULT_PRE_SIGNED_TIME)
+    def _https_url_cache(self) -> TTLCache:
+        cache = getattr(self, "_https_url_cache_store", None)
+        if cache is None:
+            cache = TTLCache(
+                maxsize=self.PRE_SIGNED_URL_CACHE_SIZE,
+                ttl=self.DEFAULT_PRE_SIGNED_TIME -
+                self.PRE_SIGNED_URL_CACHE_MARGIN)
+            self._https_url_cache_store = cache
+        return cache
 
     def s3_urls(self, sources: Union[str, Iterable[str]]) -> List[str]:
         """Returns the S3 URLs for all the specified files .
@@ -143,10 +157,27 @@ class FileResource(metaclass=SingletonType):
             sources = [sources]
 
         if isinstance(sources, Iterable):
-            return [self._build_https_url(elem) for elem in sources]
+            sources = list(sources)
+            cache = self._https_url_cache()
+            urls = {key: cache.get(key) for key in sources}
+            # only keys without a live URL are signed, all in one batch
+            missing = [key for key, url in urls.items() if url is None]
+            if missing:
+                for key, url in zip(
+                        missing,
+                        self.tos_handler.presign_download_urls(
+                            missing, self.DEFAULT_PRE_SIGNED_TIME)):
+                    urls[key] = cache[key] = url
+            return [urls[key] for key in sources]
         raise ParameterError("sources")
 
-    def list(self, prefix: str = '', recursive: bool = False) -> DataFrame:
+    def list(self,
+             prefix: str = '',
+             recursive: bool = False,
+             limit: int = 0,
+             include_https_urls: Optional[bool] = None,
+             parallel: bool = False,
+             file_filter: Optional[FileFilter] = None) -> DataFrame:
         """Lists files under the specified prefix, like ``ls``.
 
         Use ``prefix`` to navigate directories (like ``cd``), and ``recursive``
@@ -166,11 +197,29 @@ class FileResource(metaclass=SingletonType):
             # list every file under a deep path
             ws.files.list(prefix="analysis/.../execution/", recursive=True)
 
+            # only the BAMs of the call-* tasks, larger than 1GB
+            ws.files.list(prefix="analysis/", recursive=True,
+                          file_filter=FileFilter(include_globs="**/call-*/**/*.bam",
+                                                 match_path=True, min_size=1 << 30))
+
         :param prefix: Directory path to list. Trailing slash is optional.
         :type prefix: str
         :param recursive: If True, list all files under the prefix recursively.
                          If False (default), list only immediate children like ``ls``.
         :type recursive: bool
+        :param limit: Stop after this many rows; 0 (default) lists everything.
+                      The listing is streamed, so small limits return quickly.
+        :type limit: int
+        :param include_https_urls: Whether to fill the ``https_url`` column with
+                                   pre-signed URLs. Defaults to True for ``ls``-style
+                                   listings and False for recursive ones.
+        :type include_https_urls: Optional[bool]
+        :param parallel: List the sub-directories of a recursive listing concurrently.
+                         Worth it for prefixes holding millions of objects.
+        :type parallel: bool
+        :param file_filter: Only list files passing this filter, matched relative to
+                            prefix. Directories are always listed.
+        :type file_filter: Optional[FileFilter]
         :return: DataFrame with columns: key, last_modified, size, owner, s3_url, https_url.
         :rtype: DataFrame
         """
@@ -178,37 +227,63 @@ class FileResource(metaclass=SingletonType):
             prefix = prefix.lstrip('/')
 
         prefix_dir = prefix if not prefix or prefix.endswith('/') else prefix + '/'
-        all_files = self.tos_handler.list_objects(prefix_dir, 0)
+        if include_https_urls is None:
+            include_https_urls = not recursive
 
         if recursive:
-            return pd.DataFrame.from_records([
-                DisplayListedObject(f, self._build_s3_url(f.key),
-                                    self._build_https_url(f.key)).__dict__
-                for f in all_files
-            ])
-
-        rows = []
-        seen = set()
-        for f in all_files:
-            relative = f.key[len(prefix_dir):]
-            if not relative:
-                continue
-            first = relative.split('/')[0]
-            if first in seen:
-                continue
-            seen.add(first)
-            if '/' in relative:
-                dir_key = prefix_dir + first + '/'
-                rows.append({'key': dir_key, 'last_modified': None, 'size': None,
-                             'owner': None, 's3_url': self._build_s3_url(dir_key),
-                             'https_url': None})
-            else:
-                rows.append(DisplayListedObject(
-                    f, self._build_s3_url(f.key), self._build_https_url(f.key)
-                ).__dict__)
+            all_files = self.tos_handler.iter_objects_parallel(
+                prefix_dir) if parallel else self.tos_handler.iter_objects(
+                    prefix_dir)
+            if file_filter is not None:
+                all_files = file_filter.filter_objects(all_files, prefix_dir)
+            rows = [
+                DisplayListedObject(f, self._build_s3_url(f.key), None).__dict__
+                for f in itertools.islice(all_files, limit or None)
+            ]
+        else:
+            rows = []
+            for child in self.tos_handler.iter_children(prefix_dir):
+                if isinstance(child, str):
+                    rows.append({'key': child, 'last_modified': None, 'size': None,
+                                 'owner': None, 's3_url': self._build_s3_url(child),
+                                 'https_url': None})
+                elif child.key != prefix_dir and (
+                        file_filter is None
+                        or file_filter.matches_object(child, prefix_dir)):
+                    rows.append(DisplayListedObject(
+                        child, self._build_s3_url(child.key), None).__dict__)
+                if limit and len(rows) >= limit:
+                    break
+
+        if include_https_urls:
+            # sign every file row in one pass; directories keep no URL
+            file_rows = [row for row in rows if not row['key'].endswith('/')]
+            for row, url in zip(file_rows,
+                                self.https_urls([row['key'] for row in file_rows])):
+                row['https_url'] = url
 
         return pd.DataFrame.from_records(rows)
 
+    def walk(self, prefix: str = ''):
+        """Walks the files under a prefix level by level, like ``os.walk``.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            for prefix, dirs, files in ws.files.walk("analysis/"):
+                dirs[:] = [d for d in dirs if not d.endswith("cache/")]
+                print(prefix, [f.key for f in files])
+
+        :param prefix: Directory path to start from. Trailing slash is optional.
+        :type prefix: str
+        :return: Generator of ``(prefix, dir_prefixes, files)``; pruning
+                 ``dir_prefixes`` in place skips those sub-directories
+        """
+        prefix = prefix.lstrip('/')
+        prefix_dir = prefix if not prefix or prefix.endswith('/') else prefix + '/'
+        return self.tos_handler.walk(prefix_dir)
+
     def _normalize_download_source(self, source: str) -> str:
         if not isinstance(source, str):
             raise ParameterError("sources")
@@ -227,8 +302,175 @@ class FileResource(metaclass=SingletonType):
             )
         return key
 
-    def download(self, sources: Union[str, Iterable[str]], target: str,
-                 flatten: bool) -> bool:
+    def exists_many(
+            self, keys: Union[str, Iterable[str]]
+    ) -> Dict[str, Optional[Dict[str, object]]]:
+        """Checks whether a batch of files exists in the internal tos bucket.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.exists_many(['foo/bar.txt', 'foo/baz.txt'])
+
+        :param keys: File keys or s3 urls of the workspace bucket
+        :type keys: Union[str, Iterable[str]]
+        :return: Maps each key to its ``size``, ``last_modified`` and
+                 ``hash_crc64_ecma``, or None when it does not exist
+        :rtype: Dict[str, Optional[Dict[str, object]]]
+        """
+        if isinstance(keys, str):
+            keys = [keys]
+        return self.tos_handler.objects_exist(
+            [self._normalize_download_source(key) for key in keys])
+
+    def open(self,
+             key: str,
+             mode: str = "rb",
+             block_size: int = DEFAULT_BLOCK_SIZE,
+             read_ahead: int = DEFAULT_READ_AHEAD,
+             cache_blocks: int = DEFAULT_CACHE_BLOCKS,
+             encoding: str = "utf-8"):
+        """Opens a file of internal tos bucket bound to workspace for reading
+        without downloading it.
+
+        The returned object is seekable and reads the file with ranged
+        requests, so readers that only need part of a large file (headers,
+        indexes, the first records) only fetch what they touch.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            with ws.files.open("analysis/calls.vcf.gz") as f:
+                header = gzip.GzipFile(fileobj=f).readline()
+            df = pd.read_csv(ws.files.open("samples.tsv"), sep="\t")
+
+        :param key: The name of the file, or its ``s3://`` URL
+        :type key: str
+        :param mode: ``rb`` for a binary stream, ``r`` for text
+        :type mode: str
+        :param block_size: Bytes fetched per ranged request
+        :type block_size: int
+        :param read_ahead: Blocks prefetched in the background while reading sequentially
+        :type read_ahead: int
+        :param cache_blocks: Blocks kept in the LRU cache
+        :type cache_blocks: int
+        :param encoding: Text encoding used in ``r`` mode
+        :type encoding: str
+        :return: A seekable ``io.RawIOBase`` in ``rb`` mode, a text stream in ``r`` mode
+        """
+        if mode not in ("rb", "r", "rt"):
+            raise ParameterError("mode", "only 'rb' and 'r' are supported")
+        raw = self.tos_handler.open_object(
+            self._normalize_download_source(key),
+            block_size=block_size,
+            read_ahead=read_ahead,
+            cache_blocks=cache_blocks)
+        if mode == "rb":
+            return raw
+        return io.TextIOWrapper(io.BufferedReader(raw, block_size),
+                                encoding=encoding)
+
+    def head(self, key: str, n_bytes: int = 64 * 1024) -> bytes:
+        """Returns the first bytes of a file of internal tos bucket bound to
+        workspace with a single ranged request.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            print(ws.files.head("samples.tsv", 1024).decode())
+
+        :param key: The name of the file, or its ``s3://`` URL
+        :type key: str
+        :param n_bytes: Number of bytes to read
+        :type n_bytes: int
+        :return: Up to ``n_bytes`` bytes from the start of the file
+        :rtype: bytes
+        """
+        return self.tos_handler.read_object_range(
+            self._normalize_download_source(key), 0, n_bytes)
+
+    def read_table(self,
+                   key: str,
+                   chunksize: Optional[int] = None,
+                   columns: Optional[List[str]] = None,
+                   compression: Optional[str] = "infer",
+                   sep: Optional[str] = None,
+                   block_size: int = DEFAULT_BLOCK_SIZE,
+                   read_ahead: int = 4,
+                   **kwargs) -> Union[DataFrame, Iterator[DataFrame]]:
+        """Reads a csv or tsv file of internal tos bucket bound to workspace
+        while it is streamed, without downloading it first.
+
+        The file is fetched in blocks that are prefetched in the background
+        and decompressed on the fly, so parsing overlaps with the transfer.
+        With ``chunksize``, DataFrames of that many rows are yielded one at a
+        time and peak memory stays bounded by a chunk.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            for chunk in ws.files.read_table("results/counts.tsv.gz", chunksize=100000,
+                                             columns=["gene", "count"]):
+                totals = chunk.groupby("gene")["count"].sum()
+
+        :param key: The name of the file, or its ``s3://`` URL
+        :type key: str
+        :param chunksize: Rows per yielded DataFrame; None reads the whole table
+        :type chunksize: Optional[int]
+        :param columns: Only parse these columns
+        :type columns: Optional[List[str]]
+        :param compression: ``infer`` picks it from the file suffix, None reads plain text
+        :type compression: Optional[str]
+        :param sep: Field separator; by default tab for .tsv/.tab/.txt files, comma otherwise
+        :type sep: Optional[str]
+        :param block_size: Bytes fetched per ranged request
+        :type block_size: int
+        :param read_ahead: Blocks prefetched in the background
+        :type read_ahead: int
+        :return: The table, or an iterator of DataFrame chunks with ``chunksize``
+        :rtype: Union[DataFrame, Iterator[DataFrame]]
+        """
+        key = self._normalize_download_source(key)
+        name = key.lower()
+        suffix = next((suffix for suffix in self.TABLE_COMPRESSIONS
+                       if name.endswith(suffix)), "")
+        if compression == "infer":
+            compression = self.TABLE_COMPRESSIONS.get(suffix)
+        if sep is None:
+            sep = "\t" if name[:len(name) - len(suffix)].endswith(
+                (".tsv", ".tab", ".txt")) else ","
+
+        stream = io.BufferedReader(
+            self.tos_handler.open_object(key,
+                                         block_size=block_size,
+                                         read_ahead=read_ahead), block_size)
+        options = dict(sep=sep, usecols=columns, compression=compression, **kwargs)
+        if chunksize is None:
+            with stream:
+                return pd.read_csv(stream, **options)
+        return self._iter_table_chunks(stream, chunksize, options)
+
+    @staticmethod
+    def _iter_table_chunks(stream: io.BufferedReader, chunksize: int,
+                           options: dict) -> Iterator[DataFrame]:
+        with stream, pd.read_csv(stream, chunksize=chunksize, **options) as reader:
+            yield from reader
+
+    def download(self,
+                 sources: Union[str, Iterable[str]],
+                 target: str,
+                 flatten: bool,
+                 sizes: Optional[Dict[str, int]] = None,
+                 task_num: int = None,
+                 checkpoint_dir: str = "",
+                 max_retries: int = 3,
+                 autotune: bool = False,
+                 progress: Optional[TransferProgress] = None,
+                 file_filter: Optional[FileFilter] = None) -> bool:
         """Downloads all the specified file from internal tos bucket bound to workspace to
         local path.
 
@@ -244,6 +486,21 @@ class FileResource(metaclass=SingletonType):
         :type target: str
         :param flatten: Whether to flatten the files locally
         :type flatten: bool
+        :param sizes: Object sizes already known from a listing, keyed by object key
+        :type sizes: Optional[Dict[str, int]]
+        :param task_num: Total parallel transfers shared by files and download parts
+        :type task_num: int
+        :param checkpoint_dir: Directory for resumable download checkpoints
+        :type checkpoint_dir: str
+        :param max_retries: Number of retries per file after the initial attempt
+        :type max_retries: int
+        :param autotune: Tune concurrency and part size from measured throughput
+                         instead of using task_num, remembering the result per endpoint
+        :type autotune: bool
+        :param progress: Receives per-file and end-of-batch transfer events
+        :type progress: Optional[TransferProgress]
+        :param file_filter: Only download the keys passing this filter
+        :type file_filter: Optional[FileFilter]
         :return: Downloading result
         :rtype: bool
         """
@@ -256,9 +513,24 @@ class FileResource(metaclass=SingletonType):
             for source in sources
         ]
 
+        if sizes:
+            sizes = {
+                self._normalize_download_source(key): size
+                for key, size in sizes.items()
+            }
+
         return len(
-            self.tos_handler.download_objects(  # 增加异常控制
-                normalized_sources, target, flatten)) == 0
+            self.tos_handler.download_objects(
+                normalized_sources,
+                target,
+                flatten,
+                sizes=sizes,
+                task_num=task_num if task_num is not None else DEFAULT_THREAD,
+                checkpoint_dir=checkpoint_dir,
+                max_retries=max_retries,
+                autotuner=self.transfer_autotuner() if autotune else None,
+                progress=progress,
+                file_filter=file_filter)) == 0
 
     def upload(
             self,
@@ -267,9 +539,16 @@ class FileResource(metaclass=SingletonType):
             flatten: bool,
             checkpoint_dir: str = "",
             max_retries: int = 3,
-            task_num: int = None) -> bool:
+            task_num: int = None,
+            autotune: bool = False,
+            progress: Optional[TransferProgress] = None,
+            file_filter: Optional[FileFilter] = None) -> bool:
         """Uploads a local file or a batch of local files to internal tos bucket bound to workspace.
 
+        Every uploaded file is recorded with its CRC64 in the local upload
+        manifest, ``~/.bioos/upload-manifest.sqlite3`` or the path in
+        ``BIOOS_UPLOAD_MANIFEST_PATH``, which is created on the first upload.
+
         *Example*:
         ::
 
@@ -282,6 +561,14 @@ class FileResource(metaclass=SingletonType):
         :type target: str
         :param flatten: Whether to flatten the files at internal
         :type flatten: bool
+        :param autotune: Tune concurrency and part size from measured throughput
+                         instead of using task_num, remembering the result per endpoint
+        :type autotune: bool
+        :param progress: Receives per-file and end-of-batch transfer events
+        :type progress: Optional[TransferProgress]
+        :param file_filter: Only upload the files passing this filter, matched
+                            relative to each source directory
+        :type file_filter: Optional[FileFilter]
         :return: Uploading result
         :rtype: bool
         """
@@ -292,6 +579,7 @@ class FileResource(metaclass=SingletonType):
             files_to_upload=sources,
             target_path=target,
             flatten=flatten,
+            file_filter=file_filter,
         )
         if any(item["from_directory"] for item in upload_plan):
             conflicts = self.tos_handler.upload_key_conflicts(upload_plan)
@@ -307,8 +595,251 @@ class FileResource(metaclass=SingletonType):
                 checkpoint_dir=checkpoint_dir,
                 max_retries=max_retries,
                 task_num=task_num if task_num is not None else 10,
+                autotuner=self.transfer_autotuner() if autotune else None,
+                progress=progress,
             )) == 0
 
+    def put_bytes(self, key: str, data: Union[bytes, memoryview, str]) -> str:
+        """Writes in-memory data to a file of internal tos bucket bound to
+        workspace without creating a local file.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.put_bytes("inputs/samples.txt", "s1\ns2\n")
+
+        :param key: The target internal path of the file
+        :type key: str
+        :param data: File content; text is encoded as UTF-8
+        :type data: Union[bytes, memoryview, str]
+        :return: S3 URL of the written file
+        :rtype: str
+        """
+        key = self._normalize_download_source(key)
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self.tos_handler.put_bytes(key, data)
+        return self._build_s3_url(key)
+
+    def upload_fileobj(self,
+                       key: str,
+                       fileobj: BinaryIO,
+                       size: Optional[int] = None,
+                       task_num: int = None) -> str:
+        """Uploads the content of a readable file-like object to internal tos
+        bucket bound to workspace. Objects of unknown size are streamed as a
+        multipart upload.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            with gzip.open("reads.fq.gz", "rb") as f:
+                ws.files.upload_fileobj("inputs/reads.fq", f)
+
+        :param key: The target internal path of the file
+        :type key: str
+        :param fileobj: Binary file-like object positioned at the data to upload
+        :type fileobj: BinaryIO
+        :param size: Number of bytes to upload, if known
+        :type size: Optional[int]
+        :param task_num: Number of parts uploaded in parallel
+        :type task_num: int
+        :return: S3 URL of the written file
+        :rtype: str
+        """
+        key = self._normalize_download_source(key)
+        self.tos_handler.upload_fileobj(
+            key,
+            fileobj,
+            size=size,
+            task_num=task_num if task_num is not None else DEFAULT_THREAD)
+        return self._build_s3_url(key)
+
+    def write_table(self,
+                    key: str,
+                    df: DataFrame,
+                    format: str = "csv",
+                    index: bool = False,
+                    **kwargs) -> str:
+        """Writes a DataFrame to a file of internal tos bucket bound to
+        workspace, serializing it in memory. Keys ending with ``.gz`` are
+        gzip compressed for csv and tsv.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.write_table("results/summary.tsv", df, format="tsv")
+
+        :param key: The target internal path of the file
+        :type key: str
+        :param df: Table to write
+        :type df: DataFrame
+        :param format: One of ``csv``, ``tsv`` and ``parquet``
+        :type format: str
+        :param index: Whether to write the DataFrame index
+        :type index: bool
+        :return: S3 URL of the written file
+        :rtype: str
+        """
+        buffer = io.BytesIO()
+        if format in ("csv", "tsv"):
+            kwargs.setdefault("sep", "," if format == "csv" else "\t")
+            df.to_csv(buffer,
+                      index=index,
+                      compression="gzip" if key.endswith(".gz") else None,
+                      **kwargs)
+        elif format == "parquet":
+            df.to_parquet(buffer, index=index, **kwargs)
+        else:
+            raise ParameterError("format", "must be one of csv, tsv, parquet")
+        # the serialized table is uploaded straight from the buffer's memory
+        return self.put_bytes(key, buffer.getbuffer())
+
+    def sync(self,
+             local_dir: str,
+             prefix: str,
+             delete: bool = False,
+             dry_run: bool = False,
+             checkpoint_dir: str = "",
+             max_retries: int = 3,
+             task_num: int = None,
+             progress: Optional[TransferProgress] = None,
+             file_filter: Optional[FileFilter] = None) -> dict:
+        """Synchronizes a local directory to a prefix of internal tos bucket
+        bound to workspace, uploading only new or changed files.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.sync(local_dir="ref/", prefix="reference/", dry_run=True)
+
+        :param local_dir: Local directory whose contents are synchronized
+        :type local_dir: str
+        :param prefix: Target internal prefix
+        :type prefix: str
+        :param delete: Whether to delete objects under prefix missing locally
+        :type delete: bool
+        :param dry_run: Only report what would be uploaded and deleted
+        :type dry_run: bool
+        :param progress: Receives per-file and end-of-batch transfer events
+        :type progress: Optional[TransferProgress]
+        :param file_filter: Only sync, and with delete only remove, the files
+                            passing this filter, matched relative to local_dir and prefix
+        :type file_filter: Optional[FileFilter]
+        :return: Sync report with planned uploads, deletions and their byte totals
+        :rtype: dict
+        """
+        return self.tos_handler.sync_directory(
+            local_dir=local_dir,
+            target_path=prefix,
+            delete=delete,
+            dry_run=dry_run,
+            checkpoint_dir=checkpoint_dir,
+            max_retries=max_retries,
+            task_num=task_num if task_num is not None else DEFAULT_THREAD,
+            progress=progress,
+            file_filter=file_filter,
+        )
+
+    def copy(self, source: str, target: str, task_num: int = None) -> dict:
+        """Copies a file or a whole prefix inside the tos bucket bound to
+        workspace. The copy runs on the server, no data is downloaded.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.copy(source="analysis/sub/final.bam", target="release/")
+            ws.files.copy(source="analysis/sub/", target="release/sub/")
+
+        :param source: File to copy, or a prefix ending with ``/``
+        :type source: str
+        :param target: Target file, or a target prefix ending with ``/``
+        :type target: str
+        :param task_num: Total parallel copies shared by files and copy parts
+        :type task_num: int
+        :return: Copy report with copied counts, bytes and failed files
+        :rtype: dict
+        """
+        return self.tos_handler.copy_objects(
+            self._normalize_download_source(source),
+            self._normalize_download_source(target),
+            task_num=task_num if task_num is not None else DEFAULT_THREAD,
+        )
+
+    def move(self, source: str, target: str, task_num: int = None) -> dict:
+        """Moves a file or a whole prefix inside the tos bucket bound to
+        workspace. Sources are deleted in batches once they are copied, and
+        the directory markers of a fully moved prefix with them.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.move(source="scratch/run1/", target="archive/run1/")
+
+        :param source: File to move, or a prefix ending with ``/``
+        :type source: str
+        :param target: Target file, or a target prefix ending with ``/``
+        :type target: str
+        :param task_num: Total parallel copies shared by files and copy parts
+        :type task_num: int
+        :return: Move report with copied and deleted counts and failed files
+        :rtype: dict
+        """
+        return self.tos_handler.copy_objects(
+            self._normalize_download_source(source),
+            self._normalize_download_source(target),
+            delete_source=True,
+            task_num=task_num if task_num is not None else DEFAULT_THREAD,
+        )
+
+    def delete_prefix(self,
+                      prefix: str,
+                      include: str = "",
+                      ignore: str = "",
+                      dry_run: bool = False,
+                      task_num: int = None,
+                      file_filter: Optional[FileFilter] = None) -> dict:
+        """Deletes every file below a prefix of the tos bucket bound to
+        workspace, deleting batches concurrently while the prefix is listed.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            ws.files.delete_prefix(prefix="scratch/", ignore=r".*\\.log", dry_run=True)
+
+        :param prefix: Directory to delete; a trailing slash is implied, so
+                       sibling keys sharing the same stem are kept
+        :type prefix: str
+        :param include: Only delete files whose name fully matches this regex
+        :type include: str
+        :param ignore: Keep files whose name fully matches this regex
+        :type ignore: str
+        :param dry_run: Only report the files and bytes that would be deleted
+        :type dry_run: bool
+        :param task_num: Number of concurrent delete batches
+        :type task_num: int
+        :param file_filter: Only delete files passing this filter, matched relative
+                            to prefix; replaces include and ignore
+        :type file_filter: Optional[FileFilter]
+        :return: Delete report with matched and deleted counts and bytes
+        :rtype: dict
+        """
+        return self.tos_handler.delete_prefix(
+            self._normalize_download_source(prefix),
+            include=include,
+            ignore=ignore,
+            dry_run=dry_run,
+            task_num=task_num if task_num is not None else DEFAULT_THREAD,
+            file_filter=file_filter,
+        )
+
     def delete(self, sources: Union[str, Iterable[str]]) -> bool:
         """Deletes the given file from the tos bucket bound to workspace .
 
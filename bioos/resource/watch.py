@@ -0,0 +1,202 @@
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from bioos.config import Config
+from bioos.internal.monitor import FINISHED_RUN_STATUSES, AdaptivePollInterval
+from bioos.resource.workflows import Run
+
+DEFAULT_WATCH_MIN_INTERVAL = 10
+DEFAULT_WATCH_MAX_INTERVAL = 60
+SUBMISSION_NOT_FOUND_MESSAGE = "submission not found"
+
+
+@dataclass
+class StatusEvent:
+    """A status transition of a submission or of one of its runs.
+
+    ``previous_status`` is None the first time the object is seen.
+    """
+    kind: str  # "submission" or "run"
+    submission_id: str
+    run_id: Optional[str]
+    previous_status: Optional[str]
+    status: str
+    timestamp: float
+    duration: Optional[int] = None
+    outputs: Optional[str] = None
+    message: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_RUN_STATUSES
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class SubmissionWatcher:
+    """Turns successive bulk snapshots of a workspace into status events.
+
+    Every tick makes one ``ListSubmissions`` call for the watched
+    submissions and one paged run listing per unfinished submission, and
+    diffs the statuses against the previous tick. Without
+    ``submission_ids`` every submission of the workspace started at or
+    after ``since`` is watched, including ones created while watching.
+    An explicit submission the API does not return, because it is unknown
+    or was deleted, finishes as ``Failed`` with a message saying so.
+    """
+
+    def __init__(self,
+                 workspace_id: str,
+                 submission_ids: Optional[Iterable[str]] = None,
+                 since: Optional[int] = None):
+        self.workspace_id = workspace_id
+        self.submission_ids = list(
+            submission_ids) if submission_ids is not None else None
+        self.since = since
+        self._submission_status: Dict[str, str] = {}
+        self._run_status: Dict[str, str] = {}
+
+    @property
+    def done(self) -> bool:
+        """Whether every explicitly watched submission has finished."""
+        return self.submission_ids is not None and all(
+            self._submission_status.get(submission_id) in FINISHED_RUN_STATUSES
+            for submission_id in self.submission_ids)
+
+    def _list_submissions(self) -> Tuple[List[dict], List[str]]:
+        """:return: the listed submissions, and the explicitly watched ids
+                    the API did not return"""
+        params = {"WorkspaceID": self.workspace_id, "PageSize": 0}
+        pending = []
+        if self.submission_ids is not None:
+            pending = [
+                submission_id for submission_id in self.submission_ids
+                if self._submission_status.get(submission_id)
+                not in FINISHED_RUN_STATUSES
+            ]
+            if not pending:
+                return [], []
+            params["Filter"] = {"IDs": pending}
+        items = Config.service().list_submissions(params).get("Items") or []
+        listed = {item.get("ID") for item in items}
+        missing = [
+            submission_id for submission_id in dict.fromkeys(pending)
+            if submission_id not in listed
+        ]
+        if self.since is not None:
+            items = [
+                item for item in items
+                if (item.get("StartTime") or 0) >= self.since
+            ]
+        return items, missing
+
+    def poll(self) -> List[StatusEvent]:
+        """Takes one snapshot and returns the transitions since the last one."""
+        now = time.time()
+        events = []
+        items, missing = self._list_submissions()
+        for submission_id in missing:
+            previous = self._submission_status.get(submission_id)
+            self._submission_status[submission_id] = "Failed"
+            events.append(
+                StatusEvent(kind="submission",
+                            submission_id=submission_id,
+                            run_id=None,
+                            previous_status=previous,
+                            status="Failed",
+                            timestamp=now,
+                            message=SUBMISSION_NOT_FOUND_MESSAGE))
+        for item in items:
+            submission_id = item.get("ID")
+            previous = self._submission_status.get(submission_id)
+            if previous in FINISHED_RUN_STATUSES:
+                continue
+            status = item.get("Status")
+            # runs of a submission that just finished still get a last look;
+            # history found already finished by a workspace-wide watch does not
+            runs = []
+            if self.submission_ids is not None or previous is not None or \
+                    status not in FINISHED_RUN_STATUSES:
+                runs = list(Run.iter_runs(self.workspace_id, submission_id))
+            for run in runs:
+                Run.from_record(self.workspace_id, submission_id, run)
+                run_status = run.get("Status")
+                run_previous = self._run_status.get(run.get("ID"))
+                if run_status == run_previous:
+                    continue
+                self._run_status[run.get("ID")] = run_status
+                events.append(
+                    StatusEvent(kind="run",
+                                submission_id=submission_id,
+                                run_id=run.get("ID"),
+                                previous_status=run_previous,
+                                status=run_status,
+                                timestamp=now,
+                                duration=run.get("Duration"),
+                                outputs=run.get("Outputs"),
+                                message=run.get("Message")))
+            if status != previous:
+                self._submission_status[submission_id] = status
+                events.append(
+                    StatusEvent(kind="submission",
+                                submission_id=submission_id,
+                                run_id=None,
+                                previous_status=previous,
+                                status=status,
+                                timestamp=now,
+                                duration=item.get("Duration"),
+                                outputs=item.get("Outputs")))
+        return events
+
+    def _intervals(self, min_interval: float, max_interval: float):
+        interval = AdaptivePollInterval(min_interval, max_interval)
+        return lambda events: interval.next(bool(events),
+                                            self._run_status.values())
+
+    def watch(self,
+              min_interval: float = DEFAULT_WATCH_MIN_INTERVAL,
+              max_interval: float = DEFAULT_WATCH_MAX_INTERVAL,
+              timeout: Optional[float] = None,
+              max_polls: Optional[int] = None) -> Iterator[StatusEvent]:
+        next_interval = self._intervals(min_interval, max_interval)
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        polls = 0
+        while True:
+            events = self.poll()
+            polls += 1
+            yield from events
+            if self.done or (max_polls is not None and polls >= max_polls):
+                return
+            delay = next_interval(events)
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            time.sleep(delay)
+
+    async def awatch(self,
+                     min_interval: float = DEFAULT_WATCH_MIN_INTERVAL,
+                     max_interval: float = DEFAULT_WATCH_MAX_INTERVAL,
+                     timeout: Optional[float] = None,
+                     max_polls: Optional[int] = None
+                     ) -> AsyncIterator[StatusEvent]:
+        next_interval = self._intervals(min_interval, max_interval)
+        loop = asyncio.get_running_loop()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        polls = 0
+        while True:
+            events = await loop.run_in_executor(None, self.poll)
+            polls += 1
+            for event in events:
+                yield event
+            if self.done or (max_polls is not None and polls >= max_polls):
+                return
+            delay = next_interval(events)
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return
+            await asyncio.sleep(delay)
@@ -1,9 +1,14 @@
 import base64
 import os
+import threading
+import time
+import weakref
 import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from io import BytesIO
-from typing import List, Dict, Optional, Any
+from typing import Any, Dict, Iterator, List, Optional
 
 import pandas as pd
 from cachetools import TTLCache, cached
@@ -12,11 +17,14 @@ from typing_extensions import Literal
 
 from bioos.config import Config
 from bioos.errors import ConflictError, NotFoundError, ParameterError
-from bioos.resource.data_models import DataModelResource
+from bioos.resource.data_models import DataModelCatalog
 from bioos.utils import workflows
 from bioos.utils.common_tools import SingletonType, dict_str, is_json
 
 UNKNOWN = "Unknown"
+# runs per ListRuns page when listing every run of a submission
+RUN_PAGE_SIZE = 100
+RUN_PAGE_WORKERS = 4
 SUBMISSION_STATUS = Literal["Succeeded", "Failed", "Running", "Pending"]
 RUN_STATUS = Literal["Succeeded", "Failed", "Running", "Pending"]
 WORKFLOW_LANGUAGE = Literal["WDL"]
@@ -95,7 +103,10 @@ class Run(metaclass=SingletonType):  # 单例模式，why
         :param submission_id: Submission ID
         :type submission_id: str
         """
+        self._init_fields(workspace_id, id_, submission_id)
+        self.sync()  # 这里会初始化上方的UNKNOWN
 
+    def _init_fields(self, workspace_id: str, id_: str, submission_id: str):
         self.workspace_id = workspace_id
         self.id = id_
         self.submission = submission_id
@@ -109,7 +120,32 @@ class Run(metaclass=SingletonType):  # 单例模式，why
         self._finish_time = 0
         self._status = UNKNOWN
         self._tasks: pd.DataFrame = None
-        self.sync()  # 这里会初始化上方的UNKNOWN
+
+    @classmethod
+    def from_record(cls, workspace_id: str, submission_id: str,
+                    record: dict) -> "Run":
+        """Returns the Run of a ``ListRuns`` item without requesting it again.
+
+        The Run already created for the same ids is updated in place, so
+        every holder of it sees the new state.
+
+        :param workspace_id: Workspace id
+        :type workspace_id: str
+        :param submission_id: Submission ID
+        :type submission_id: str
+        :param record: One item of a ``ListRuns`` response
+        :type record: dict
+        :return: The Run of the record
+        :rtype: Run
+        """
+        id_ = record.get("ID")
+        run = cls.cached_instance(workspace_id, id_, submission_id)
+        if run is None:
+            run = cls.__new__(cls)
+            run._init_fields(workspace_id, id_, submission_id)
+            run = cls.register_instance(run, workspace_id, id_, submission_id)
+        run._apply_record(record)
+        return run
 
     @staticmethod
     def list_runs(workspace_id: str,
@@ -117,8 +153,22 @@ class Run(metaclass=SingletonType):  # 单例模式，why
                   page_number: Optional[int] = None,
                   page_size: Optional[int] = None,
                   filter_: Optional[dict] = None,
-                  top: Optional[dict] = None) -> dict:
-        """Lists runs under a submission."""
+                  top: Optional[dict] = None,
+                  all_pages: bool = False,
+                  workers: int = RUN_PAGE_WORKERS) -> dict:
+        """Lists runs under a submission.
+
+        With ``all_pages`` every run is fetched by :meth:`iter_runs` and
+        ``page_number`` is ignored.
+        """
+        if all_pages:
+            items = list(
+                Run.iter_runs(workspace_id,
+                              submission_id,
+                              filter_=filter_,
+                              page_size=page_size or RUN_PAGE_SIZE,
+                              workers=workers))
+            return {"Items": items, "TotalCount": len(items)}
         params = {
             "SubmissionID": Run._normalize_required_string(submission_id, "submission_id"),
             "WorkspaceID": Run._normalize_required_string(workspace_id, "workspace_id"),
@@ -133,6 +183,73 @@ class Run(metaclass=SingletonType):  # 单例模式，why
             params["Top"] = top
         return Config.service().list_runs(params)
 
+    @staticmethod
+    def iter_runs(workspace_id: str,
+                  submission_id: str,
+                  filter_: Optional[dict] = None,
+                  page_size: int = RUN_PAGE_SIZE,
+                  workers: int = RUN_PAGE_WORKERS) -> Iterator[dict]:
+        """Streams every run under a submission in order.
+
+        The first page gives the total, then the remaining fixed-size pages
+        are fetched by ``workers`` threads, at most ``workers`` pages ahead
+        of the caller, so huge submissions never arrive as one response.
+
+        :param page_size: Runs per request
+        :type page_size: int
+        :param workers: Pages requested concurrently
+        :type workers: int
+        :return: ``ListRuns`` items
+        :rtype: Iterator[dict]
+        """
+        page_size = max(int(page_size), 1)
+        workers = max(int(workers), 1)
+
+        def fetch(page_number: int) -> List[dict]:
+            return Run.list_runs(workspace_id,
+                                 submission_id,
+                                 page_number=page_number,
+                                 page_size=page_size,
+                                 filter_=filter_).get("Items") or []
+
+        first = Run.list_runs(workspace_id,
+                              submission_id,
+                              page_number=1,
+                              page_size=page_size,
+                              filter_=filter_)
+        items = first.get("Items") or []
+        yield from items
+        total = first.get("TotalCount")
+        if total is None:
+            # without a total, walk the pages until a short one
+            page_number = 1
+            while len(items) == page_size:
+                page_number += 1
+                items = fetch(page_number)
+                yield from items
+            return
+
+        last_page = (int(total) + page_size - 1) // page_size
+        if last_page <= 1:
+            return
+        executor = ThreadPoolExecutor(max_workers=min(workers, last_page - 1))
+        pending = deque()
+        next_page = 2
+        try:
+            while next_page <= last_page and len(pending) < workers:
+                pending.append(executor.submit(fetch, next_page))
+                next_page += 1
+            while pending:
+                items = pending.popleft().result()
+                if next_page <= last_page:
+                    pending.append(executor.submit(fetch, next_page))
+                    next_page += 1
+                yield from items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False)
+
     @staticmethod
     def list_tasks(workspace_id: str,
                    run_id: str,
@@ -182,6 +299,8 @@ class Run(metaclass=SingletonType):  # 单例模式，why
         """
         if self._status in ("Succeeded", "Failed"):  #判断是否已结束流程，只有在结束前才会触发查询
             return self._status
+        if StatusPoller.serves(self.workspace_id, self.submission):
+            return self._status
         self.sync()
         return self._status
 
@@ -310,7 +429,9 @@ class Run(metaclass=SingletonType):  # 单例模式，why
         # not found runs
         if len(resp.get("Items")) != 1:
             return
-        item = resp.get("Items")[0]
+        self._apply_record(resp.get("Items")[0])
+
+    def _apply_record(self, item: dict):
         self._status = item.get("Status")
         self.start_time = item.get("StartTime")
         self.inputs = item.get("Inputs")
@@ -379,15 +500,11 @@ class Submission(metaclass=SingletonType):  # 与run class行为相同
         self._finish_time = 0
         self._status = UNKNOWN
         self.owner = UNKNOWN
-        runs = Config.service().list_runs({
-            "WorkspaceID": self.workspace_id,
-            "SubmissionID": self.id,
-            'PageSize': 0
-        }).get("Items")
-        self.runs = [
-            Run(self.workspace_id, run.get("ID"), self.id) for run in runs
-        ]
+        self.runs: List[Run] = []
         self.sync()
+        poller = StatusPoller.cached_instance(self.workspace_id)
+        if poller is not None and poller.running:
+            poller.track(self)
 
     @property
     def finish_time(self) -> int:
@@ -410,6 +527,8 @@ class Submission(metaclass=SingletonType):  # 与run class行为相同
         """
         if self._status in ("Succeeded", "Failed"):
             return self._status
+        if StatusPoller.serves(self.workspace_id, self.id):
+            return self._status
         self.sync()
         return self._status
 
@@ -429,26 +548,27 @@ class Submission(metaclass=SingletonType):  # 与run class行为相同
             return
         item = resp.get("Items")[0]
 
-        # list data entity rows by call list runs
-        runs = Config.service().list_runs({
-            'WorkspaceID': self.workspace_id,
-            "SubmissionID": self.id,
-        }).get("Items")
+        # one run listing refreshes every run and the data entity rows
+        self._apply_runs(list(Run.iter_runs(self.workspace_id, self.id)))
+        self._apply_record(item)
+
+    def _apply_runs(self, runs: List[dict]):
+        self.runs = [
+            Run.from_record(self.workspace_id, self.id, run) for run in runs
+        ]
         data_entity_row_ids = set()
         for run in runs:
             if run.get("DataEntityRowID") != "":
                 data_entity_row_ids.add(run.get("DataEntityRowID"))
         self.data_model_rows = list(data_entity_row_ids)
-        # get data model name by call list data models
-        models = Config.service().list_data_models({
-            'WorkspaceID':
-            self.workspace_id,
-        }).get("Items")
-        if "DataModelID" in item.keys():
-            for model in models:
-                if model["ID"] == item["DataModelID"]:
-                    self.data_model = model.get("Name")
-                    break
+
+    def _apply_record(self, item: dict):
+        # the workspace catalog maps the data model id to its name
+        if self.data_model == UNKNOWN and "DataModelID" in item.keys():
+            name = DataModelCatalog(self.workspace_id).name_of(
+                item["DataModelID"])
+            if name is not None:
+                self.data_model = name
 
         self.call_cache = item.get("ExposedOptions").get("ReadFromCache")
         self.outputs = item.get("Outputs")
@@ -470,6 +590,154 @@ class Submission(metaclass=SingletonType):  # 与run class行为相同
         })
 
 
+class StatusPoller(metaclass=SingletonType):
+    """Refreshes every tracked submission of a workspace and its runs in bulk.
+
+    One tick costs a single ``ListSubmissions`` call for all unfinished
+    submissions plus one paged run listing per unfinished submission, and
+    the responses are pushed into the existing ``Submission`` and ``Run``
+    objects. While the poller is running, their ``status`` properties read
+    the last snapshot instead of requesting it. Submissions are only tracked
+    while it runs, through weak references, and are dropped once finished.
+
+    *Example*:
+    ::
+
+        poller = ws.status_poller
+        poller.start(interval=30)
+        # ... submit workflows, read submission.status / run.status freely
+        poller.stop()
+    """
+    DEFAULT_INTERVAL = 30
+
+    def __init__(self, workspace_id: str):
+        self.workspace_id = workspace_id
+        self.interval = self.DEFAULT_INTERVAL
+        self.last_poll = 0.0
+        self._submissions: "weakref.WeakValueDictionary[str, Submission]" = \
+            weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __repr__(self):
+        return f"StatusPoller(workspace_id={self.workspace_id!r}, " \
+               f"tracked={len(self._submissions)}, running={self.running})"
+
+    @classmethod
+    def serves(cls, workspace_id: str, submission_id: str) -> bool:
+        """Whether a running poller keeps the submission's snapshot fresh."""
+        poller = cls.cached_instance(workspace_id)
+        return poller is not None and poller.fresh and \
+            submission_id in poller._submissions
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the last tick of the running poller is recent enough to
+        stand in for a request.
+        """
+        return self.running and \
+            time.monotonic() - self.last_poll <= 2 * self.interval
+
+    def track(self, submission: Submission):
+        """Adds a submission, and through it its runs, to the bulk refresh.
+
+        :param submission: Submission of this workspace
+        :type submission: Submission
+        """
+        if submission.workspace_id != self.workspace_id:
+            raise ParameterError("submission",
+                                 "belongs to another workspace")
+        with self._lock:
+            self._submissions[submission.id] = submission
+
+    def untrack(self, submission_id: str):
+        with self._lock:
+            self._submissions.pop(submission_id, None)
+
+    def unfinished(self) -> List[Submission]:
+        with self._lock:
+            return [
+                submission for submission in self._submissions.values()
+                if submission._status not in ("Succeeded", "Failed")
+            ]
+
+    def poll(self) -> List[Submission]:
+        """Refreshes the unfinished submissions and their runs once.
+
+        :return: The submissions refreshed by this tick
+        :rtype: List[Submission]
+        """
+        submissions = {
+            submission.id: submission
+            for submission in self.unfinished()
+        }
+        if submissions:
+            items = Config.service().list_submissions({
+                "WorkspaceID": self.workspace_id,
+                "Filter": {
+                    "IDs": list(submissions)
+                },
+                "PageSize": 0,
+            }).get("Items")
+            for item in items:
+                submission = submissions.get(item.get("ID"))
+                if submission is None:
+                    continue
+                # runs first, so a finished submission never shows running runs
+                submission._apply_runs(
+                    list(Run.iter_runs(self.workspace_id, submission.id)))
+                submission._apply_record(item)
+            for submission in submissions.values():
+                if submission._status in ("Succeeded", "Failed"):
+                    self.untrack(submission.id)
+        self.last_poll = time.monotonic()
+        return list(submissions.values())
+
+    def _loop(self):
+        while not self._stop.is_set():
+            try:
+                self.poll()
+            except Exception as err:
+                Config.Logger.warn(f"poll submission status failed: {err}")
+            self._stop.wait(self.interval)
+
+    def start(self, interval: float = DEFAULT_INTERVAL):
+        """Polls in a background thread every ``interval`` seconds.
+
+        :param interval: Seconds between two ticks
+        :type interval: float
+        """
+        if interval <= 0:
+            raise ParameterError("interval", "must be positive")
+        self.interval = interval
+        if self.running:
+            return
+        # submissions created before the start are picked up here, later
+        # ones track themselves while the poller runs
+        for submission in list(getattr(Submission, "_instance", {}).values()):
+            if submission.workspace_id == self.workspace_id and \
+                    submission._status not in ("Succeeded", "Failed"):
+                self.track(submission)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop,
+                                        name=f"bioos-status-{self.workspace_id}",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        with self._lock:
+            self._submissions.clear()
+
+
 class WorkflowResource(metaclass=SingletonType):
 
     def __init__(self, workspace_id: str):
@@ -1107,11 +1375,7 @@ class Workflow(metaclass=SingletonType):
         Returns:
             str: The ID of the data model, or empty string if not found
         """
-        res = DataModelResource(self.workspace_id).list(). \
-            query(f"Name=='{name}'")
-        if res.empty:
-            return ""
-        return res["ID"].iloc[0]
+        return DataModelCatalog(self.workspace_id).id_of(name) or ""
 
     def submit(self,
                inputs: str,
@@ -2,6 +2,7 @@ from datetime import datetime
 import os
 import time
 import urllib.request
+from typing import AsyncIterator, Iterable, Iterator, Optional
 
 import pandas as pd
 from cachetools import TTLCache, cached
@@ -9,8 +10,11 @@ from cachetools import TTLCache, cached
 from bioos.config import Config
 from bioos.resource.data_models import DataModelResource
 from bioos.resource.files import FileResource
-from bioos.resource.workflows import Workflow, WorkflowResource
+from bioos.resource.workflows import StatusPoller, Workflow, WorkflowResource
 from bioos.resource.iesapp import WebInstanceApp, WebInstanceAppResource
+from bioos.resource.watch import (DEFAULT_WATCH_MAX_INTERVAL,
+                                  DEFAULT_WATCH_MIN_INTERVAL, StatusEvent,
+                                  SubmissionWatcher)
 from bioos.utils.common_tools import SingletonType, dict_str
 
 
@@ -115,6 +119,15 @@ class Workspace(metaclass=SingletonType):
 
         return FileResource(self._id, self._bucket)
 
+    @property
+    def status_poller(self) -> StatusPoller:
+        """Returns the StatusPoller refreshing the submissions of the workspace.
+
+        :return: StatusPoller object
+        :rtype: StatusPoller
+        """
+        return StatusPoller(self._id)
+
     @property
     def webinstanceapps(self) -> WebInstanceAppResource:
         """Returns WebInstanceAppResource object.
@@ -124,6 +137,65 @@ class Workspace(metaclass=SingletonType):
         """
         return WebInstanceAppResource(self._id)
 
+    def watch(self,
+              submission_ids: Optional[Iterable[str]] = None,
+              since: Optional[int] = None,
+              min_interval: float = DEFAULT_WATCH_MIN_INTERVAL,
+              max_interval: float = DEFAULT_WATCH_MAX_INTERVAL,
+              timeout: Optional[float] = None,
+              max_polls: Optional[int] = None) -> Iterator[StatusEvent]:
+        """Yields submission and run status transitions as they happen.
+
+        The first snapshot reports the current status of everything watched
+        with ``previous_status`` None. Watching explicit submissions ends
+        once all of them finished, an unknown or deleted one counting as
+        ``Failed``; a workspace-wide watch runs until ``timeout``,
+        ``max_polls`` or until the caller stops iterating.
+
+        *Example*:
+        ::
+
+            ws = bioos.workspace("foo")
+            for event in ws.watch(submission_ids=["sub-1"]):
+                if event.kind == "run" and event.status == "Succeeded":
+                    print(event.run_id, event.duration, event.outputs)
+
+        :param submission_ids: Submissions to watch; all of the workspace if None
+        :type submission_ids: Optional[Iterable[str]]
+        :param since: Only watch submissions started at or after this unix time
+        :type since: Optional[int]
+        :param min_interval: Seconds between snapshots while statuses change
+        :type min_interval: float
+        :param max_interval: Longest seconds between snapshots
+        :type max_interval: float
+        :param timeout: Stop watching after this many seconds
+        :type timeout: Optional[float]
+        :param max_polls: Stop watching after this many snapshots
+        :type max_polls: Optional[int]
+        :return: Status transition events
+        :rtype: Iterator[StatusEvent]
+        """
+        return SubmissionWatcher(self._id, submission_ids, since).watch(
+            min_interval, max_interval, timeout, max_polls)
+
+    def awatch(self,
+               submission_ids: Optional[Iterable[str]] = None,
+               since: Optional[int] = None,
+               min_interval: float = DEFAULT_WATCH_MIN_INTERVAL,
+               max_interval: float = DEFAULT_WATCH_MAX_INTERVAL,
+               timeout: Optional[float] = None,
+               max_polls: Optional[int] = None) -> AsyncIterator[StatusEvent]:
+        """Async iterator version of :meth:`watch`.
+
+        *Example*:
+        ::
+
+            async for event in ws.awatch(submission_ids=["sub-1"]):
+                print(event.to_dict())
+        """
+        return SubmissionWatcher(self._id, submission_ids, since).awatch(
+            min_interval, max_interval, timeout, max_polls)
+
     def workflow(self, name: str) -> Workflow:  # 通过这里执行的选择workflow生成wf的操作
         """Returns the workflow for the given name
 
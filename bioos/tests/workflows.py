@@ -257,31 +257,19 @@ class TestWorkflows(BaseInit):
             'SortBy': 'CreateTime',
             'PageSize': 0,
         })
-        list_data_models.assert_has_calls([
-            mock.call({
-                'WorkspaceID': self.workspace_id
-            }), mock.call({
-                'WorkspaceID': self.workspace_id
-            })
-        ])
-        # list_data_models.assert_called_once()
+        list_data_models.assert_called_once_with({
+            'WorkspaceID': self.workspace_id
+        })
         create_submission.assert_called_once()
         # list_runs.assert_called_once()
         list_submissions.assert_called_once()
         list_tasks.assert_not_called()
-        list_runs.assert_has_calls([
-            mock.call({
-                'WorkspaceID': self.workspace_id,
-                'SubmissionID': self.submission_id,
-                'PageSize': 0
-            }), mock.call({
-                'WorkspaceID': self.workspace_id,
-                'Filter': {'IDs': ['fake_run_id']},
-            }), mock.call({
-                'WorkspaceID': self.workspace_id,
-                'SubmissionID': self.submission_id,
-            })
-        ])
+        list_runs.assert_called_once_with({
+            'WorkspaceID': self.workspace_id,
+            'SubmissionID': self.submission_id,
+            'PageNumber': 1,
+            'PageSize': 100
+        })
         # wait for a while to make cache overdue
         time.sleep(2)
         with patch.object(BioOsService, "list_runs",
@@ -55,3 +55,18 @@ class SingletonType(type):
                     cls._instance[key] = super(SingletonType,
                                                cls).__call__(*args, **kwargs)
         return cls._instance[key]
+
+    def cached_instance(cls, *args, **kwargs):
+        """Returns the instance already created for these arguments, or None."""
+        return getattr(cls, "_instance", {}).get(
+            instance_key(cls, *args, **kwargs))
+
+    def register_instance(cls, instance, *args, **kwargs):
+        """Registers an instance built without calling the class, returning
+        the one already registered for these arguments if there is any.
+        """
+        with SingletonType._instance_lock:
+            if not hasattr(cls, "_instance"):
+                cls._instance = {}
+            return cls._instance.setdefault(instance_key(cls, *args, **kwargs),
+                                            instance)
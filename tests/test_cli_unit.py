@@ -1,3 +1,4 @@
+import io
 import json
 import os
 import tempfile
@@ -11,10 +12,12 @@ from bioos.cli import (
     build_docker_image,
     check_build_status,
     check_ies_status,
+    copy_files_in_workspace,
     create_iesapp,
     create_workspace_bioos,
     delete_workspace,
     delete_workspace_members,
+    delete_prefix_from_workspace,
     delete_submission,
     download_files_from_workspace,
     export_bioos_workspace,
@@ -29,17 +32,22 @@ from bioos.cli import (
     list_workspace_members,
     list_submissions_from_workspace,
     list_workflows_from_workspace,
+    move_files_in_workspace,
     main as cli_main,
     run as run_commands,
     search_dockstore,
+    sync_files_to_workspace,
     upload_dashboard_file,
     upload_files_to_workspace,
     usage_metrics,
     update_workflow,
     update_workspace_members,
+    watch_submissions,
 )
 from bioos import bioos_workflow, bw_import, bw_import_status_check, bw_status_check, get_submission_logs as submission_logs_module
 from bioos.errors import ParameterError
+from bioos.internal.progress import TransferProgress
+from bioos.resource.watch import StatusEvent
 from bioos.ops import auth as auth_ops
 from network.cli import main as network_cli
 
@@ -115,6 +123,32 @@ class TestCliHandlers(unittest.TestCase):
             filter_={"Keyword": "kw", "IDs": ["rid"], "Status": ["Running"]},
         )
 
+    def test_run_list_handle_fetches_all_pages(self):
+        args = SimpleNamespace(
+            workspace_name="ws",
+            submission_id="sid",
+            page_number=1,
+            page_size=None,
+            all=True,
+            workers=8,
+            keyword=None,
+            run_id=None,
+            status=["Failed"],
+        )
+        with patch("bioos.cli.run.login_with_args"), \
+                patch("bioos.cli.run.resolve_workspace", return_value=("wid", {})), \
+                patch("bioos.cli.run.Run.list_runs", return_value={"Items": [], "TotalCount": 0}) as mocked:
+            result = run_commands.handle_list(args)
+        self.assertEqual(result["TotalCount"], 0)
+        mocked.assert_called_once_with(
+            workspace_id="wid",
+            submission_id="sid",
+            page_size=None,
+            filter_={"Status": ["Failed"]},
+            all_pages=True,
+            workers=8,
+        )
+
     def test_run_tasks_handle(self):
         args = SimpleNamespace(
             workspace_name="ws",
@@ -198,23 +232,136 @@ class TestCliHandlers(unittest.TestCase):
         self.assertEqual(result["result"], {})
 
     def test_list_files_from_workspace_handle(self):
-        args = SimpleNamespace(workspace_name="ws", prefix="analysis/", recursive=True)
+        args = SimpleNamespace(workspace_name="ws", prefix="analysis/", recursive=True, limit=5)
         ws = MagicMock()
         ws.files.list.return_value = MagicMock()
         with patch("bioos.cli.list_files_from_workspace.workspace_context_from_args", return_value=("wid", ws)), \
                 patch("bioos.cli.list_files_from_workspace.dataframe_records", return_value=[{"key": "a.txt"}]):
             result = list_files_from_workspace.handle(args)
-        ws.files.list.assert_called_once_with(prefix="analysis/", recursive=True)
+        ws.files.list.assert_called_once_with(prefix="analysis/", recursive=True, limit=5)
         self.assertEqual(result, [{"key": "a.txt"}])
 
     def test_download_files_from_workspace_handle(self):
-        args = SimpleNamespace(workspace_name="ws", source=["a.txt", "b.txt"], target="/tmp/out", flatten=True)
+        args = SimpleNamespace(
+            workspace_name="ws",
+            source=["a.txt", "b.txt"],
+            target="/tmp/out",
+            flatten=True,
+            checkpoint_dir="/tmp/ckpt",
+            max_retries=2,
+            task_num=4,
+            autotune=False,
+            progress_json=False,
+        )
         ws = MagicMock()
         ws.files.download.return_value = True
         with patch("bioos.cli.download_files_from_workspace.workspace_context_from_args", return_value=("wid", ws)):
             result = download_files_from_workspace.handle(args)
-        ws.files.download.assert_called_once_with(sources=["a.txt", "b.txt"], target="/tmp/out", flatten=True)
+        ws.files.download.assert_called_once_with(
+            sources=["a.txt", "b.txt"],
+            target="/tmp/out",
+            flatten=True,
+            checkpoint_dir="/tmp/ckpt",
+            max_retries=2,
+            task_num=4,
+            autotune=False,
+            progress=None,
+        )
         self.assertTrue(result["success"])
+        self.assertNotIn("transfer_summary", result)
+
+    def test_move_files_in_workspace_handle(self):
+        args = SimpleNamespace(workspace_name="ws", source="scratch/run1/", target="archive/run1/", task_num=6)
+        ws = MagicMock()
+        ws.files.move.return_value = {"copied_count": 2, "failed_copies": [], "failed_deletes": []}
+        with patch("bioos.cli.move_files_in_workspace.workspace_context_from_args", return_value=("wid", ws)):
+            result = move_files_in_workspace.handle(args)
+        ws.files.move.assert_called_once_with(source="scratch/run1/", target="archive/run1/", task_num=6)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["copied_count"], 2)
+
+    def test_delete_prefix_from_workspace_handle(self):
+        args = SimpleNamespace(workspace_name="ws", prefix="scratch/", include="", ignore=r".*\.log",
+                               dry_run=True, task_num=4)
+        ws = MagicMock()
+        ws.files.delete_prefix.return_value = {"matched_count": 3, "failed_deletes": []}
+        with patch("bioos.cli.delete_prefix_from_workspace.workspace_context_from_args", return_value=("wid", ws)):
+            result = delete_prefix_from_workspace.handle(args)
+        ws.files.delete_prefix.assert_called_once_with(
+            prefix="scratch/", include="", ignore=r".*\.log", dry_run=True, task_num=4)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["matched_count"], 3)
+
+    def test_watch_submissions_handle_streams_events_as_json_lines(self):
+        args = SimpleNamespace(workspace_name="ws", submission_id=["sub1"], since=None,
+                               min_interval=5, max_interval=30, timeout=None, max_polls=None)
+        events = [
+            StatusEvent("run", "sub1", "r1", "Running", "Succeeded", 1.0, duration=60, outputs="{}"),
+            StatusEvent("submission", "sub1", None, "Running", "Succeeded", 1.0),
+        ]
+        ws = MagicMock()
+        ws.watch.return_value = iter(events)
+        stdout = io.StringIO()
+        with patch("bioos.cli.watch_submissions.workspace_context_from_args", return_value=("wid", ws)), \
+                patch("bioos.cli.watch_submissions.sys.stdout", stdout):
+            result = watch_submissions.handle(args)
+
+        ws.watch.assert_called_once_with(submission_ids=["sub1"], since=None, min_interval=5,
+                                         max_interval=30, timeout=None, max_polls=None)
+        lines = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([line["kind"] for line in lines], ["run", "submission"])
+        self.assertEqual(lines[0]["previous_status"], "Running")
+        self.assertEqual(result["event_count"], 2)
+        self.assertEqual(result["submissions"], {"sub1": "Succeeded"})
+        self.assertFalse(result["interrupted"])
+
+    def test_watch_submissions_handle_returns_summary_on_interrupt(self):
+        args = SimpleNamespace(workspace_name="ws", submission_id=None, since=None,
+                               min_interval=5, max_interval=30, timeout=None, max_polls=None)
+
+        def events():
+            yield StatusEvent("submission", "sub1", None, None, "Running", 1.0)
+            raise KeyboardInterrupt
+
+        ws = MagicMock()
+        ws.watch.return_value = events()
+        stdout = io.StringIO()
+        with patch("bioos.cli.watch_submissions.workspace_context_from_args", return_value=("wid", ws)), \
+                patch("bioos.cli.watch_submissions.sys.stdout", stdout):
+            result = watch_submissions.handle(args)
+
+        self.assertTrue(result["interrupted"])
+        self.assertEqual(result["event_count"], 1)
+        self.assertEqual(result["submissions"], {"sub1": "Running"})
+
+    def test_sync_files_to_workspace_handle(self):
+        args = SimpleNamespace(
+            workspace_name="ws",
+            source="./ref",
+            target="reference/",
+            delete=True,
+            dry_run=False,
+            checkpoint_dir=None,
+            max_retries=3,
+            task_num=4,
+            progress_json=False,
+        )
+        ws = MagicMock()
+        ws.files.sync.return_value = {"upload_count": 1, "failed_uploads": [], "failed_deletes": ["old.txt"]}
+        with patch("bioos.cli.sync_files_to_workspace.workspace_context_from_args", return_value=("wid", ws)):
+            result = sync_files_to_workspace.handle(args)
+        ws.files.sync.assert_called_once_with(
+            local_dir="./ref",
+            prefix="reference/",
+            delete=True,
+            dry_run=False,
+            checkpoint_dir="",
+            max_retries=3,
+            task_num=4,
+            progress=None,
+        )
+        self.assertFalse(result["success"])
+        self.assertEqual(result["upload_count"], 1)
 
     def test_upload_files_to_workspace_handle(self):
         args = SimpleNamespace(
@@ -226,13 +373,17 @@ class TestCliHandlers(unittest.TestCase):
             checkpoint_dir="/tmp/ckpt",
             max_retries=5,
             task_num=8,
+            autotune=True,
+            progress_json=True,
             ak="ak",
             sk="sk",
             endpoint="ep",
         )
         with patch("bioos.cli.upload_files_to_workspace.upload_local_files_to_workspace", return_value={"success": True}) as mocked:
             result = upload_files_to_workspace.handle(args)
-        self.assertEqual(result, {"success": True})
+        self.assertEqual(result["success"], True)
+        self.assertEqual(result["transfer_summary"]["files"], 0)
+        self.assertIsInstance(mocked.call_args.kwargs["progress"], TransferProgress)
         mocked.assert_called_once_with(
             workspace_name="ws",
             sources=["a.txt", "b.txt"],
@@ -242,6 +393,8 @@ class TestCliHandlers(unittest.TestCase):
             checkpoint_dir="/tmp/ckpt",
             max_retries=5,
             task_num=8,
+            autotune=True,
+            progress=mocked.call_args.kwargs["progress"],
             access_key="ak",
             secret_key="sk",
             endpoint="ep",
@@ -314,6 +467,7 @@ class TestCliHandlers(unittest.TestCase):
             include_failure_details=False,
             include_ies=True,
             include_signed_urls=False,
+            parallel_listing=True,
             endpoint="ep",
             ak="ak",
             sk="sk",
@@ -324,6 +478,7 @@ class TestCliHandlers(unittest.TestCase):
         options = mocked.call_args.args[0]
         self.assertEqual(options.workspace_name, "ws")
         self.assertFalse(options.include_failure_details)
+        self.assertTrue(options.parallel_listing)
 
     def test_delete_submission_handle(self):
         args = SimpleNamespace(workspace_name="ws", submission_id="sub1")
@@ -996,6 +1151,40 @@ class TestCliRootAndAuth(unittest.TestCase):
         self.assertTrue(result["success"])
         self.assertEqual(result["workflow_id"], "wf-id")
 
+    def test_legacy_workflow_submit_handle_monitors_and_downloads_per_run(self):
+        args = bioos_workflow.build_parser().parse_args(
+            ["--workspace_name", "ws", "--workflow_name", "wf", "--input_json", "inputs.json",
+             "--download_results", "--download_dir", "out", "--monitor_min_interval", "5"]
+        )
+        fake_bw = MagicMock()
+        fake_bw.runs = [SimpleNamespace(id="run1", submission="sub1", status="Succeeded")]
+        fake_bw.monitor_submissions.return_value = {"sub1/out.txt"}
+        with patch("bioos.bioos_workflow.login_to_bioos"), \
+                patch("bioos.bioos_workflow.Bioos_workflow", return_value=fake_bw), \
+                patch("bioos.bioos_workflow.time.sleep"):
+            bioos_workflow.handle(args)
+
+        fake_bw.monitor_submissions.assert_called_once_with(
+            min_interval=5, max_interval=600, download_dir="out")
+        fake_bw.postprocess.assert_called_once_with(
+            download=True, download_dir="out", exclude={"sub1/out.txt"})
+        self.assertEqual(
+            bioos_workflow.collect_output_files(
+                '{"wf.bam": "s3://b/sub1/a.bam", "wf.n": 3, "wf.vcfs": ["s3://b/sub1/x.vcf"]}'),
+            ["s3://b/sub1/a.bam", "s3://b/sub1/x.vcf"])
+
+    def test_download_run_outputs_only_reports_confirmed_downloads(self):
+        bw = bioos_workflow.Bioos_workflow.__new__(bioos_workflow.Bioos_workflow)
+        bw.ws = MagicMock()
+        bw.logger = MagicMock()
+        run = {"ID": "run1", "Outputs": '{"wf.out": "s3://bucket/sub1/out.txt"}'}
+        with tempfile.TemporaryDirectory() as tmpdir:
+            bw.ws.files.download.return_value = True
+            self.assertEqual(bw.download_run_outputs(run, tmpdir), ["sub1/out.txt"])
+            bw.ws.files.download.return_value = False
+            with self.assertRaises(RuntimeError):
+                bw.download_run_outputs(run, tmpdir)
+
     def test_legacy_workflow_submit_handle_uses_unified_login(self):
         args = bioos_workflow.build_parser().parse_args(
             ["--workspace_name", "ws", "--workflow_name", "wf", "--input_json", "inputs.json"]
@@ -1489,6 +1678,29 @@ class TestCliRootAndAuth(unittest.TestCase):
         self.assertEqual(exit_code, 0)
         mocked.assert_called_once()
 
+    def test_root_file_sync_dispatches_to_existing_handler(self):
+        with patch("bioos.cli.sync_files_to_workspace.handle", return_value={"success": True}) as mocked:
+            exit_code = cli_main.main(
+                [
+                    "file",
+                    "sync",
+                    "--workspace-name",
+                    "ws",
+                    "--source",
+                    "./ref",
+                    "--target",
+                    "reference/",
+                    "--dry-run",
+                    "--output",
+                    "json",
+                ]
+            )
+
+        self.assertEqual(exit_code, 0)
+        args = mocked.call_args.args[0]
+        self.assertTrue(args.dry_run)
+        self.assertFalse(args.delete)
+
     def test_root_ies_create_dispatches_to_existing_handler(self):
         with patch("bioos.cli.create_iesapp.handle", return_value={"success": True}) as mocked:
             exit_code = cli_main.main(
@@ -1,19 +1,41 @@
+import datetime
+import gc
+import gzip
+import io
 import json
+import sqlite3
 import tempfile
+import threading
 import unittest
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace
 from urllib.parse import parse_qs, urlparse
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, call, patch
 
+import pandas as pd
+from cachetools import TTLCache
 from requests.exceptions import SSLError
+import tos
+from tos import DataTransferType, UploadEventType
 
 from bioos.ops import docker_build, dockstore, formatters, workspace_files
+from bioos.internal import tos as tos_internal
+from bioos.internal.autotune import TransferAutotuner
+from bioos.internal.credentials import TosCredentialManager
+from bioos.internal.filters import FileFilter
+from bioos.internal import manifest as manifest_internal
+from bioos.internal.manifest import UploadManifest
+from bioos.internal.monitor import AdaptivePollInterval, SubmissionMonitor
+from bioos.internal.progress import TransferProgress
 from bioos.internal.tos import TOSHandler
 from bioos.errors import ParameterError
+from bioos.resource.data_models import DataModelCatalog, DataModelResource
 from bioos.resource.files import FileResource
 from bioos.resource.usage import UsageResource
-from bioos.resource.workflows import Run, WorkflowResource
+from bioos.resource.watch import SubmissionWatcher
+from bioos.resource.workflows import Run, StatusPoller, Submission, WorkflowResource
 from bioos.resource.workspaces import Workspace
 from bioos.service.BioOsService import BioOsService
 from network import config as repository_internal
@@ -26,6 +48,10 @@ from network.resource.network import NetworkResource
 from network.resource.repository import RepositoryResource
 
 
+def _tos_handler(client=None, bucket="bucket", **kwargs):
+    return TOSHandler(client=client or MagicMock(), bucket=bucket, logger=MagicMock(), **kwargs)
+
+
 class TestOpsHelpers(unittest.TestCase):
     def test_get_docker_image_url(self):
         self.assertEqual(
@@ -273,7 +299,11 @@ class TestOpsHelpers(unittest.TestCase):
             local_b.write_text("b", encoding="utf-8")
             ws = MagicMock()
             ws.files.s3_urls.side_effect = lambda keys: [f"s3://bioos-wid/{keys[0]}"]
-            ws.files.tos_handler.object_exists.side_effect = [True, False]
+            ws.files.tos_handler.objects_exist.return_value = {
+                "input_provision/a.txt": {"size": 1, "last_modified": None, "hash_crc64_ecma": 1},
+                "input_provision/b.txt": None,
+            }
+            ws.files.tos_handler.local_file_changed.return_value = False
             ws.files.tos_handler.build_upload_plan.return_value = [
                 {
                     "source": str(local_a),
@@ -309,6 +339,8 @@ class TestOpsHelpers(unittest.TestCase):
         self.assertEqual(result["workspace_id"], "wid")
         self.assertEqual(result["uploaded_count"], 1)
         self.assertEqual(result["skipped_count"], 1)
+        ws.files.tos_handler.objects_exist.assert_called_once_with(
+            ["input_provision/a.txt", "input_provision/b.txt"], task_num=8)
         ws.files.tos_handler.upload_planned_objects.assert_called_once_with(
             upload_plan=[{
                 "source": str(local_b),
@@ -318,6 +350,8 @@ class TestOpsHelpers(unittest.TestCase):
             checkpoint_dir=str(Path(tmpdir) / "checkpoints"),
             max_retries=5,
             task_num=8,
+            autotuner=None,
+            progress=None,
         )
 
     def test_upload_local_files_with_workspace(self):
@@ -363,7 +397,7 @@ class TestOpsHelpers(unittest.TestCase):
 
             ws = MagicMock()
             ws.files.s3_urls.side_effect = lambda keys: [f"s3://bioos-wid/{keys[0]}"]
-            ws.files.tos_handler = TOSHandler(client=MagicMock(), bucket="bucket")
+            ws.files.tos_handler = _tos_handler()
             ws.files.tos_handler.upload_planned_objects = MagicMock(return_value=[])
 
             result = workspace_files._upload_local_files_with_workspace(
@@ -399,7 +433,7 @@ class TestOpsHelpers(unittest.TestCase):
             (nested_b / "sample.txt").write_text("b", encoding="utf-8")
 
             ws = MagicMock()
-            ws.files.tos_handler = TOSHandler(client=MagicMock(), bucket="bucket")
+            ws.files.tos_handler = _tos_handler()
 
             with self.assertRaisesRegex(
                 ValueError,
@@ -422,7 +456,7 @@ class TestOpsHelpers(unittest.TestCase):
             checkpoint_dir = Path(tmpdir) / "ckpt"
             client = MagicMock()
             client.upload_file.side_effect = [Exception("temporary"), None]
-            handler = TOSHandler(client=client, bucket="bucket")
+            handler = _tos_handler(client)
 
             with patch("bioos.internal.tos.os.path.getsize", return_value=1024 * 1024 * 101):
                 failed = handler.upload_objects(
@@ -443,6 +477,934 @@ class TestOpsHelpers(unittest.TestCase):
         self.assertTrue(first_call["enable_checkpoint"])
         self.assertTrue(first_call["checkpoint_file"].endswith(".upload.ckpt"))
 
+    def test_tos_handler_upload_planned_objects_starts_largest_first(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plan = []
+            for name, size in (("small.txt", 1), ("large.txt", 30), ("medium.txt", 10)):
+                local_file = Path(tmpdir) / name
+                local_file.write_bytes(b"x" * size)
+                plan.append({"source": str(local_file), "key": f"target/{name}"})
+            client = MagicMock()
+            handler = _tos_handler(client)
+
+            failed = handler.upload_planned_objects(plan, task_num=1)
+
+        self.assertEqual(failed, [])
+        uploaded_keys = [call.kwargs["key"] for call in client.put_object_from_file.call_args_list]
+        self.assertEqual(uploaded_keys, ["target/large.txt", "target/medium.txt", "target/small.txt"])
+
+    def test_tos_handler_upload_planned_objects_reports_failures_in_plan_order(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            plan = []
+            for name in ("a.txt", "b.txt", "c.txt", "d.txt"):
+                local_file = Path(tmpdir) / name
+                local_file.write_text(name, encoding="utf-8")
+                plan.append({"source": str(local_file), "key": f"target/{name}"})
+            plan.insert(1, {"source": str(Path(tmpdir) / "missing.txt"), "key": "target/missing.txt"})
+            client = MagicMock()
+
+            def put_object_from_file(**kwargs):
+                if kwargs["key"] in ("target/a.txt", "target/d.txt"):
+                    raise Exception("boom")
+
+            client.put_object_from_file.side_effect = put_object_from_file
+            handler = _tos_handler(client)
+
+            failed = handler.upload_planned_objects(plan, max_retries=0, task_num=4)
+
+        self.assertEqual(failed, [plan[0]["source"], plan[1]["source"], plan[4]["source"]])
+        self.assertEqual(client.put_object_from_file.call_count, 4)
+
+    def test_tos_handler_download_objects_skips_head_for_known_sizes(self):
+        handler = _tos_handler()
+        handler._client.head_object.return_value = SimpleNamespace(content_length=20)
+
+        failed = handler.download_objects(
+            ["a/x.txt", "a/y.txt"], "/tmp/out", False, sizes={"a/x.txt": 10})
+
+        self.assertEqual(failed, [])
+        handler._client.head_object.assert_called_once_with(bucket="bucket", key="a/y.txt")
+        targets = sorted(
+            call.kwargs["file_path"] for call in handler._client.download_file.call_args_list
+        )
+        self.assertEqual(targets, ["/tmp/out/a/x.txt", "/tmp/out/a/y.txt"])
+
+    def test_tos_handler_download_planned_objects_continues_after_failure(self):
+        handler = _tos_handler()
+
+        def fake_download(**kwargs):
+            if kwargs["key"] == "bad.txt":
+                raise RuntimeError("boom")
+
+        handler._client.download_file.side_effect = fake_download
+        plan = [
+            {"key": "bad.txt", "target": "/tmp/out/bad.txt", "size": 1},
+            {"key": "good.txt", "target": "/tmp/out/good.txt", "size": 1},
+        ]
+
+        results = handler.download_planned_objects(plan, task_num=2)
+
+        self.assertEqual([r["status"] for r in results], ["failed", "succeeded"])
+        self.assertEqual(results[0]["error"], "boom")
+        self.assertEqual(handler.download_objects(["bad.txt", "good.txt"], "/tmp/out", True,
+                                                  sizes={"bad.txt": 1, "good.txt": 1}),
+                         ["bad.txt"])
+
+    def test_tos_handler_objects_exist_lists_dense_groups_and_heads_sparse_keys(self):
+        handler = _tos_handler()
+        dense_keys = [f"dir/{i:02d}.txt" for i in range(tos_internal.EXISTS_LIST_MIN_KEYS)]
+        handler._client.list_objects.return_value = SimpleNamespace(
+            contents=[
+                SimpleNamespace(key=key, size=3, last_modified="t", hash_crc64_ecma=7)
+                for key in dense_keys[:-1]
+            ],
+            is_truncated=False,
+            next_marker=None,
+        )
+        handler._client.head_object.return_value = SimpleNamespace(
+            content_length=5, last_modified="t2", hash_crc64_ecma=9)
+
+        result = handler.objects_exist(dense_keys + ["other/x.txt"])
+
+        handler._client.list_objects.assert_called_once_with(
+            bucket="bucket", prefix="dir/", delimiter="/", marker="dir/00.tx",
+            max_keys=tos_internal.LIST_OBJECT_MAX_KEYS)
+        handler._client.head_object.assert_called_once_with(bucket="bucket", key="other/x.txt")
+        self.assertEqual(result[dense_keys[0]]["size"], 3)
+        self.assertIsNone(result[dense_keys[-1]])
+        self.assertEqual(result["other/x.txt"],
+                         {"size": 5, "last_modified": "t2", "hash_crc64_ecma": 9})
+
+    def test_tos_handler_objects_exist_follows_prefix_only_pages_and_sparse_ranges(self):
+        client = MagicMock()
+        handler = _tos_handler(client)
+        keys = [f"dir/k{i:02d}" for i in range(tos_internal.EXISTS_LIST_MIN_KEYS)]
+
+        def page(contents=(), prefixes=(), next_marker=None):
+            return SimpleNamespace(
+                contents=[SimpleNamespace(key=k, size=1, last_modified="t", hash_crc64_ecma=1)
+                          for k in contents],
+                common_prefixes=[SimpleNamespace(prefix=p) for p in prefixes],
+                is_truncated=next_marker is not None, next_marker=next_marker)
+
+        # a truncated page holding only sub-directories must not end the scan
+        client.list_objects.side_effect = [
+            page(contents=keys[:4], next_marker="dir/k03"),
+            page(prefixes=["dir/k03a/"], next_marker="dir/k03a/"),
+            page(contents=keys[4:]),
+        ]
+        result = handler.objects_exist(keys)
+        self.assertTrue(all(result[key] for key in keys))
+        client.head_object.assert_not_called()
+
+        # pages that resolve fewer keys than they cost hand the rest to HEAD
+        client.list_objects.reset_mock()
+        client.list_objects.side_effect = [
+            page(contents=keys[:1], next_marker="dir/k00-1"),
+            page(contents=["dir/k00-2"], next_marker="dir/k00-2"),
+        ]
+        client.head_object.return_value = SimpleNamespace(
+            content_length=2, last_modified="t", hash_crc64_ecma=2)
+        result = handler.objects_exist(keys)
+        self.assertEqual(client.list_objects.call_count, 2)
+        self.assertEqual(client.head_object.call_count, len(keys) - 1)
+        self.assertEqual(result[keys[-1]]["size"], 2)
+
+    def test_tos_handler_move_prefix_copies_server_side_and_deletes_sources(self):
+        client = MagicMock()
+        handler = _tos_handler(client)
+        big_size = tos_internal.COPY_OBJECT_LIMITATION + 1
+        listing = [
+            SimpleNamespace(key="analysis/sub/", size=0),
+            SimpleNamespace(key="analysis/sub/a.txt", size=3),
+            SimpleNamespace(key="analysis/sub/deep/", size=0),
+            SimpleNamespace(key="analysis/sub/deep/big.bam", size=big_size),
+        ]
+        markers = [obj for obj in listing if obj.key.endswith("/")]
+        client.create_multipart_upload.return_value = SimpleNamespace(upload_id="uid")
+        client.upload_part_copy.side_effect = lambda **kwargs: SimpleNamespace(
+            etag=f"etag-{kwargs['part_number']}")
+        client.delete_multi_objects.return_value = SimpleNamespace(error=[])
+
+        # the second listing, after the moved objects are gone, finds only markers
+        with patch.object(handler, "iter_objects", side_effect=[iter(listing), iter(markers)]):
+            report = handler.copy_objects("analysis/sub/", "release", delete_source=True, task_num=4)
+
+        client.copy_object.assert_called_once_with(
+            bucket="bucket", key="release/a.txt", src_bucket="bucket", src_key="analysis/sub/a.txt")
+        part_calls = client.upload_part_copy.call_args_list
+        self.assertEqual(len(part_calls), 11)
+        self.assertEqual(part_calls[-1].kwargs["copy_source_range_end"], big_size - 1)
+        completed = client.complete_multipart_upload.call_args.kwargs
+        self.assertEqual(completed["key"], "release/deep/big.bam")
+        self.assertEqual([part.part_number for part in completed["parts"]], list(range(1, 12)))
+        deleted = [[obj.key for obj in call.kwargs["objects"]]
+                   for call in client.delete_multi_objects.call_args_list]
+        self.assertEqual(deleted, [["analysis/sub/a.txt", "analysis/sub/deep/big.bam"],
+                                   ["analysis/sub/", "analysis/sub/deep/"]])
+        self.assertEqual(report["copied_count"], 2)
+        self.assertEqual(report["copied_bytes"], 3 + big_size)
+        self.assertEqual(report["deleted_count"], 4)
+
+    def test_tos_handler_copy_keeps_sources_that_failed_to_copy(self):
+        client = MagicMock()
+        client.head_object.return_value = SimpleNamespace(
+            content_length=3, last_modified=None, hash_crc64_ecma=None)
+        client.copy_object.side_effect = RuntimeError("denied")
+        handler = _tos_handler(client)
+
+        report = handler.copy_objects("a/x.txt", "b/", delete_source=True)
+
+        client.copy_object.assert_called_once_with(
+            bucket="bucket", key="b/x.txt", src_bucket="bucket", src_key="a/x.txt")
+        client.delete_multi_objects.assert_not_called()
+        self.assertEqual(report["failed_copies"], ["a/x.txt"])
+        with self.assertRaises(ParameterError):
+            handler.build_copy_plan("a/", "a/b/")
+
+    def test_tos_handler_delete_prefix_streams_batches(self):
+        client = MagicMock()
+        handler = _tos_handler(client)
+        listing = [SimpleNamespace(key=f"scratch/{i}.tmp", size=2) for i in range(2500)]
+        listing.append(SimpleNamespace(key="scratch/keep.log", size=100))
+
+        def delete_multi_objects(bucket, objects):
+            keys = [obj.key for obj in objects]
+            return SimpleNamespace(error=[SimpleNamespace(key="scratch/7.tmp")]
+                                   if "scratch/7.tmp" in keys else [])
+
+        client.delete_multi_objects.side_effect = delete_multi_objects
+
+        with patch.object(handler, "iter_objects", side_effect=lambda prefix: iter(listing)):
+            preview = handler.delete_prefix("scratch/", ignore=r".*\.log", dry_run=True)
+            client.delete_multi_objects.assert_not_called()
+            report = handler.delete_prefix("scratch/", ignore=r".*\.log", task_num=2)
+
+        batch_sizes = sorted(len(call.kwargs["objects"]) for call in client.delete_multi_objects.call_args_list)
+        self.assertEqual(batch_sizes, [500, 1000, 1000])
+        self.assertEqual((preview["matched_count"], preview["matched_bytes"], preview["deleted_count"]),
+                         (2500, 5000, 0))
+        self.assertEqual(report["deleted_count"], 2499)
+        self.assertEqual(report["deleted_bytes"], 4998)
+        self.assertEqual(report["failed_deletes"], ["scratch/7.tmp"])
+        with self.assertRaises(ParameterError):
+            handler.delete_prefix("")
+
+    def test_tos_handler_delete_prefix_keeps_siblings_sharing_the_stem(self):
+        client = MagicMock()
+        handler = _tos_handler(client)
+        keys = ["analysis/abc/", "analysis/abc/x.txt", "analysis/abcd/y.txt", "analysis/abc.txt"]
+
+        def list_objects(bucket, prefix, **kwargs):
+            return SimpleNamespace(
+                contents=[SimpleNamespace(key=k, size=1) for k in keys if k.startswith(prefix)],
+                is_truncated=False, next_marker=None)
+
+        client.list_objects.side_effect = list_objects
+        client.delete_multi_objects.return_value = SimpleNamespace(error=[])
+
+        report = handler.delete_prefix("/analysis/abc")
+
+        deleted = [obj.key for call in client.delete_multi_objects.call_args_list
+                   for obj in call.kwargs["objects"]]
+        self.assertEqual(sorted(deleted), ["analysis/abc/", "analysis/abc/x.txt"])
+        self.assertEqual(report["prefix"], "analysis/abc/")
+        with self.assertRaises(ParameterError):
+            handler.delete_prefix("/")
+
+    def test_file_resource_delete_succeeds_when_nothing_matches(self):
+        resource = FileResource.__new__(FileResource)
+        resource.tos_handler = _tos_handler()
+
+        self.assertEqual(resource.tos_handler.delete_objects([]), [])
+        self.assertTrue(resource.delete([]))
+        self.assertEqual(resource.tos_handler.delete_objects(["a.log"], ignore=r".*\.log"), [])
+        resource.tos_handler._client.delete_multi_objects.assert_not_called()
+
+    def test_file_filter_matches_globs_paths_and_predicates(self):
+        flt = FileFilter(include_globs=["**/*.bam", "call-*/**/*.vcf.gz"],
+                         ignore_globs="**/tmp_*",
+                         min_size=10,
+                         modified_after=datetime.datetime(2024, 1, 1),
+                         match_path=True)
+        recent = datetime.datetime(2024, 6, 1)
+        self.assertTrue(flt.matches("a/b/x.bam", 10, recent))
+        self.assertTrue(flt.matches("call-gatk/shard-0/out.vcf.gz", 10, recent))
+        self.assertTrue(flt.matches("call-gatk/out.vcf.gz", 10, recent))
+        self.assertFalse(flt.matches("sub/call-gatk/out.vcf.gz", 10, recent))
+        self.assertFalse(flt.matches("a/tmp_x.bam", 10, recent))
+        self.assertFalse(flt.matches("x.bam", 9, recent))
+        self.assertFalse(flt.matches("x.bam", 10, datetime.datetime(2023, 1, 1)))
+        self.assertFalse(flt.matches("x.bam"))
+        # without match_path a "/" in a pattern does not switch to the path
+        by_name = FileFilter(include=[r"[^/]+\.bam", r"(?i).*\.CRAM"])
+        self.assertTrue(by_name.matches("a/b/x.bam"))
+        self.assertTrue(by_name.matches("a/y.cram"))
+        self.assertFalse(by_name.matches("a/y.txt"))
+        # legacy regexes keep matching the file name only
+        legacy = FileFilter.build(include=r"[^/]+\.txt")
+        self.assertTrue(legacy.matches("dir/a.txt"))
+        with self.assertRaises(ValueError):
+            FileFilter.build(flt, include=r".*")
+
+    def test_tos_handler_applies_file_filter_relative_to_roots(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            for rel, size in [("keep/a.fq", 5), ("keep/b.fq", 50), ("skip/c.fq", 50)]:
+                path = Path(tmpdir) / rel
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"x" * size)
+            handler = _tos_handler()
+            flt = FileFilter(include_globs="keep/*.fq", min_size=10, match_path=True)
+
+            plan = handler.build_upload_plan([tmpdir], "in/", flatten=False, file_filter=flt)
+
+        self.assertEqual([Path(item["source"]).name for item in plan], ["b.fq"])
+
+        listing = [SimpleNamespace(key="out/keep/a.fq", size=50),
+                   SimpleNamespace(key="out/skip/a.fq", size=50)]
+        handler._client.delete_multi_objects.return_value = SimpleNamespace(error=[])
+        with patch.object(handler, "iter_objects", side_effect=lambda prefix: iter(listing)):
+            report = handler.delete_prefix("out/", file_filter=flt, dry_run=True)
+        self.assertEqual(report["matched_count"], 1)
+
+    def test_remote_file_reads_seeks_and_caches_blocks(self):
+        data = gzip.compress(b"".join(f"line {i}\n".encode() for i in range(2000)))
+        client = MagicMock()
+        client.get_object.side_effect = lambda bucket, key, range_start, range_end: io.BytesIO(
+            data[range_start:range_end + 1])
+        handler = _tos_handler(client)
+
+        with handler.open_object("calls.gz", size=len(data), block_size=64, read_ahead=2,
+                                 cache_blocks=4) as f:
+            self.assertTrue(f.seekable())
+            with gzip.GzipFile(fileobj=f) as gz:
+                self.assertEqual(gz.readline(), b"line 0\n")
+            f.seek(-5, io.SEEK_END)
+            self.assertEqual(f.read(), data[-5:])
+            requested = client.get_object.call_count
+            f.seek(-5, io.SEEK_END)
+            self.assertEqual(f.read(3), data[-5:-2])
+            # the tail block is still cached
+            self.assertEqual(client.get_object.call_count, requested)
+            f.seek(0)
+            self.assertEqual(f.read(), data)
+            self.assertLessEqual(len(f._cache), 4)
+
+        client.get_object.side_effect = tos.exceptions.TosServerError(
+            SimpleNamespace(status=416, headers={}, request_id="r"), "", "InvalidRange", "", "")
+        self.assertEqual(handler.read_object_range("empty.txt", 0, 10), b"")
+
+    def test_tos_handler_upload_fileobj_streams_parts_of_unknown_size(self):
+        client = MagicMock()
+        client.create_multipart_upload.return_value = SimpleNamespace(upload_id="uid")
+        client.upload_part.side_effect = lambda **kwargs: SimpleNamespace(etag=f"e{kwargs['part_number']}")
+        handler = _tos_handler(client)
+
+        with patch("bioos.internal.tos.STREAM_PART_SIZE", 4):
+            handler.upload_fileobj("out/stream.txt", io.BytesIO(b"abcdefghij"), task_num=2)
+            handler.upload_fileobj("out/small.txt", io.BytesIO(b"abc"))
+
+        sent = {call.kwargs["part_number"]: call.kwargs["content"] for call in client.upload_part.call_args_list}
+        self.assertEqual(sent, {1: b"abcd", 2: b"efgh", 3: b"ij"})
+        completed = client.complete_multipart_upload.call_args.kwargs
+        self.assertEqual([(part.part_number, part.etag) for part in completed["parts"]],
+                         [(1, "e1"), (2, "e2"), (3, "e3")])
+        client.put_object.assert_called_once_with(bucket="bucket", key="out/small.txt", content=b"abc")
+
+    def test_tos_handler_put_bytes_sends_large_payload_as_slices(self):
+        client = MagicMock()
+        client.create_multipart_upload.return_value = SimpleNamespace(upload_id="uid")
+        sent = {}
+
+        def upload_part(**kwargs):
+            content = kwargs["content"]
+            first = content.read(3)
+            content.reset()  # a retried part is sent again from its start
+            sent[kwargs["part_number"]] = (first, content.read())
+            return SimpleNamespace(etag="e")
+
+        client.upload_part.side_effect = upload_part
+        handler = _tos_handler(client)
+        data = b"abcdefghij"
+
+        with patch("bioos.internal.tos.SIMPLE_UPLOAD_LIMITATION", 4), \
+                patch("bioos.internal.tos.MIN_PART_SIZE", 4):
+            handler.put_bytes("out/blob.bin", data)
+
+        self.assertEqual(sorted(sent), [1, 2, 3])
+        self.assertEqual(b"".join(bytes(sent[n][1]) for n in sorted(sent)), data)
+        self.assertEqual(bytes(sent[1][0]), b"abc")
+        # every part is a view of the caller's payload, not a copy
+        self.assertTrue(all(sent[n][1].obj is data for n in sent))
+        client.put_object.assert_not_called()
+
+    def test_file_resource_write_table_serializes_in_memory(self):
+        resource = FileResource.__new__(FileResource)
+        resource.bucket = "bioos-wid"
+        resource.tos_handler = _tos_handler(bucket="bioos-wid")
+        df = pd.DataFrame({"sample": ["s1", "s2"], "reads": [10, 20]})
+
+        url = resource.write_table("results/summary.tsv.gz", df, format="tsv")
+
+        self.assertEqual(url, "s3://bioos-wid/results/summary.tsv.gz")
+        written = bytes(resource.tos_handler._client.put_object.call_args.kwargs["content"].read())
+        self.assertEqual(gzip.decompress(written).decode(), "sample\treads\ns1\t10\ns2\t20\n")
+        with self.assertRaises(ParameterError):
+            resource.write_table("results/summary.xlsx", df, format="xlsx")
+
+    def test_file_resource_write_table_uploads_large_tables_from_the_buffer(self):
+        resource = FileResource.__new__(FileResource)
+        resource.bucket = "bioos-wid"
+        client = MagicMock()
+        client.create_multipart_upload.return_value = SimpleNamespace(upload_id="uid")
+        sent = {}
+        client.upload_part.side_effect = lambda **kwargs: sent.setdefault(
+            kwargs["part_number"], bytes(kwargs["content"].read())) and SimpleNamespace(etag="e")
+        resource.tos_handler = _tos_handler(client, bucket="bioos-wid")
+        df = pd.DataFrame({"sample": [f"s{i}" for i in range(50)], "reads": range(50)})
+
+        with patch("bioos.internal.tos.SIMPLE_UPLOAD_LIMITATION", 64), \
+                patch("bioos.internal.tos.MIN_PART_SIZE", 64), \
+                patch.object(resource.tos_handler, "upload_fileobj") as upload_fileobj, \
+                patch.object(resource.tos_handler, "put_bytes",
+                             wraps=resource.tos_handler.put_bytes) as put_bytes:
+            resource.write_table("results/big.csv", df)
+
+        upload_fileobj.assert_not_called()
+        self.assertIsInstance(put_bytes.call_args.args[1], memoryview)
+        self.assertGreater(len(sent), 1)
+        self.assertEqual(b"".join(sent[n] for n in sorted(sent)).decode(),
+                         df.to_csv(index=False))
+
+    def test_file_resource_read_table_streams_compressed_chunks(self):
+        rows = "".join(f"g{i}\t{i}\tx\n" for i in range(10))
+        data = gzip.compress(("gene\tcount\tnote\n" + rows).encode())
+        client = MagicMock()
+        client.head_object.return_value = SimpleNamespace(content_length=len(data))
+        client.get_object.side_effect = lambda bucket, key, range_start, range_end: io.BytesIO(
+            data[range_start:range_end + 1])
+        resource = FileResource.__new__(FileResource)
+        resource.bucket = "bioos-wid"
+        resource.tos_handler = _tos_handler(client, bucket="bioos-wid")
+
+        chunks = list(resource.read_table("s3://bioos-wid/counts.tsv.gz", chunksize=4,
+                                          columns=["gene", "count"], block_size=16))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 2])
+        self.assertEqual(list(chunks[0].columns), ["gene", "count"])
+        self.assertEqual(int(pd.concat(chunks)["count"].sum()), 45)
+        self.assertGreater(client.get_object.call_count, 1)
+
+    def test_tos_handler_sync_directory_uploads_only_changed_files(self):
+        handler = _tos_handler()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (Path(tmpdir) / "same.txt").write_text("same", encoding="utf-8")
+            (Path(tmpdir) / "edited.txt").write_text("new!", encoding="utf-8")
+            (Path(tmpdir) / "sub").mkdir()
+            (Path(tmpdir) / "sub" / "added.txt").write_text("added", encoding="utf-8")
+            remote = [
+                SimpleNamespace(key="ref/same.txt", size=4,
+                                hash_crc64_ecma=tos_internal.file_crc64(str(Path(tmpdir) / "same.txt"))),
+                SimpleNamespace(key="ref/edited.txt", size=4, hash_crc64_ecma=1),
+                SimpleNamespace(key="ref/stale.txt", size=9, hash_crc64_ecma=2),
+            ]
+            with patch.object(handler, "iter_objects", side_effect=lambda prefix: iter(remote)) as iter_objects, \
+                    patch.object(handler, "upload_planned_objects", return_value=[]) as upload, \
+                    patch.object(handler, "delete_objects", return_value=[]) as delete:
+                dry_run = handler.sync_directory(tmpdir, "ref/", delete=True, dry_run=True)
+                upload.assert_not_called()
+                delete.assert_not_called()
+                report = handler.sync_directory(tmpdir, "ref/", delete=True, task_num=2)
+
+        iter_objects.assert_called_with("ref/")
+        self.assertEqual(dry_run["upload_bytes"], 9)
+        self.assertEqual(dry_run["delete_bytes"], 9)
+        self.assertEqual(dry_run["unchanged_count"], 1)
+        self.assertEqual(
+            sorted((item["key"], item["reason"]) for item in dry_run["uploads"]),
+            [("ref/edited.txt", "changed"), ("ref/sub/added.txt", "new")],
+        )
+        self.assertEqual(
+            sorted(item["key"] for item in upload.call_args.kwargs["upload_plan"]),
+            ["ref/edited.txt", "ref/sub/added.txt"],
+        )
+        delete.assert_called_once_with(["ref/stale.txt"])
+        self.assertEqual(report["failed_uploads"], [])
+
+    def test_upload_manifest_skips_rehashing_unchanged_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local = Path(tmpdir) / "a.bam"
+            local.write_bytes(b"reads")
+            manifest = UploadManifest(str(Path(tmpdir) / "manifest.sqlite3"))
+            compute = MagicMock(return_value=2 ** 63 + 5)
+
+            self.assertEqual(manifest.crc64(str(local), compute), 2 ** 63 + 5)
+            self.assertEqual(manifest.crc64(str(local), compute), 2 ** 63 + 5)
+            compute.assert_called_once_with(str(local))
+
+            manifest.record_upload(str(local), "bucket", "input/a.bam")
+            self.assertEqual(manifest.lookup(str(local)),
+                             {"crc64": 2 ** 63 + 5, "bucket": "bucket", "key": "input/a.bam"})
+
+            local.write_bytes(b"reads, but more")
+            self.assertIsNone(manifest.lookup(str(local)))
+            manifest.crc64(str(local), compute)
+            self.assertEqual(compute.call_count, 2)
+            manifest.close()
+
+    def test_upload_manifest_batches_commits_until_flushed(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = str(Path(tmpdir) / "manifest.sqlite3")
+            files = []
+            for i in range(3):
+                local = Path(tmpdir) / f"{i}.bam"
+                local.write_bytes(b"reads")
+                files.append(str(local))
+            manifest = UploadManifest(path, commit_every=2)
+            reader = UploadManifest(path)
+            for file_path in files:
+                manifest.crc64(file_path, lambda _: 7)
+
+            self.assertEqual(reader.lookup(files[1])["crc64"], 7)
+            self.assertIsNone(reader.lookup(files[2]))
+            manifest.flush()
+            self.assertEqual(reader.lookup(files[2])["crc64"], 7)
+            manifest.close()
+            reader.close()
+
+    def test_tos_handler_computes_crc_without_a_broken_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local = Path(tmpdir) / "a.txt"
+            local.write_text("a", encoding="utf-8")
+            manifest = UploadManifest(str(Path(tmpdir) / "manifest.sqlite3"))
+            handler = _tos_handler(manifest=manifest)
+            with patch.object(manifest, "lookup", side_effect=sqlite3.OperationalError("locked")):
+                expected = handler.local_crc64(str(local))
+                self.assertFalse(handler.local_file_changed(str(local), {"hash_crc64_ecma": 1}))
+            with patch.object(manifest, "lookup", return_value=None), \
+                    patch.object(manifest, "_upsert", side_effect=sqlite3.OperationalError("locked")):
+                self.assertEqual(handler.local_crc64(str(local)), expected)
+            with self.assertRaises(sqlite3.OperationalError), \
+                    patch.object(manifest, "lookup", side_effect=sqlite3.OperationalError("locked")):
+                manifest.crc64(str(local), lambda _: 1)
+
+            self.assertEqual(handler._warn_logging.call_count, 3)
+            manifest.close()
+
+    def test_tos_handler_opens_manifest_lazily_at_configured_path(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "nested" / "manifest.sqlite3"
+            with patch.dict("os.environ", {manifest_internal.UPLOAD_MANIFEST_PATH_ENV: str(path)}):
+                handler = _tos_handler(manifest_path=manifest_internal.get_manifest_path())
+            self.assertFalse(path.exists())
+
+            local = Path(tmpdir) / "a.txt"
+            local.write_text("a", encoding="utf-8")
+            handler.local_crc64(str(local))
+            self.assertTrue(path.exists())
+            self.assertIs(handler.manifest, handler.manifest)
+            handler.manifest.close()
+
+    def test_tos_handler_records_server_crc_in_manifest(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local = Path(tmpdir) / "a.txt"
+            local.write_text("a", encoding="utf-8")
+            handler = _tos_handler(manifest=UploadManifest(str(Path(tmpdir) / "manifest.sqlite3")))
+            handler._client.put_object_from_file.return_value = SimpleNamespace(hash_crc64_ecma="42")
+
+            failed = handler.upload_planned_objects([{"source": str(local), "key": "in/a.txt"}])
+
+            self.assertEqual(failed, [])
+            self.assertEqual(handler.local_crc64(str(local)), 42)
+            self.assertTrue(handler.local_file_changed(str(local), {"hash_crc64_ecma": 7}))
+            self.assertFalse(handler.local_file_changed(str(local), {"hash_crc64_ecma": "42"}))
+            handler.manifest.close()
+
+    def test_tos_handler_iter_objects_streams_pages(self):
+        handler = _tos_handler()
+        handler._client.list_objects.side_effect = [
+            SimpleNamespace(contents=[SimpleNamespace(key="a"), SimpleNamespace(key="b")],
+                            is_truncated=True, next_marker="b"),
+            SimpleNamespace(contents=[SimpleNamespace(key="c")],
+                            is_truncated=False, next_marker=None),
+        ]
+
+        objects = handler.iter_objects("p/", page_size=2)
+        self.assertEqual(next(objects).key, "a")
+        self.assertEqual(handler._client.list_objects.call_count, 1)
+        self.assertEqual([o.key for o in objects], ["b", "c"])
+        handler._client.list_objects.assert_called_with(
+            bucket="bucket", prefix="p/", marker="b", max_keys=2)
+
+    def test_file_resource_list_stops_at_limit(self):
+        resource = FileResource.__new__(FileResource)
+        resource.bucket = "bioos-wid"
+        resource.tos_handler = MagicMock()
+        pulled = []
+
+        def objects(prefix):
+            for name in ["a.txt", "b.txt", "c.txt"]:
+                pulled.append(name)
+                yield SimpleNamespace(key=prefix + name, last_modified=None, size=1,
+                                      owner=SimpleNamespace(display_name="u"))
+
+        resource.tos_handler.iter_objects.side_effect = objects
+        resource.tos_handler.presign_download_url.return_value = "https://signed"
+
+        df = resource.list(prefix="out", recursive=True, limit=2)
+
+        self.assertEqual(list(df["key"]), ["out/a.txt", "out/b.txt"])
+        self.assertEqual(pulled, ["a.txt", "b.txt"])
+
+    def test_file_resource_list_signs_urls_only_when_asked_and_caches_them(self):
+        resource = FileResource.__new__(FileResource)
+        resource.bucket = "bioos-wid"
+        resource.tos_handler = MagicMock()
+        resource.tos_handler.iter_objects.side_effect = lambda prefix: iter([
+            SimpleNamespace(key="out/a.txt", last_modified=None, size=1,
+                            owner=SimpleNamespace(display_name="u")),
+            SimpleNamespace(key="out/sub/b.txt", last_modified=None, size=2,
+                            owner=SimpleNamespace(display_name="u")),
+        ])
+        resource.tos_handler.iter_children.side_effect = lambda prefix: iter([
+            SimpleNamespace(key="out/a.txt", last_modified=None, size=1,
+                            owner=SimpleNamespace(display_name="u")),
+            "out/sub/",
+        ])
+        resource.tos_handler.presign_download_urls.side_effect = \
+            lambda keys, duration: [f"https://signed/{key}" for key in keys]
+
+        recursive = resource.list(prefix="out", recursive=True)
+        self.assertEqual(list(recursive["https_url"]), [None, None])
+        resource.tos_handler.presign_download_urls.assert_not_called()
+
+        listed = resource.list(prefix="out")
+        self.assertEqual(listed["https_url"][0], "https://signed/out/a.txt")
+        self.assertEqual(list(listed["key"]), ["out/a.txt", "out/sub/"])
+        self.assertTrue(listed["https_url"].isna()[1])
+        resource.tos_handler.presign_download_urls.assert_called_once_with(
+            ["out/a.txt"], FileResource.DEFAULT_PRE_SIGNED_TIME)
+        resource.tos_handler.presign_download_url.assert_not_called()
+
+        # listing again inside the presign window reuses the signed URL
+        self.assertEqual(resource.list(prefix="out")["https_url"][0], "https://signed/out/a.txt")
+        self.assertEqual(resource.tos_handler.presign_download_urls.call_count, 1)
+        now = [0.0]
+        resource._https_url_cache_store = TTLCache(
+            maxsize=10, ttl=FileResource.DEFAULT_PRE_SIGNED_TIME - FileResource.PRE_SIGNED_URL_CACHE_MARGIN,
+            timer=lambda: now[0])
+        resource.https_urls(["out/a.txt", "out/a.txt"])
+        now[0] += FileResource.DEFAULT_PRE_SIGNED_TIME - FileResource.PRE_SIGNED_URL_CACHE_MARGIN
+        resource.https_urls("out/a.txt")
+        self.assertEqual(resource.tos_handler.presign_download_urls.call_args_list[1:],
+                         [call(["out/a.txt"], FileResource.DEFAULT_PRE_SIGNED_TIME)] * 2)
+
+    def test_tos_handler_batch_presign_matches_sdk_signature(self):
+        class FixedDatetime(datetime.datetime):
+            @classmethod
+            def utcnow(cls):
+                return datetime.datetime(2026, 1, 2, 3, 4, 5)
+
+        keys = ["out/a b+c~é.txt", "out/sub/b.bam", "top"]
+        # the batch signer mirrors the SDK's V4 query signing, so it is pinned
+        # to TosClientV2.pre_signed_url for the same keys and time
+        for endpoint, token in [("https://tos-cn-beijing.volces.com", "sts-token"),
+                                ("http://tos-cn-guangzhou.volces.com", None)]:
+            with self.subTest(endpoint=endpoint):
+                client = tos.TosClientV2("ak", "sk", endpoint, "cn-beijing",
+                                         security_token=token)
+                handler = _tos_handler(client, bucket="bioos-wid")
+                with patch("tos.auth.datetime.datetime", FixedDatetime), \
+                        patch("bioos.internal.tos.datetime.datetime", FixedDatetime), \
+                        patch.object(client.auth.credentials_provider, "get_credentials",
+                                     wraps=client.auth.credentials_provider.get_credentials) as credentials:
+                    batch = handler.presign_download_urls(keys, 900)
+                    self.assertEqual(credentials.call_count, 1)
+                    sdk = [client.pre_signed_url(tos.HttpMethodType.Http_Method_Get, "bioos-wid",
+                                                 key, 900).signed_url for key in keys]
+                self.assertEqual(batch, sdk)
+        self.assertEqual(handler.presign_download_urls([], 900), [])
+
+    def test_tos_handler_walk_descends_with_delimiter_listing(self):
+        handler = _tos_handler()
+        levels = {
+            "root/": SimpleNamespace(contents=[SimpleNamespace(key="root/"), SimpleNamespace(key="root/a.txt")],
+                                     common_prefixes=[SimpleNamespace(prefix="root/x/"),
+                                                      SimpleNamespace(prefix="root/skip/")],
+                                     is_truncated=False, next_marker=None),
+            "root/x/": SimpleNamespace(contents=[SimpleNamespace(key="root/x/b.txt")],
+                                       common_prefixes=[], is_truncated=False, next_marker=None),
+        }
+        handler._client.list_objects.side_effect = lambda **kwargs: levels[kwargs["prefix"]]
+
+        seen = []
+        for prefix, dirs, files in handler.walk("root/"):
+            dirs[:] = [d for d in dirs if d != "root/skip/"]
+            seen.append((prefix, list(dirs), [f.key for f in files]))
+
+        self.assertEqual(seen, [
+            ("root/", ["root/x/"], ["root/a.txt"]),
+            ("root/x/", [], ["root/x/b.txt"]),
+        ])
+        for call in handler._client.list_objects.call_args_list:
+            self.assertEqual(call.kwargs["delimiter"], "/")
+
+    def test_tos_handler_iter_objects_parallel_merges_shards_in_key_order(self):
+        keys = sorted(["analysis/b.txt", "analysis/a/1", "analysis/a/2", "analysis/c/x/1",
+                       "analysis/c/x/2", "analysis/c/y/1", "analysis/c/z/1", "analysis/c/z.txt"])
+
+        def list_objects(bucket, prefix, marker=None, max_keys=1000, delimiter=None):
+            listed = [key for key in keys if key.startswith(prefix) and (marker is None or key > marker)]
+            contents, prefixes = [], []
+            for key in listed:
+                cut = key.find(delimiter, len(prefix)) if delimiter else -1
+                if cut < 0:
+                    contents.append(SimpleNamespace(key=key))
+                elif key[:cut + 1] not in prefixes:
+                    prefixes.append(key[:cut + 1])
+            # one object per page, so every shard follows its marker chain
+            truncated = len(contents) > 1 and not delimiter
+            return SimpleNamespace(
+                contents=contents[:1] if truncated else contents,
+                common_prefixes=[SimpleNamespace(prefix=p) for p in prefixes],
+                is_truncated=truncated,
+                next_marker=contents[0].key if truncated else None,
+            )
+
+        handler = _tos_handler()
+        handler._client.list_objects.side_effect = list_objects
+
+        with patch.object(tos_internal, "PARALLEL_LIST_BUFFER_PAGES", 1):
+            ordered = [o.key for o in handler.iter_objects_parallel("analysis/", workers=2)]
+            unordered = [o.key for o in handler.iter_objects_parallel("analysis/", ordered=False)]
+            # two first-level directories do not fill three workers, so analysis/c/ is split
+            deep = [o.key for o in handler.iter_objects_parallel("analysis/", workers=3)]
+            stopped = handler.iter_objects_parallel("analysis/", workers=3)
+            self.assertEqual(next(stopped).key, "analysis/a/1")
+            stopped.close()
+
+        self.assertEqual(ordered, keys)
+        self.assertEqual(sorted(unordered), keys)
+        self.assertEqual(deep, keys)
+        shard_prefixes = {c.kwargs["prefix"] for c in handler._client.list_objects.call_args_list
+                          if c.kwargs.get("delimiter") is None}
+        self.assertIn("analysis/c/x/", shard_prefixes)
+
+    def test_tos_handler_download_resumes_from_checkpoint_on_retry(self):
+        handler = _tos_handler()
+        handler._client.download_file.side_effect = [RuntimeError("reset"), None]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            failed = handler.download_objects(
+                ["big.cram"], tmpdir, True, sizes={"big.cram": 10},
+                checkpoint_dir=str(Path(tmpdir) / "ckpt"), max_retries=1)
+
+        self.assertEqual(failed, [])
+        first, second = handler._client.download_file.call_args_list
+        self.assertTrue(first.kwargs["enable_checkpoint"])
+        self.assertTrue(first.kwargs["checkpoint_file"].endswith(".download.ckpt"))
+        self.assertEqual(first.kwargs["checkpoint_file"], second.kwargs["checkpoint_file"])
+
+    def test_transfer_progress_reports_rate_eta_and_summary(self):
+        now = [0.0]
+        events = []
+        progress = TransferProgress(events.append, interval=1.0, clock=lambda: now[0])
+        progress.batch_started("upload", 1, 100)
+        progress.file_started("a.bin", 100)
+        listener = progress.data_listener("a.bin")
+
+        now[0] = 2.0
+        listener(40, 100, 40, DataTransferType.Data_Transfer_RW)
+        now[0] = 2.5
+        listener(50, 100, 10, DataTransferType.Data_Transfer_RW)
+        progress.part_listener("a.bin")(
+            UploadEventType.Upload_Event_Upload_Part_Succeed, None, "bucket", "a.bin",
+            "upload-id", "a.bin", None, SimpleNamespace(part_number=1, part_size=50))
+        progress.file_retry("a.bin", 1, RuntimeError("reset"))
+        now[0] = 5.0
+        progress.file_finished("a.bin", "succeeded")
+        summary = progress.finish()
+
+        kinds = [event["event"] for event in events]
+        # the second data callback falls inside the emit interval
+        self.assertEqual(kinds, ["batch_started", "file_started", "progress", "part_completed",
+                                 "file_retry", "file_finished", "batch_finished"])
+        self.assertEqual(events[2]["bytes_per_sec"], 20.0)
+        self.assertEqual(events[2]["eta_seconds"], 3.0)
+        self.assertEqual(events[3]["part_number"], 1)
+        self.assertEqual(summary["bytes"], 100)
+        self.assertEqual(summary["bytes_per_sec"], 20.0)
+        self.assertEqual(summary["retries"], 1)
+        self.assertEqual(summary["statuses"], {"succeeded": 1})
+
+    def test_tos_handler_upload_reports_progress_for_small_files(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            local_file = Path(tmpdir) / "a.txt"
+            local_file.write_bytes(b"x" * 10)
+            client = MagicMock()
+            client.put_object_from_file.side_effect = [RuntimeError("reset"), MagicMock()]
+            handler = _tos_handler(client)
+            events = []
+
+            failed = handler.upload_planned_objects(
+                [{"source": str(local_file), "key": "target/a.txt"}],
+                max_retries=1, progress=TransferProgress(events.append))
+
+        self.assertEqual(failed, [])
+        self.assertIsNotNone(client.put_object_from_file.call_args.kwargs["data_transfer_listener"])
+        finished = [event for event in events if event["event"] == "file_finished"]
+        self.assertEqual(finished[0]["retries"], 1)
+        self.assertEqual(events[-1]["event"], "batch_finished")
+        self.assertEqual(events[-1]["bytes"], 10)
+
+    def test_tos_credential_manager_reuses_initial_token_and_coalesces_refresh(self):
+        now = [datetime.datetime(2026, 1, 1, 12, 0).timestamp()]
+        fetched = threading.Event()
+        release = threading.Event()
+
+        def payload(token, hour):
+            return {"AccessKey": "ak", "SecretKey": "sk", "SessionToken": token,
+                    "ExpiredTime": datetime.datetime(2026, 1, 1, hour, 0).isoformat()}
+
+        def fetch():
+            fetched.set()
+            release.wait(5)
+            return payload("token-2", 15)
+
+        fetch_mock = MagicMock(side_effect=fetch)
+        manager = TosCredentialManager(fetch_mock, initial=payload("token-1", 13),
+                                       refresh_margin=0, clock=lambda: now[0])
+        try:
+            self.assertEqual(manager.get_credentials().get_security_token(), "token-1")
+            fetch_mock.assert_not_called()
+
+            now[0] += 2 * 3600
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                futures = [executor.submit(manager.get_credentials) for _ in range(4)]
+                fetched.wait(5)
+                release.set()
+                tokens = {future.result().get_security_token() for future in futures}
+            self.assertEqual(tokens, {"token-2"})
+            self.assertEqual(fetch_mock.call_count, 1)
+        finally:
+            manager.close()
+
+    def test_tos_credential_manager_stops_background_refresh(self):
+        fetch_mock = MagicMock(side_effect=RuntimeError("denied"))
+        manager = TosCredentialManager(fetch_mock, max_failures=2)
+        with patch("bioos.internal.credentials.threading.Timer") as timer_mock:
+            manager._refresh_in_background()
+            self.assertEqual(timer_mock.call_count, 1)
+            # the second failure in a row gives up instead of rescheduling
+            manager._refresh_in_background()
+            self.assertEqual(timer_mock.call_count, 1)
+
+            manager.close()
+            manager._schedule(1)
+            timer_mock.return_value.start.assert_called_once()
+
+        # a pending timer does not keep an unused manager alive
+        manager = TosCredentialManager(fetch_mock)
+        manager._schedule(3600)
+        timer = manager._timer
+        manager_ref = weakref.ref(manager)
+        del manager
+        gc.collect()
+        self.assertIsNone(manager_ref())
+        self.assertTrue(timer.finished.is_set())
+
+    def test_tos_credential_manager_registry_releases_unused_managers(self):
+        expires = (datetime.datetime.now() + datetime.timedelta(hours=2)).isoformat()
+        initial = {"AccessKey": "ak", "SecretKey": "sk", "SessionToken": "token",
+                   "ExpiredTime": expires}
+        login_info = SimpleNamespace(endpoint="https://bioos", access_key="ak")
+        with patch("bioos.internal.credentials.Config.login_info", return_value=login_info):
+            manager = TosCredentialManager.for_workspace("wid-weak", initial=initial)
+            self.assertIs(TosCredentialManager.for_workspace("wid-weak"), manager)
+        timer = manager._timer
+        self.assertTrue(timer.is_alive())
+        manager_ref = weakref.ref(manager)
+
+        del manager
+        gc.collect()
+
+        self.assertIsNone(manager_ref())
+        self.assertNotIn(("https://bioos", "ak", "wid-weak"), TosCredentialManager._instances)
+        timer.join(5)
+        self.assertFalse(timer.is_alive())
+
+    def test_transfer_autotuner_climbs_backs_off_and_remembers_best(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            now = [0.0]
+            state_path = str(Path(tmpdir) / "tuning.json")
+            tuner = TransferAutotuner("https://tos", state_path=state_path,
+                                      initial_task_num=8, clock=lambda: now[0])
+
+            for throughput in (100, 200, 150):
+                now[0] += tuner.WINDOW_SECONDS
+                tuner.record(throughput * tuner.WINDOW_SECONDS, 1.0)
+            # 8 -> 10 -> 12 while improving, then back off to 9 on the drop
+            self.assertEqual(tuner.task_num, 9)
+
+            tuner.record(64 * 1024 * 1024, 1.0, parts=8, threads=8)
+            self.assertEqual(tuner.part_size, 10 * 1024 * 1024)
+
+            tuner.save()
+            remembered = TransferAutotuner("https://tos", state_path=state_path)
+            self.assertEqual(remembered.task_num, 10)
+            self.assertEqual(json.loads(Path(state_path).read_text())["https://tos"]["throughput"], 200)
+
+    def test_tos_handler_feeds_finished_parts_to_the_autotuner(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            now = [0.0]
+            part_size = 64 * 1024 * 1024
+            tuner = TransferAutotuner("https://tos", state_path=str(Path(tmpdir) / "tuning.json"),
+                                      initial_task_num=8, min_part_size=part_size,
+                                      clock=lambda: now[0])
+            budget = tos_internal._TransferBudget(tuner.task_num)
+            handler = _tos_handler()
+            fsize = 4 * part_size
+            during = []
+
+            def upload_file(**kwargs):
+                listener = kwargs["upload_event_listener"]
+                for number in range(1, 5):
+                    now[0] += tuner.WINDOW_SECONDS
+                    part = tos.models2.PartInfo(number, part_size, (number - 1) * part_size,
+                                                "etag", None, True)
+                    listener(UploadEventType.Upload_Event_Upload_Part_Succeed, None, "bucket",
+                             "big.bin", "upload-id", "big.bin", None, part)
+                    during.append(tuner.task_num)
+                return SimpleNamespace(hash_crc64_ecma=None)
+
+            handler._client.upload_file.side_effect = upload_file
+            with patch.object(tuner, "record", wraps=tuner.record) as record:
+                self.assertTrue(handler._upload_planned_item(
+                    budget, "big.bin", "big.bin", fsize, "", 0, 64, autotuner=tuner))
+
+        # the first part already closes a window, before the file is done
+        self.assertEqual(during, [10, 10, 10, 10])
+        self.assertEqual([c.args[0] for c in record.call_args_list], [part_size] * 4 + [0])
+        self.assertEqual(record.call_args_list[-1].args[2], 4)
+
+    def test_tos_handler_transfer_budget_resizes(self):
+        budget = tos_internal._TransferBudget(4)
+        self.assertEqual(budget.acquire(4), 4)
+        budget.resize(2)
+        budget.release(3)
+        self.assertEqual(budget.acquire(4), 1)
+        budget.resize(5)
+        self.assertEqual(budget.acquire(5), 3)
+
+    def test_tos_handler_transfer_budget_is_shared(self):
+        budget = tos_internal._TransferBudget(4)
+
+        self.assertEqual(budget.acquire(3), 3)
+        self.assertEqual(budget.acquire(3), 1)
+        budget.release(3)
+        self.assertEqual(budget.acquire(1), 1)
+        self.assertEqual(budget.acquire(10), 2)
+
     def test_file_resource_upload_accepts_directory(self):
         with tempfile.TemporaryDirectory() as tmpdir:
             root = Path(tmpdir) / "data"
@@ -451,7 +1413,7 @@ class TestOpsHelpers(unittest.TestCase):
             local_file.write_text("a", encoding="utf-8")
 
             resource = FileResource.__new__(FileResource)
-            resource.tos_handler = TOSHandler(client=MagicMock(), bucket="bucket")
+            resource.tos_handler = _tos_handler()
             resource.tos_handler.upload_planned_objects = MagicMock(return_value=[])
 
             success = resource.upload(
@@ -470,6 +1432,8 @@ class TestOpsHelpers(unittest.TestCase):
             checkpoint_dir="",
             max_retries=3,
             task_num=10,
+            autotuner=None,
+            progress=None,
         )
 
     def test_file_resource_download_accepts_workspace_s3_url(self):
@@ -489,6 +1453,13 @@ class TestOpsHelpers(unittest.TestCase):
             ["input_provision/a.txt"],
             "/tmp/out",
             False,
+            sizes=None,
+            task_num=10,
+            checkpoint_dir="",
+            max_retries=3,
+            autotuner=None,
+            progress=None,
+            file_filter=None,
         )
 
     def test_file_resource_download_rejects_other_workspace_s3_url(self):
@@ -523,6 +1494,13 @@ class TestOpsHelpers(unittest.TestCase):
             ["input_provision/a.txt"],
             "/tmp/out",
             True,
+            sizes=None,
+            task_num=10,
+            checkpoint_dir="",
+            max_retries=3,
+            autotuner=None,
+            progress=None,
+            file_filter=None,
         )
 
     def test_repository_passport_provider_caches_token(self):
@@ -1182,6 +2160,248 @@ class TestOpsHelpers(unittest.TestCase):
             }
         )
 
+    def test_submission_monitor_polls_adaptively_and_reports_finished_runs(self):
+        interval = AdaptivePollInterval(min_interval=10, max_interval=40, backoff=2,
+                                        jitter=0.5, rng=lambda: 0.5)
+        self.assertEqual(interval.next(False, ["Running"]), 20)
+        self.assertEqual(interval.next(False, ["Running"]), 40)
+        self.assertEqual(interval.next(False, ["Running"]), 40)
+        self.assertEqual(interval.next(False, ["Pending", "Running"]), 10)
+
+        snapshots = {
+            "s1": iter([[{"ID": "a", "Status": "Pending"}],
+                        [{"ID": "a", "Status": "Running"}],
+                        [{"ID": "a", "Status": "Running"}],
+                        [{"ID": "a", "Status": "Succeeded"}]]),
+            "s2": iter([[{"ID": "b", "Status": "Failed"}]]),
+        }
+        finished, delays = [], []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monitor = SubmissionMonitor(lambda sid: next(snapshots[sid]),
+                                    on_run_finished=lambda sid, run: finished.append(run["ID"]),
+                                    min_interval=1, max_interval=8, sleep=fake_sleep)
+        results = monitor.run(["s1", "s2", "s1"])
+
+        self.assertEqual(sorted(finished), ["a", "b"])
+        self.assertEqual(results["s1"][0]["Status"], "Succeeded")
+        self.assertEqual(len(delays), 3)
+        self.assertGreater(delays[2], delays[1] * 1.1)
+
+    def test_submission_monitor_survives_api_and_callback_errors(self):
+        calls = {"s1": 0}
+
+        def fetch_runs(sid):
+            if sid == "s1":
+                calls["s1"] += 1
+                if calls["s1"] == 1:
+                    raise RuntimeError("ListRuns blip")
+                return [{"ID": "a", "Status": "Succeeded"}]
+            return [{"ID": "b", "Status": "Succeeded"}]
+
+        def on_run_finished(sid, run):
+            if run["ID"] == "b":
+                raise RuntimeError("download failed")
+
+        delays = []
+
+        async def fake_sleep(delay):
+            delays.append(delay)
+
+        monitor = SubmissionMonitor(fetch_runs, on_run_finished=on_run_finished,
+                                    min_interval=1, max_interval=8, logger=MagicMock(),
+                                    sleep=fake_sleep)
+        results = monitor.run(["s1", "s2"])
+
+        self.assertEqual(results["s1"], [{"ID": "a", "Status": "Succeeded"}])
+        self.assertEqual(results["s2"], [{"ID": "b", "Status": "Succeeded"}])
+        self.assertEqual(calls["s1"], 2)
+        self.assertEqual(len(delays), 1)
+
+    def test_submission_hydrates_runs_from_one_list_runs_call(self):
+        runs = [{"ID": f"r{i}", "Status": "Running", "DataEntityRowID": f"row{i}"}
+                for i in range(3)]
+
+        with patch("bioos.resource.workflows.Config.service") as service_mock:
+            service = service_mock.return_value
+            service.list_submissions.return_value = {"Items": [{
+                "ID": "sub-hydrate", "Status": "Running",
+                "ExposedOptions": {"ReadFromCache": False},
+            }]}
+            service.list_runs.return_value = {"Items": runs}
+            service.list_data_models.return_value = {"Items": []}
+            submission = Submission("wid-hydrate", "sub-hydrate")
+
+            self.assertEqual(service.list_runs.call_count, 1)
+            self.assertEqual([run.status for run in submission.runs], ["Running"] * 3)
+            self.assertIs(submission.runs[0], Run.from_record(
+                "wid-hydrate", "sub-hydrate", dict(runs[0], Status="Succeeded")))
+            self.assertEqual(submission.runs[0].status, "Succeeded")
+            self.assertEqual(sorted(submission.data_model_rows), ["row0", "row1", "row2"])
+
+    def test_status_poller_refreshes_submissions_in_bulk(self):
+        def submission_item(id_, status):
+            return {"ID": id_, "Status": status, "ExposedOptions": {"ReadFromCache": False}}
+
+        with patch("bioos.resource.workflows.Config.service") as service_mock:
+            service = service_mock.return_value
+            service.list_data_models.return_value = {"Items": []}
+            service.list_runs.return_value = {"Items": [{"ID": "r", "Status": "Running",
+                                                         "DataEntityRowID": ""}]}
+            subs = []
+            for id_ in ("poll-a", "poll-b"):
+                service.list_submissions.return_value = {"Items": [submission_item(id_, "Running")]}
+                subs.append(Submission("wid-poll", id_))
+            poller = StatusPoller("wid-poll")
+            # nothing is tracked until polling starts
+            self.assertEqual(poller.unfinished(), [])
+            with patch("bioos.resource.workflows.threading.Thread"):
+                poller.start()
+            self.assertEqual(sorted(s.id for s in poller.unfinished()), ["poll-a", "poll-b"])
+
+            service.list_submissions.reset_mock()
+            service.list_runs.reset_mock()
+            service.list_submissions.return_value = {"Items": [
+                submission_item("poll-a", "Succeeded"), submission_item("poll-b", "Running")]}
+            service.list_runs.return_value = {"Items": [{"ID": "r", "Status": "Succeeded",
+                                                         "DataEntityRowID": ""}]}
+            poller.poll()
+
+            service.list_submissions.assert_called_once()
+            self.assertEqual(service.list_submissions.call_args.args[0]["Filter"]["IDs"],
+                             ["poll-a", "poll-b"])
+            self.assertEqual(service.list_runs.call_count, 2)
+            self.assertEqual(subs[0]._status, "Succeeded")
+            self.assertEqual(subs[0].runs[0]._status, "Succeeded")
+            self.assertEqual([s.id for s in poller.unfinished()], ["poll-b"])
+            self.assertNotIn("poll-a", poller._submissions)
+
+            with patch.object(StatusPoller, "fresh", True):
+                service.list_submissions.reset_mock()
+                self.assertEqual(subs[1].status, "Running")
+                service.list_submissions.assert_not_called()
+
+            with patch.object(StatusPoller, "running", True):
+                service.list_submissions.return_value = {"Items": [submission_item("poll-c", "Running")]}
+                Submission("wid-poll", "poll-c")
+            self.assertIn("poll-c", poller._submissions)
+            poller.stop()
+            self.assertEqual(poller.unfinished(), [])
+
+    def test_submission_watcher_diffs_bulk_snapshots(self):
+        snapshots = iter([
+            ([{"ID": "w1", "Status": "Running"}],
+             [{"ID": "wr1", "Status": "Pending"}, {"ID": "wr2", "Status": "Running"}]),
+            ([{"ID": "w1", "Status": "Running"}],
+             [{"ID": "wr1", "Status": "Running"}, {"ID": "wr2", "Status": "Running"}]),
+            ([{"ID": "w1", "Status": "Succeeded"}],
+             [{"ID": "wr1", "Status": "Succeeded", "Duration": 30, "Outputs": "{}"},
+              {"ID": "wr2", "Status": "Succeeded"}]),
+        ])
+        current = {}
+
+        def list_submissions(params):
+            current["submissions"], current["runs"] = next(snapshots)
+            return {"Items": current["submissions"]}
+
+        with patch("bioos.resource.watch.Config.service") as service_mock, \
+                patch("bioos.resource.watch.time.sleep") as sleep_mock:
+            service_mock.return_value.list_submissions.side_effect = list_submissions
+            service_mock.return_value.list_runs.side_effect = lambda params: {"Items": current["runs"]}
+            events = list(SubmissionWatcher("wid-watch", ["w1"]).watch(min_interval=1, max_interval=4))
+
+        transitions = [(e.kind, e.run_id, e.previous_status, e.status) for e in events]
+        self.assertEqual(transitions, [
+            ("run", "wr1", None, "Pending"), ("run", "wr2", None, "Running"),
+            ("submission", None, None, "Running"),
+            ("run", "wr1", "Pending", "Running"),
+            ("run", "wr1", "Running", "Succeeded"), ("run", "wr2", "Running", "Succeeded"),
+            ("submission", None, "Running", "Succeeded"),
+        ])
+        self.assertEqual((events[4].duration, events[4].outputs), (30, "{}"))
+        self.assertEqual(service_mock.return_value.list_submissions.call_count, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+
+    def test_submission_watcher_finishes_unknown_submissions_as_failed(self):
+        with patch("bioos.resource.watch.Config.service") as service_mock, \
+                patch("bioos.resource.watch.time.sleep"):
+            service = service_mock.return_value
+            service.list_submissions.side_effect = [
+                {"Items": [{"ID": "w1", "Status": "Running"}]},
+                {"Items": [{"ID": "w1", "Status": "Succeeded"}]},
+            ]
+            service.list_runs.return_value = {"Items": []}
+            events = list(SubmissionWatcher("wid-watch", ["w1", "gone"]).watch(min_interval=1))
+
+        self.assertEqual(service.list_submissions.call_args_list[1][0][0]["Filter"], {"IDs": ["w1"]})
+        gone = [e for e in events if e.submission_id == "gone"]
+        self.assertEqual(len(gone), 1)
+        self.assertEqual((gone[0].kind, gone[0].status), ("submission", "Failed"))
+        self.assertIn("not found", gone[0].message)
+
+    def test_submission_watcher_stops_after_max_polls(self):
+        with patch("bioos.resource.watch.Config.service") as service_mock, \
+                patch("bioos.resource.watch.time.sleep") as sleep_mock:
+            service = service_mock.return_value
+            service.list_submissions.return_value = {"Items": [{"ID": "w1", "Status": "Running"}]}
+            service.list_runs.return_value = {"Items": []}
+            events = list(SubmissionWatcher("wid-watch", None).watch(min_interval=1, max_polls=3))
+
+        self.assertEqual(service.list_submissions.call_count, 3)
+        self.assertEqual(sleep_mock.call_count, 2)
+        self.assertEqual([e.status for e in events], ["Running"])
+
+    def test_data_model_catalog_caches_until_invalidated(self):
+        models = {"Items": [
+            {"ID": "dm-1", "Name": "sample", "Type": "normal"},
+            {"ID": "dm-2", "Name": "sample_set", "Type": "set"},
+        ]}
+        catalog = DataModelCatalog("wid-catalog")
+        with patch("bioos.resource.data_models.Config.service") as service_mock:
+            service = service_mock.return_value
+            service.list_data_models.return_value = models
+            self.assertEqual(catalog.id_of("sample"), "dm-1")
+            self.assertIsNone(catalog.id_of("sample_set"))
+            self.assertEqual(catalog.name_of("dm-2"), "sample_set")
+            self.assertEqual(service.list_data_models.call_count, 1)
+
+            service.list_data_model_row_ids.return_value = {"RowIDs": []}
+            service.list_data_models.return_value = {"Items": [models["Items"][1]]}
+            with patch.object(DataModelResource, "list",
+                              return_value=pd.DataFrame([{"ID": "dm-1", "Name": "sample"}])):
+                DataModelResource("wid-catalog").delete("sample")
+            self.assertIsNone(catalog.id_of("sample"))
+            self.assertEqual(service.list_data_models.call_count, 2)
+
+            catalog.ttl = 0
+            catalog.name_of("dm-2")
+            self.assertEqual(service.list_data_models.call_count, 3)
+
+    def test_run_iter_runs_fetches_pages_concurrently_in_order(self):
+        runs = [{"ID": f"r{i}"} for i in range(23)]
+        requested = []
+
+        def list_runs(params):
+            requested.append(params["PageNumber"])
+            start = (params["PageNumber"] - 1) * params["PageSize"]
+            return {"Items": runs[start:start + params["PageSize"]], "TotalCount": len(runs)}
+
+        with patch("bioos.resource.workflows.Config.service") as service_mock:
+            service_mock.return_value.list_runs.side_effect = list_runs
+            streamed = list(Run.iter_runs("wid", "sid", page_size=5, workers=2))
+            listed = Run.list_runs("wid", "sid", page_size=5, all_pages=True)
+            # without a total the pages are walked until a short one
+            service_mock.return_value.list_runs.side_effect = lambda params: {
+                "Items": list_runs(params)["Items"]}
+            walked = list(Run.iter_runs("wid", "sid", page_size=5))
+
+        self.assertEqual(streamed, runs)
+        self.assertEqual(sorted(requested[:5]), [1, 2, 3, 4, 5])
+        self.assertEqual(listed, {"Items": runs, "TotalCount": 23})
+        self.assertEqual(walked, runs)
+
     def test_run_list_tasks_builds_request(self):
         response = {"Items": []}
 